@@ -0,0 +1,34 @@
+import asyncio
+from gviewer import AsyncioDataStore, GViewer, BaseDisplayer, DisplayerContext, Config
+from gviewer import Text, Group, View
+
+
+class Displayer(BaseDisplayer):
+    def get_views(self):
+        return [("View", self.detail)]
+
+    def detail(self, message):
+        return View([Group("Summary", [Text(message)])])
+
+
+async def produce(queue):
+    index = 0
+    while True:
+        index += 1
+        await queue.put(u"Message {0}".format(index))
+        await asyncio.sleep(0.2)
+
+
+async def main():
+    queue = asyncio.Queue()
+    producer = asyncio.ensure_future(produce(queue))
+
+    data_store = AsyncioDataStore(queue)
+    viewer = GViewer(DisplayerContext(data_store, Displayer()),
+                     config=Config(auto_scroll=True))
+    await viewer.start_async()
+    producer.cancel()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,15 +1,11 @@
 import json
-from gviewer import StaticDataStore, GViewer, BaseDisplayer, DisplayerContext
+from gviewer import StaticDataStore, JsonDataStore, GViewer, BaseDisplayer, DisplayerContext
 from gviewer import Prop, PropsGroup, View, Actions
 
 
-with open("examples/panama-taiwan.json", "r") as data_file:
-    data = json.load(data_file)
-
-
 class PanamaDisplayer(BaseDisplayer):
-    def __init__(self, data):
-        data_store = self.create_data_store(data)
+    def __init__(self, path):
+        data_store = self.create_data_store(path)
         self.child_context = ChildDisplayer().context
         self.viewer = GViewer(
             DisplayerContext(data_store, self, actions=Actions(
@@ -19,8 +15,8 @@ class PanamaDisplayer(BaseDisplayer):
             other_contexts=[self.child_context],
             palette=[("nodeid", "light cyan", "black")])
 
-    def create_data_store(self, data):
-        return StaticDataStore(data)
+    def create_data_store(self, path):
+        return JsonDataStore(path)
 
     def summary(self, message):
         return [
@@ -85,7 +81,7 @@ class ChildDisplayer(BaseDisplayer):
 
 
 def main():
-    PanamaDisplayer(data).run()
+    PanamaDisplayer("examples/panama-taiwan.json").run()
 
 if __name__ == "__main__":
     main()
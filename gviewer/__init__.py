@@ -1,7 +1,14 @@
 from gviewer.viewer import GViewer
-from gviewer.store import BaseDataStore, StaticDataStore, AsyncDataStore
+from gviewer.store import (
+    BaseDataStore, StaticDataStore, AsyncDataStore,
+    ThreadSafeDataStore, FileDataStore, JsonDataStore)
 from gviewer.displayer import BaseDisplayer
 from gviewer.config import Config
 from gviewer.view.element import Text, Prop, Group, PropsGroup, View
 from gviewer.action import Actions
 from gviewer.context import DisplayerContext
+
+try:
+    from gviewer.aio import AsyncioDataStore
+except (ImportError, SyntaxError):  # pragma: no cover, py27 has no asyncio
+    pass
@@ -8,6 +8,8 @@ class Action(object):
         desc: description for the action
         function: callable for callback when keypress
     """
+    __slots__ = ("desc", "function")
+
     def __init__(self, desc, function):
         self.desc = desc
         self.function = function
@@ -22,6 +24,8 @@ class Actions(object):
     Attributes:
         actions: dict contains k->Action
     """
+    __slots__ = ("actions",)
+
     def __init__(self, actions=None):
         actions = actions or []
         if not isinstance(actions, list):  # pragma: no cover
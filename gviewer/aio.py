@@ -0,0 +1,113 @@
+import asyncio
+import urwid
+
+from gviewer.store import BaseDataStore
+
+
+def _current_loop():
+    try:
+        return asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        return loop
+
+
+class AsyncioDataStore(BaseDataStore):
+    """
+    Used for async data that produced by asyncio
+
+    Messages consumed from source are delivered in batches,
+    a batch is flushed when the source has nothing ready or batch_size is reached
+
+    Attributes:
+        source: async iterable or asyncio.Queue
+        batch_size: max number of messages to deliver at once
+        aio_loop: asyncio event loop that the source is consumed in,
+                  resolved when the event loop is created or the store is set up
+    """
+    def __init__(self, source, batch_size=1000, **kwargs):
+        super(AsyncioDataStore, self).__init__(**kwargs)
+        self.source = source
+        self.batch_size = batch_size
+        self.aio_loop = None
+        self.task = None
+        self._pending = []
+        self._flush_handle = None
+
+    def create_event_loop(self):
+        return urwid.AsyncioEventLoop(loop=self._resolve_loop())
+
+    def setup(self):
+        self.task = self._resolve_loop().create_task(self._consume())
+
+    def _resolve_loop(self):
+        """ Prefer the running asyncio loop, so that a store created outside of it still run in it """
+        try:
+            self.aio_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if self.aio_loop is None:
+                self.aio_loop = _current_loop()
+        return self.aio_loop
+
+    def close(self):
+        """ Stop consuming the source """
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def _consume(self):
+        if isinstance(self.source, asyncio.Queue):
+            source = self._iter_queue()
+        else:
+            source = self.source
+
+        async for message in source:
+            self._pending.append(message)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+                # NOTE: yield to event loop so that input would not be starved
+                await asyncio.sleep(0)
+            elif self._flush_handle is None:
+                self._flush_handle = self.aio_loop.call_soon(self._flush)
+        self._flush()
+
+    async def _iter_queue(self):
+        while True:
+            yield await self.source.get()
+
+    def pending(self):
+        """ Number of consumed messages that not delivered yet """
+        return len(self._pending) + super(AsyncioDataStore, self).pending()
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.on_messages(batch)
+        if self.loop is not None:
+            # NOTE: asyncio task is not run by urwid, which would not enter idle to redraw by itself
+            self.loop.entering_idle()
+
+
+async def start(viewer):
+    """ Run GViewer inside the running asyncio event loop
+
+    Returns when user quit GViewer, without stopping the asyncio event loop
+
+    Args:
+        viewer: GViewer instance
+    """
+    exit_future = asyncio.get_running_loop().create_future()
+
+    def exit_func():
+        if not exit_future.done():
+            exit_future.set_result(None)
+
+    viewer.view.exit_func = exit_func
+    with viewer.loop.start():
+        viewer.setup_stores()
+        await exit_future
@@ -16,7 +16,7 @@ class BasicWidget(urwid.WidgetWrap):
     """
     def __init__(self, controller=None, context=None, widget=None,
                  attr_map=None, focus_map=None):
-        widget = widget or urwid.Text("")
+        widget = urwid.Text("") if widget is None else widget
         if attr_map:
             widget = urwid.AttrMap(widget, attr_map, focus_map=focus_map)
         super(BasicWidget, self).__init__(widget)
@@ -66,31 +66,71 @@ class BasicWidget(urwid.WidgetWrap):
 class FocusableText(BasicWidget):
     """ Text widget that will highlight correctly
 
+    The unfocused widget display the markup, and the focused widget display the plain text,
+    both are built once and their canvases are cached by size until set_text.
+    Attributes are applied to the rendered canvas instead of wrapping the text with urwid.AttrMap,
+    that would allocate two attribute dicts for every item
+
     Attributes:
         text_markup: urwid Text Markup instance
+        plain_text: decomposed text of text_markup if it is known already
     """
-    def __init__(self, text_markup, **kwargs):
-        widget = urwid.Text(text_markup)
-        super(FocusableText, self).__init__(
-            widget=widget, **kwargs)
+    _max_cached_canvases = 4
+
+    def __init__(self, text_markup, plain_text=None, attr_map=None, focus_map=None, **kwargs):
+        super(FocusableText, self).__init__(widget=urwid.Text(text_markup), **kwargs)
         self.text_markup = text_markup
+        self._plain_text = plain_text
+        self._attr_map = attr_map
+        self._focus_map = focus_map
+        self._focused = None
+        # NOTE: most of the items are never rendered, create the cache on first render
+        self._canvases = None
+
+    def set_text(self, text_markup, plain_text=None):
+        """ Replace the text and drop the cached widgets and canvases """
+        self.text_markup = text_markup
+        self._plain_text = plain_text
+        self._focused = None
+        if self._canvases is not None:
+            self._canvases.clear()
+        self.display(urwid.Text(text_markup))
+        self._invalidate()
 
     def render(self, size, focus=False):
         """ Override original render function
 
         Display the widget in different way depend on that the widget is focus or not
         """
-        if focus:
-            plain_text = self.get_plain_text()
-            self.display(urwid.Text(plain_text))
-        else:
-            self.display(urwid.Text(self.text_markup))
-        return super(FocusableText, self).render(size, focus)
+        key = (size, focus)
+        if self._canvases is None:
+            self._canvases = {}
+        canvas = self._canvases.get(key)
+        if canvas is None:
+            if len(self._canvases) >= self._max_cached_canvases:
+                self._canvases.clear()
+            widget = self._focused_widget() if focus else self._w
+            canvas = self._canvases[key] = self._apply_attr(widget.render(size, focus), focus)
+        return canvas
+
+    def _apply_attr(self, canvas, focus):
+        attr = self._focus_map if focus and self._focus_map else self._attr_map
+        if not attr:
+            return canvas
+        canvas = urwid.CompositeCanvas(canvas)
+        canvas.fill_attr_apply({None: attr})
+        return canvas
+
+    def _focused_widget(self):
+        if self._focused is None:
+            self._focused = urwid.Text(self.get_plain_text())
+        return self._focused
 
     def get_plain_text(self):
         """ Retrieve the plain text from text_markup """
-        text, _ = decompose_tagmarkup(self.text_markup)
-        return text
+        if self._plain_text is None:
+            self._plain_text, _ = decompose_tagmarkup(self.text_markup)
+        return self._plain_text
 
     def selectable(self):
         return True
@@ -102,12 +142,14 @@ class SearchWidget(BasicWidget):
     Attributes:
         search_func: a callback function that will be called when search is invoke
         clear_func: a callback function that will be called when search is cancelled
+        change_func: optional callback function that will be called when keyword is changed
     """
-    def __init__(self, search_func, clear_func, **kwargs):
+    def __init__(self, search_func, clear_func, change_func=None, **kwargs):
         super(SearchWidget, self).__init__(
             widget=urwid.Edit("/"), **kwargs)
         self.search_func = search_func
         self.clear_func = clear_func
+        self.change_func = change_func
 
     def clear(self):
         self.display(urwid.Edit("/"))
@@ -123,7 +165,11 @@ class SearchWidget(BasicWidget):
             self.clear()
             self.clear_func()
             return None
-        return super(SearchWidget, self).keypress(size, key)
+        keyword = self._w.edit_text
+        result = super(SearchWidget, self).keypress(size, key)
+        if self.change_func and self._w.edit_text != keyword:
+            self.change_func(self._w.edit_text)
+        return result
 
 
 class SearchableText(BasicWidget):
@@ -156,7 +202,7 @@ class SearchableText(BasicWidget):
             for index in range(prev_index, len(self.text)):
                 plain_text, _ = decompose_tagmarkup(self.text[index])
                 if keyword in plain_text:
-                    self._handle_match_markup(keyword, plain_text, index)
+                    self._handle_match_markup(keyword, plain_text, index, plain_text.index(keyword))
                     return True
 
         self.clear()
@@ -176,7 +222,7 @@ class SearchableText(BasicWidget):
             for index in reversed(range(0, prev_index)):
                 plain_text, _ = decompose_tagmarkup(self.text[index])
                 if keyword in plain_text:
-                    self._handle_match_markup(keyword, plain_text, index)
+                    self._handle_match_markup(keyword, plain_text, index, plain_text.index(keyword))
                     return True
 
         self.clear()
@@ -188,8 +234,24 @@ class SearchableText(BasicWidget):
             self.text[:start_index], ("match", keyword), self.text[end_index:]]))
         self.prev_index = (end_index, start_index)
 
-    def _handle_match_markup(self, keyword, plain_text, index):
-            match_index = plain_text.index(keyword)
+    def highlight(self, keyword, chunk, start):
+        """ Highlight keyword at start of a chunk
+
+        Args:
+            keyword: str or unicode
+            chunk: index of chunk in text markup, 0 for plain text
+            start: index of keyword in plain text of the chunk
+        """
+        if isinstance(keyword, bytes):
+            keyword = keyword.decode("utf8")  # pragma: no cover, py3 would not cover here
+
+        if isinstance(self.text, str):
+            self._handle_match_plain_text(keyword, start)
+        else:
+            plain_text, _ = decompose_tagmarkup(self.text[chunk])
+            self._handle_match_markup(keyword, plain_text, chunk, start)
+
+    def _handle_match_markup(self, keyword, plain_text, index, match_index):
             match_end_index = match_index + len(keyword)
             match_markup = []
             if plain_text[:match_index]:
@@ -0,0 +1,8 @@
+""" Headless benchmarks of GViewer
+
+Each module could be run by python -m, for example:
+
+    python -m gviewer.benchmarks.render
+
+gviewer.benchmarks.suite run the whole suite and output JSON results
+"""
@@ -0,0 +1,60 @@
+""" Cost of clearing all items (X) of a filtered summary list
+
+    python -m gviewer.benchmarks.delete [sizes...]
+"""
+import sys
+import timeit
+
+from gviewer.config import Config
+from gviewer.context import Context, DisplayerContext
+from gviewer.controller import Controller
+from gviewer.displayer import BaseDisplayer
+from gviewer.store import StaticDataStore
+from gviewer.view.summary import SummaryListWalker, FilterSummaryListWalker
+
+
+class _LookupFilter(FilterSummaryListWalker):
+    """ FilterSummaryListWalker that look up and delete each widget in base walker, for comparison """
+    def __delitem__(self, index):
+        widgets = self[index] if isinstance(index, slice) else [self[index]]
+        for widget in widgets:
+            del self.base_walker[self.base_walker.index(widget)]
+        super(FilterSummaryListWalker, self).__delitem__(index)
+
+
+def _base_walker(size):
+    displayer_context = DisplayerContext(StaticDataStore([]), BaseDisplayer(), summary_index=False)
+    walker = SummaryListWalker(
+        displayer_context=displayer_context, controller=Controller(None),
+        context=Context(Config(), displayer_context), on_receive=lambda count, walker: None)
+    walker.recv_batch(["GET /api/items/{0} {1}".format(i, 500 if i % 2 else 200) for i in range(size)])
+    return walker
+
+
+def measure(filter_class, size):
+    """ Seconds to clear a filter that match half of size items
+
+    Returns:
+        float of seconds
+    """
+    filter_walker = filter_class(_base_walker(size), " 500")
+
+    def clear():
+        del filter_walker[:]
+
+    return timeit.timeit(clear, number=1)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [5000, 10000, 20000, 40000]
+
+    for name, filter_class in [("tombstone", FilterSummaryListWalker), ("lookup", _LookupFilter)]:
+        for size in sizes:
+            seconds = measure(filter_class, size)
+            print("{0}: {1:.3f} ms to clear {2} of {3} items, {4:.3f} us/item".format(
+                name, seconds * 1000, size // 2, size, seconds * 1e6 / max(1, size // 2)))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,92 @@
+""" Memory per item of summary widgets and detail elements
+
+Each item is compared with a baseline built the way it used to be:
+the summary item wrapped its text with urwid.AttrMap, and the elements had no __slots__
+
+    python -m gviewer.benchmarks.memory [count]
+"""
+import gc
+import sys
+import urwid
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+from gviewer.action import Action
+from gviewer.basic_widget import BasicWidget
+from gviewer.context import DisplayerContext
+from gviewer.displayer import BaseDisplayer
+from gviewer.view.element import Text, Prop, Group
+from gviewer.view.summary import SummaryItemWidget
+
+
+def _noop(*args, **kwargs):  # pragma: no cover
+    pass
+
+
+class _AttrMapSummaryItemWidget(SummaryItemWidget):
+    """ SummaryItemWidget that wrap its text with urwid.AttrMap, for comparison """
+
+    def _widget(self, title, plain_text=None):
+        return BasicWidget(
+            widget=urwid.Text(title), attr_map="summary", focus_map="summary focus")
+
+
+def _unslotted(cls):
+    """ Subclass of cls that has __dict__, for comparison """
+    return type("Unslotted" + cls.__name__, (cls,), {})
+
+
+def factories():
+    """ Returns list of (name, callable that build an item for message, callable that build the baseline) """
+    displayer_context = DisplayerContext(None, BaseDisplayer())
+    text, prop, action, group = (_unslotted(cls) for cls in (Text, Prop, Action, Group))
+    return [
+        ("summary item",
+         lambda m: SummaryItemWidget(m, m, displayer_context, plain_text=m),
+         lambda m: _AttrMapSummaryItemWidget(m, m, displayer_context, plain_text=m)),
+        ("text", lambda m: Text(m), lambda m: text(m)),
+        ("prop", lambda m: Prop("key", m), lambda m: prop("key", m)),
+        ("action", lambda m: Action(m, _noop), lambda m: action(m, _noop)),
+        ("group", lambda m: Group(m, []), lambda m: group(m, [])),
+    ]
+
+
+def measure(factory, count=1000000):
+    """ Bytes allocated per item, messages are allocated before measuring
+
+    Returns:
+        float of bytes per item, or None if tracemalloc is not available
+    """
+    if tracemalloc is None:  # pragma: no cover
+        return None
+    messages = ["GET /api/items/{0}".format(i) for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        items = [factory(m) for m in messages]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (current - sys.getsizeof(items)) / float(count)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 1000000
+    if tracemalloc is None:  # pragma: no cover
+        print("tracemalloc is not available")
+        return
+
+    for name, factory, baseline in factories():
+        per_item = measure(factory, count)
+        baseline_per_item = measure(baseline, count)
+        print("{0}: {1:.1f} -> {2:.1f} bytes/item ({3:.0%} less), {4:.1f} MB for {5} items".format(
+            name, baseline_per_item, per_item, 1 - per_item / baseline_per_item,
+            per_item * count / 1024 / 1024, count))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,69 @@
+""" Render cost per frame of the summary list while scrolling
+
+    python -m gviewer.benchmarks.render [rows] [frames]
+"""
+import sys
+import timeit
+import urwid
+
+from gviewer.basic_widget import FocusableText
+from gviewer.context import DisplayerContext
+from gviewer.displayer import BaseDisplayer
+from gviewer.view.summary import SummaryItemWidget
+
+
+class _RebuildingText(FocusableText):
+    """ FocusableText that rebuild urwid.Text on every render, for comparison """
+
+    def render(self, size, focus=False):
+        if focus:
+            self.display(urwid.Text(self.get_plain_text()))
+        else:
+            self.display(urwid.Text(self.text_markup))
+        return self._apply_attr(self._w.render(size, focus), focus)
+
+
+class _RebuildingItem(SummaryItemWidget):
+    def _widget(self, title, plain_text=None):
+        return _RebuildingText(
+            title, plain_text=plain_text, attr_map="summary", focus_map="summary focus")
+
+
+def _listbox(item_class, rows):
+    displayer_context = DisplayerContext(None, BaseDisplayer())
+    widgets = [
+        item_class(i, [("summary", "GET"), " /api/items/{0} 200 OK".format(i)], displayer_context)
+        for i in range(rows * 2)]
+    return urwid.ListBox(urwid.SimpleFocusListWalker(widgets))
+
+
+def measure(item_class, rows=200, frames=500, width=120):
+    """ Average seconds to render one frame while moving focus by one row
+
+    Returns:
+        float of seconds per frame
+    """
+    listbox = _listbox(item_class, rows)
+    size = (width, rows)
+    state = {"position": 0}
+
+    def frame():
+        state["position"] = (state["position"] + 1) % (rows * 2)
+        listbox.set_focus(state["position"])
+        listbox.render(size, focus=True)
+
+    return timeit.timeit(frame, number=frames) / frames
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    rows = int(argv[0]) if argv else 200
+    frames = int(argv[1]) if len(argv) > 1 else 500
+
+    for name, item_class in [("cached", SummaryItemWidget), ("rebuilding", _RebuildingItem)]:
+        per_frame = measure(item_class, rows, frames)
+        print("{0}: {1:.3f} ms/frame for {2} rows".format(name, per_frame * 1000, rows))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,230 @@
+""" Headless benchmark suite of GViewer
+
+Drive ParentFrame with a fake screen and output the results as JSON
+for regression tracking
+
+    python -m gviewer.benchmarks.suite [--quick] [--output results.json]
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import urwid
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+from gviewer.config import Config
+from gviewer.context import Context, DisplayerContext
+from gviewer.displayer import BaseDisplayer
+from gviewer.parent import ParentFrame
+from gviewer.scheduler import MainLoop
+from gviewer.store import AsyncDataStore
+from gviewer.view.element import View, Group, Text
+
+
+class FakeScreen(urwid.BaseScreen):
+    """ Screen that only count the frames drawn
+
+    Attributes:
+        size: tuple of (cols, rows)
+        frames: number of frames had been drawn
+    """
+    def __init__(self, size=(120, 40)):
+        super(FakeScreen, self).__init__()
+        self.size = size
+        self.frames = 0
+
+    def get_cols_rows(self):
+        return self.size
+
+    def draw_screen(self, size, canvas):
+        self.frames += 1
+
+    def set_mouse_tracking(self, enable=True):
+        pass
+
+
+class BenchmarkDisplayer(BaseDisplayer):
+    """ Displayer of generated requests, the detail view has detail_lines lines """
+    def __init__(self, detail_lines=1000):
+        self.detail_lines = detail_lines
+
+    def summary(self, message):
+        return [("summary", message["method"]), " ", message["path"], " ", str(message["status"])]
+
+    def get_views(self):
+        return [("Detail", self.detail)]
+
+    def detail(self, message):
+        lines = [Text("{0} {1} line {2}".format(message["method"], message["path"], i))
+                 for i in range(self.detail_lines)]
+        return View([Group("Content", lines)])
+
+
+def messages(count, start=0):
+    """ Generate count messages """
+    return [{"method": "GET" if i % 3 else "POST",
+             "path": "/api/items/{0}".format(i),
+             "status": 500 if i % 10 == 0 else 200}
+            for i in range(start, start + count)]
+
+
+class Harness(object):
+    """ ParentFrame inside a MainLoop with FakeScreen, and a data store to feed it
+
+    Attributes:
+        store: AsyncDataStore of the main view
+        frame: ParentFrame instance
+        loop: MainLoop instance
+        screen: FakeScreen instance
+    """
+    def __init__(self, config=None, detail_lines=1000, size=(120, 40)):
+        config = config or Config(fps=None)
+        self.store = AsyncDataStore(lambda on_message: None)
+        displayer_context = DisplayerContext(self.store, BenchmarkDisplayer(detail_lines))
+        self.context = Context(config, displayer_context)
+        self.frame = ParentFrame(self.context)
+        self.screen = FakeScreen(size)
+        self.loop = MainLoop(
+            self.frame, self.context.scheduler, screen=self.screen, handle_mouse=False)
+        self.store.attach(self.loop, self.frame.controller)
+        self.screen.start()
+
+    @property
+    def summary(self):
+        return self.frame.main
+
+    def feed(self, count, batch_size=1000):
+        for start in range(0, count, batch_size):
+            self.store.on_messages(messages(min(batch_size, count - start), start))
+
+    def draw(self):
+        self.loop.draw_screen()
+
+    def press(self, key):
+        self.loop.process_input([key])
+        self.loop.entering_idle()
+
+
+def _timed(func):
+    start = time.time()
+    func()
+    return time.time() - start
+
+
+def ingest(count=100000, batch_size=1000):
+    """ Messages per second delivered into the summary list """
+    harness = Harness()
+    seconds = _timed(lambda: harness.feed(count, batch_size))
+    return {"count": count, "batch_size": batch_size, "seconds": seconds,
+            "messages_per_second": count / seconds}
+
+
+def filter_latency(sizes=(10000, 50000, 100000), keyword="500"):
+    """ Seconds to filter the whole summary list by keyword for each list size """
+    results = []
+    for size in sizes:
+        harness = Harness()
+        harness.feed(size)
+        summary = harness.summary
+
+        def search():
+            summary._filter(keyword)
+            # NOTE: scan the rest at once instead of in event loop ticks
+            summary._pause_scan()
+            summary.current_walker.scan()
+
+        seconds = _timed(search)
+        results.append({"size": size, "matches": len(summary.current_walker), "seconds": seconds})
+    return results
+
+
+def detail_open(lines=(1000, 10000, 100000)):
+    """ Seconds to open and draw DetailWidget for each number of lines """
+    results = []
+    for count in lines:
+        harness = Harness(detail_lines=count)
+        harness.feed(1)
+
+        def open_detail():
+            harness.press("enter")
+            harness.draw()
+
+        seconds = _timed(open_detail)
+        results.append({"lines": count, "seconds": seconds})
+    return results
+
+
+def scroll(size=100000, frames=500):
+    """ Seconds per frame to move focus down by one row and draw """
+    harness = Harness()
+    harness.feed(size)
+    harness.draw()
+    seconds = _timed(lambda: [harness.press("down") for _ in range(frames)])
+    return {"size": size, "frames": frames, "seconds_per_frame": seconds / frames}
+
+
+def memory(count=100000):
+    """ Peak and retained bytes allocated per 100k messages ingested """
+    if tracemalloc is None:  # pragma: no cover
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        harness = Harness()
+        harness.feed(count)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    scale = 100000.0 / count
+    return {"count": count, "peak_bytes_per_100k": int(peak * scale),
+            "current_bytes_per_100k": int(current * scale)}
+
+
+def run(quick=False):
+    """ Run all benchmarks
+
+    Args:
+        quick: run with small sizes, for smoke test
+
+    Returns:
+        dict of results that could be dumped as JSON
+    """
+    if quick:
+        sizes = dict(count=1000, sizes=(100, 1000), lines=(100, 1000), frames=20)
+    else:
+        sizes = dict(count=100000, sizes=(10000, 50000, 100000), lines=(1000, 10000, 100000), frames=500)
+    return {
+        "python": platform.python_version(),
+        "urwid": urwid.__version__,
+        "results": {
+            "ingest": ingest(sizes["count"]),
+            "filter_latency": filter_latency(sizes["sizes"]),
+            "detail_open": detail_open(sizes["lines"]),
+            "scroll": scroll(sizes["count"], sizes["frames"]),
+            "memory": memory(sizes["count"]),
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmark suite of GViewer")
+    parser.add_argument("--quick", action="store_true", help="run with small sizes")
+    parser.add_argument("--output", help="write JSON results to file instead of stdout")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = json.dumps(run(args.quick), indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(results + "\n")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,247 @@
+import pickle
+import sys
+import tempfile
+from array import array
+from collections import OrderedDict
+
+try:
+    array("Q")
+    OFFSET_TYPECODE = "Q"
+except ValueError:  # pragma: no cover, py27 has no unsigned long long array
+    OFFSET_TYPECODE = "L"
+
+
+class RingBuffer(object):
+    """ List-like sequence that drop items from the head in amortized O(1)
+
+    Dropped items are only skipped by a head index,
+    and the underlying list is compacted once more than half of it is dropped
+
+    Attributes:
+        offset: number of items had been dropped from the head
+    """
+    def __init__(self, items=None):
+        self._items = list(items or [])
+        self._head = 0
+        self.offset = 0
+
+    def __len__(self):
+        return len(self._items) - self._head
+
+    def __iter__(self):
+        for index in range(self._head, len(self._items)):
+            yield self._items[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._items[self._head + i] for i in range(*index.indices(len(self)))]
+        return self._items[self._head + self._check_index(index)]
+
+    def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("only support continuous slice")
+            self._items[self._head + start:self._head + max(start, stop)] = item
+        else:
+            self._items[self._head + self._check_index(index)] = item
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("only support continuous slice")
+            del self._items[self._head + start:self._head + max(start, stop)]
+        else:
+            del self._items[self._head + self._check_index(index)]
+
+    def append(self, item):
+        self._items.append(item)
+
+    def extend(self, items):
+        self._items.extend(items)
+
+    def popleft(self, count=1):
+        """ Drop items from the head
+
+        Args:
+            count: number of items to drop
+
+        Returns:
+            number of dropped items
+        """
+        count = min(count, len(self))
+        self._head += count
+        self.offset += count
+        if self._head * 2 > len(self._items):
+            del self._items[:self._head]
+            self._head = 0
+        return count
+
+    def _check_index(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("index out of range")
+        return index
+
+
+class SpillBuffer(object):
+    """ List-like sequence that spill the oldest items to disk
+
+    Items exceed the memory budget are pickled into an append-only
+    temporary segment file with an offset index,
+    and would be loaded back when they are accessed.
+    Item that could not be pickled is kept in memory,
+    and the pickling error is raised by append after the item is appended
+
+    Attributes:
+        memory_budget: max total size of resident items in bytes
+        sizeof: callable that estimate the size of item
+        offset: number of items had been dropped from the head
+        cache_size: max number of loaded items to cache
+        cache_bytes: max total size of loaded items to cache,
+                     a quarter of memory_budget by default
+    """
+    def __init__(self, memory_budget, sizeof=sys.getsizeof, directory=None,
+                 cache_size=256, cache_bytes=None):
+        self.memory_budget = memory_budget
+        self.sizeof = sizeof
+        self.offset = 0
+        self.cache_size = cache_size
+        self.cache_bytes = memory_budget // 4 if cache_bytes is None else cache_bytes
+
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._spilled = array(OFFSET_TYPECODE)
+        self._spilled_head = 0
+        self._resident = RingBuffer()
+        self._resident_sizes = RingBuffer()
+        self._resident_bytes = 0
+        self._cache = OrderedDict()
+        self._cache_total = 0
+
+    def __len__(self):
+        return self.spilled_count() + len(self._resident)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = self._check_index(index)
+        spilled_count = self.spilled_count()
+        if index < spilled_count:
+            return self._load(self._spilled_head + index)
+        return self._resident[index - spilled_count]
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("only support continuous slice")
+            stop = max(start, stop)
+        else:
+            start = self._check_index(index)
+            stop = start + 1
+
+        spilled_count = self.spilled_count()
+        if start < spilled_count:
+            del self._spilled[self._spilled_head + start:self._spilled_head + min(stop, spilled_count)]
+        if stop > spilled_count:
+            resident_start = max(0, start - spilled_count)
+            resident_stop = stop - spilled_count
+            self._resident_bytes -= sum(self._resident_sizes[resident_start:resident_stop])
+            del self._resident[resident_start:resident_stop]
+            del self._resident_sizes[resident_start:resident_stop]
+        self._clear_cache()
+
+    def spilled_count(self):
+        """ Number of items that are on disk """
+        return len(self._spilled) - self._spilled_head
+
+    def append(self, item):
+        size = self.sizeof(item)
+        self._resident.append(item)
+        self._resident_sizes.append(size)
+        self._resident_bytes += size
+        while self._resident_bytes > self.memory_budget and len(self._resident) > 1:
+            self._spill_one()
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def popleft(self, count=1):
+        """ Drop items from the head
+
+        Dropped items are only removed from the index,
+        the disk space is reclaimed when the buffer is closed
+
+        Args:
+            count: number of items to drop
+
+        Returns:
+            number of dropped items
+        """
+        count = min(count, len(self))
+        spilled = min(count, self.spilled_count())
+        if spilled:
+            self._spilled_head += spilled
+            if self._spilled_head * 2 > len(self._spilled):
+                del self._spilled[:self._spilled_head]
+                self._spilled_head = 0
+                self._clear_cache()
+        resident = count - spilled
+        if resident:
+            self._resident.popleft(resident)
+            self._resident_bytes -= sum(self._resident_sizes[:resident])
+            self._resident_sizes.popleft(resident)
+        self.offset += count
+        return count
+
+    def close(self):
+        self._file.close()
+
+    def _spill_one(self):
+        # NOTE: pickle before touching the index, so that the item stay resident if it could not be pickled
+        data = pickle.dumps(self._resident[0], pickle.HIGHEST_PROTOCOL)
+        self._file.seek(0, 2)
+        offset = self._file.tell()
+        self._file.write(data)
+        self._spilled.append(offset)
+
+        self._resident_bytes -= self._resident_sizes[0]
+        self._resident.popleft()
+        self._resident_sizes.popleft()
+
+    def _load(self, spilled_index):
+        if spilled_index in self._cache:
+            self._cache[spilled_index] = self._cache.pop(spilled_index)
+            return self._cache[spilled_index][0]
+
+        self._file.seek(self._spilled[spilled_index])
+        item = pickle.load(self._file)
+        size = self.sizeof(item)
+        self._cache[spilled_index] = (item, size)
+        self._cache_total += size
+        # NOTE: loaded items count against the budget too, keep the last one only if it is too large
+        while len(self._cache) > 1 and (
+                len(self._cache) > self.cache_size or self._cache_total > self.cache_bytes):
+            _, (_, evicted_size) = self._cache.popitem(last=False)
+            self._cache_total -= evicted_size
+        return item
+
+    def _clear_cache(self):
+        self._cache.clear()
+        self._cache_total = 0
+
+    def _check_index(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("index out of range")
+        return index
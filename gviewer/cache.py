@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """ Mapping that evict the least recently used entry once it is full
+
+    Attributes:
+        size: max number of entries
+        weigh: callable that returns the weight of a value, None if entries are not weighed
+        max_weight: max total weight of entries, None for no limit
+    """
+    def __init__(self, size, weigh=None, max_weight=None):
+        self.size = size
+        self.weigh = weigh
+        self.max_weight = max_weight
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """ Get the entry and mark it as recently used """
+        if key not in self._entries:
+            return default
+        value = self._entries.pop(key)
+        self._entries[key] = value
+        return value
+
+    def put(self, key, value):
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        while len(self._entries) > self.size or self._overweight():
+            self._entries.popitem(last=False)
+
+    def _overweight(self):
+        # NOTE: weights are summed on each put, since a value could grow after it is put,
+        #       and the entry just put is always kept
+        if self.max_weight is None or len(self._entries) <= 1:
+            return False
+        return sum(self.weigh(v) for v in self._entries.values()) > self.max_weight
+
+    def pop(self, key, default=None):
+        return self._entries.pop(key, default)
+
+    def clear(self):
+        self._entries.clear()
@@ -9,13 +9,26 @@ class Config(object):
         header: header content
         keys: dictionary define key mapping
         template: list of tuple for default stylesheet
+        auto_scroll: scroll to the latest message when focus is at the bottom
+        virtual_list: materialize summary widgets only for visible rows
+        filter_chunk_size: number of summaries to match per event loop tick when searching
+        search_debounce: seconds to wait after typing before searching, None to search only on enter
+        fps: max frames per second to redraw for incoming messages, None for no limit
     """
     def __init__(self,
                  header="General Viewer",
                  keys=vim,
                  template=default,
-                 auto_scroll=False):
+                 auto_scroll=False,
+                 virtual_list=False,
+                 filter_chunk_size=5000,
+                 search_debounce=0.15,
+                 fps=30):
         self.header = header
         self.keys = keys
         self.template = template
         self.auto_scroll = auto_scroll
+        self.virtual_list = virtual_list
+        self.filter_chunk_size = filter_chunk_size
+        self.search_debounce = search_debounce
+        self.fps = fps
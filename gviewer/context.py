@@ -1,4 +1,11 @@
+from urwid.util import decompose_tagmarkup
+
 from gviewer.action import Actions
+from gviewer.cache import LRUCache
+from gviewer.displayer import BaseDisplayer
+from gviewer.index import TrigramIndex
+from gviewer.instrument import instrument
+from gviewer.scheduler import RedrawScheduler
 
 
 class Context(object):
@@ -7,11 +14,13 @@ class Context(object):
     Attributes:
         config: Config instance
         main_displayer_context: DisplayerContext instance for main view
+        scheduler: RedrawScheduler instance
     """
     def __init__(self, config, main_context, other_contexts=None):
         self.config = config
         self.main_context = main_context
         self.other_contexts = other_contexts or []
+        self.scheduler = RedrawScheduler(config.fps)
 
 
 class DisplayerContext(object):
@@ -21,8 +30,156 @@ class DisplayerContext(object):
         store: DataStore instance
         displayer: BaseDisplayer implementation instance
         actions: Actions instance
+        summary_cache: LRUCache of summary markup and plain text by message identity,
+                       None if summary_cache_size is 0
+        summary_index: bool that summary walker should maintain a TrigramIndex for filtering,
+                       disabled by default as it slow down receiving messages
+        detail_cache: LRUCache of DetailWidget by message identity and view index,
+                      None if detail_cache_size is 0
+        prefetch_executor: optional concurrent.futures Executor that build the first view
+                           of the focused summary item and its neighbors in advance
+        prefetch_radius: number of neighbors to prefetch on each side of the focused item
     """
-    def __init__(self, store, displayer, actions=None):
+    def __init__(self, store, displayer, actions=None, summary_cache_size=4096,
+                 summary_index=False, detail_cache_size=16, detail_cache_lines=100000,
+                 prefetch_executor=None, prefetch_radius=1):
         self.store = store
         self.displayer = displayer
         self.actions = actions or Actions()
+        self.summary_cache = LRUCache(summary_cache_size) if summary_cache_size else None
+        self.summary_index = summary_index
+        # NOTE: detail widgets are weighed by lines they had built, which grow while scrolling
+        self.detail_cache = LRUCache(
+            detail_cache_size, weigh=lambda entry: entry[1].loaded(),
+            max_weight=detail_cache_lines) if detail_cache_size else None
+        self.prefetch_executor = prefetch_executor
+        self.prefetch_radius = prefetch_radius
+        self._prefetching = {}
+
+    def create_summary_index(self):
+        """ Create the index for filtering summary
+
+        The index only work with the substring semantics of BaseDisplayer.match
+
+        Returns:
+            TrigramIndex instance, or None if disabled or the displayer define its own match
+        """
+        if not self.summary_index or not self.uses_default_match():
+            return None
+        return TrigramIndex()
+
+    def uses_default_match(self):
+        """ Check that the displayer match by substring of summary as BaseDisplayer
+
+        So that the result of a keyword would contain the result of any longer keyword contain it
+        """
+        match = getattr(self.displayer, "match", None)
+        return _function(match) is _function(BaseDisplayer.match)
+
+    def summary(self, message, cache=True):
+        """ Summary of message generated by displayer
+
+        Args:
+            message: message to summarize
+            cache: False to bypass summary_cache, e.g. for message loaded from disk
+
+        Returns:
+            tuple of (text markup, plain text)
+        """
+        if self.summary_cache is None or not cache:
+            return self._summary(message)
+
+        entry = self.summary_cache.get(id(message))
+        # NOTE: keep the message in entry so that the id would not be reused by other message
+        if entry is not None and entry[0] is message:
+            return entry[1], entry[2]
+
+        markup, plain_text = self._summary(message)
+        self.summary_cache.put(id(message), (message, markup, plain_text))
+        return markup, plain_text
+
+    def invalidate_summary(self, message):
+        """ Drop the cached summary of message """
+        if self.summary_cache is not None:
+            self.summary_cache.pop(id(message))
+
+    def cached_detail(self, message, index):
+        """ Cached DetailWidget of message and view index
+
+        Returns:
+            DetailWidget instance, or None if it is not cached
+        """
+        if self.detail_cache is None:
+            return None
+        entry = self.detail_cache.get((id(message), index))
+        # NOTE: keep the message in entry so that the id would not be reused by other message
+        if entry is not None and entry[0] is message:
+            return entry[1]
+        return None
+
+    def cache_detail(self, message, index, widget):
+        if self.detail_cache is not None:
+            self.detail_cache.put((id(message), index), (message, widget))
+
+    def invalidate_detail(self, message):
+        """ Drop the cached DetailWidget of all views of message """
+        if self.detail_cache is not None:
+            for index in range(len(self.displayer.get_views())):
+                self.detail_cache.pop((id(message), index))
+
+    def prefetch(self, messages, index=0):
+        """ Build views of messages in prefetch executor
+
+        Messages whose view is cached or being prefetched are skipped,
+        and prefetching of messages not in messages are cancelled
+
+        Args:
+            messages: list of message, in the order of priority
+            index: view's index
+        """
+        if self.prefetch_executor is None:
+            return
+        view_callable = self.displayer.get_views()[index][1]
+        prefetching = {}
+        for message in messages:
+            key = (id(message), index)
+            entry = self._prefetching.pop(key, None)
+            if entry is not None and entry[0] is message:
+                prefetching[key] = entry
+            elif self.cached_detail(message, index) is None:
+                prefetching[key] = (message, self.prefetch_executor.submit(
+                    _prefetch_view, view_callable, message))
+        for _, future in self._prefetching.values():
+            future.cancel()
+        self._prefetching = prefetching
+
+    def prefetched_view(self, message, index):
+        """ Take the prefetched view of message, wait for it if it is in progress
+
+        Returns:
+            tuple of (View, plain text), or None if it is not prefetched or failed
+        """
+        entry = self._prefetching.pop((id(message), index), None)
+        if entry is None or entry[0] is not message:
+            return None
+        try:
+            return entry[1].result()
+        except Exception:
+            # NOTE: the view would be built again on the event loop, where the error is reported
+            return None
+
+    def _summary(self, message):
+        markup = instrument.timed("displayer.summary", self.displayer.summary)(message)
+        text, _ = decompose_tagmarkup(markup)
+        return markup, text
+
+
+def _prefetch_view(view_callable, message):
+    # NOTE: called in worker thread, generators of the view are consumed here instead of the event loop
+    view = view_callable(message).materialize()
+    return view, view.__unicode__()
+
+
+def _function(method):
+    # NOTE: bound method, and unbound method of py27, wrap the function
+    return getattr(method, "__func__", method)
@@ -1,3 +1,6 @@
+from gviewer.instrument import instrument
+
+
 class Controller(object):
     """Controller provide UI interaction API
 
@@ -45,6 +48,32 @@ class Controller(object):
         """Back to previous view"""
         self.parent.back()
 
+    def open_stats(self):
+        """Open live performance stats view"""
+        self.parent.open_stats()
+
+    def enable_instrument(self, enabled=True):
+        """Start or stop recording timings of hot paths
+
+        Args:
+            enabled: bool to start or stop, recorded timings are kept
+        """
+        instrument.enabled = enabled
+
+    def timings(self):
+        """Timings of hot paths recorded since enabled
+
+        Returns:
+            dict of stage to dict of count, p50, p99 and max in seconds,
+            stages are store.transform, walker.receive, displayer.summary,
+            displayer.match, detail.build and render.frame
+        """
+        return instrument.stats()
+
+    def reset_timings(self):
+        """Drop the recorded timings"""
+        instrument.reset()
+
     def _update_info(self, widget, info):
         self.parent.update_info(widget, info)
 
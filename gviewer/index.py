@@ -0,0 +1,108 @@
+from array import array
+
+
+class TrigramIndex(object):
+    """ Inverted index from trigrams of summary text to the keys of messages
+
+    Used to narrow the candidates of substring match, candidates still need to be verified.
+    The index is dropped and disabled once it exceed max_bytes, and would never be rebuilt
+
+    Attributes:
+        max_bytes: max estimated size of the index in bytes, None for unlimited
+        nbytes: estimated size of the index in bytes
+        enabled: False once the index exceed max_bytes
+        stale: True if keys had been shifted and the index should be rebuilt
+    """
+    # NOTE: rough cost of a new trigram, include the str, the array and the dict slot
+    _entry_overhead = 160
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.enabled = True
+        self.stale = False
+        self._postings = {}
+        self._discarded = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, key, text):
+        """ Index text of the message identified by key """
+        if not self.enabled:
+            return
+        for trigram in _trigrams(text):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                posting = self._postings[trigram] = array("L")
+                self.nbytes += self._entry_overhead
+            posting.append(key)
+            self.nbytes += posting.itemsize
+        self._count += 1
+
+        if self.max_bytes is not None and self.nbytes > self.max_bytes:
+            self.clear()
+            self.enabled = False
+
+    def candidates(self, keyword):
+        """ Keys of messages that might contain keyword
+
+        Returns:
+            sorted list of keys, or None if the index could not narrow the candidates
+        """
+        if not self.enabled or self.stale or len(keyword) < 3:
+            return None
+        postings = []
+        for trigram in _trigrams(keyword):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        keys = set(postings[0]).intersection(*postings[1:])
+        return sorted(keys)
+
+    def discard_before(self, key, count):
+        """ Drop keys less than key, the postings are compacted once the half are discarded
+
+        Args:
+            key: the smallest key that still alive
+            count: number of messages that are discarded by this call
+        """
+        self._discarded += count
+        if self._discarded * 2 < self._count:
+            return
+        for trigram in list(self._postings):
+            posting = array("L", (k for k in self._postings[trigram] if k >= key))
+            self.nbytes -= (len(self._postings[trigram]) - len(posting)) * posting.itemsize
+            if posting:
+                self._postings[trigram] = posting
+            else:
+                del self._postings[trigram]
+                self.nbytes -= self._entry_overhead
+        self._count -= self._discarded
+        self._discarded = 0
+
+    def rebuild(self, items):
+        """ Rebuild the index, do nothing but clear if the index is disabled
+
+        Args:
+            items: iterable of (key, text)
+        """
+        self.clear()
+        if not self.enabled:
+            return
+        for key, text in items:
+            self.add(key, text)
+
+    def clear(self):
+        self._postings.clear()
+        self.nbytes = 0
+        self.stale = False
+        self._discarded = 0
+        self._count = 0
+
+
+def _trigrams(text):
+    return set(text[i:i + 3] for i in range(len(text) - 2))
@@ -0,0 +1,125 @@
+import math
+import time
+
+
+class Histogram(object):
+    """ Histogram of durations in log scaled buckets
+
+    Each bucket is 5% wider than the previous one,
+    so that percentiles are accurate within 5% with constant memory
+
+    Attributes:
+        count: number of durations recorded
+        total: sum of durations in seconds
+        max: max duration in seconds
+    """
+    __slots__ = ("count", "total", "max", "_buckets")
+
+    _base = 1.05
+    _min = 1e-7
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = int(math.log(max(seconds, self._min) / self._min, self._base))
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def percentile(self, percent):
+        """ Upper bound of the bucket that the percentile fall in
+
+        Args:
+            percent: float between 0 and 100
+
+        Returns:
+            seconds, or None if nothing is recorded
+        """
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(self._min * self._base ** (bucket + 1), self.max)
+        return self.max  # pragma: no cover
+
+    def summary(self):
+        """ Returns dict of count, p50, p99 and max """
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class Instrument(object):
+    """ Record timings of the hot paths in histograms by stage
+
+    Recording is disabled by default, and only cost an attribute check when disabled
+
+    Attributes:
+        enabled: bool that timings are recorded
+        histograms: dict of stage name to Histogram
+    """
+    def __init__(self, clock=time.time):
+        self.enabled = False
+        self.histograms = {}
+        self._clock = clock
+
+    def start(self):
+        """ Start timing a span
+
+        Returns:
+            start time, or None if disabled
+        """
+        if not self.enabled:
+            return None
+        return self._clock()
+
+    def stop(self, stage, start):
+        """ Record the span started by start """
+        if start is not None:
+            self.record(stage, self._clock() - start)
+
+    def record(self, stage, seconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        histogram.add(seconds)
+
+    def timed(self, stage, func):
+        """ Wrap func to record the timing of each call
+
+        Returns:
+            func itself if disabled, so that calling it in a loop cost nothing
+        """
+        if not self.enabled:
+            return func
+
+        def wrapper(*args, **kwargs):
+            start = self._clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, self._clock() - start)
+        return wrapper
+
+    def stats(self):
+        """ Returns dict of stage to dict of count, p50, p99 and max in seconds """
+        return dict((stage, h.summary()) for stage, h in self.histograms.items())
+
+    def reset(self):
+        self.histograms = {}
+
+
+# NOTE: shared by all GViewer components, so that data stores and displayers need no reference to it
+instrument = Instrument()
@@ -5,6 +5,7 @@ from gviewer.basic_widget import BasicWidget, ReadonlyConfirmWidget
 from gviewer.controller import Controller
 from gviewer.view.summary import SummaryListWidget
 from gviewer.view.error import ErrorWidget
+from gviewer.view.stats import StatsWidget
 
 
 class ParentFrame(urwid.Frame):
@@ -12,10 +13,12 @@ class ParentFrame(urwid.Frame):
 
     Attributes:
         context: Context
+        exit_func: callable to exit GViewer instead of raising ExitMainLoop
     """
     def __init__(self, context):
         self.context = context
         self.controller = Controller(self)
+        self.exit_func = None
 
         self.main = SummaryListWidget(
             context.main_context, controller=self.controller,
@@ -27,6 +30,7 @@ class ParentFrame(urwid.Frame):
         header = urwid.Text(context.config.header)
         header = urwid.AttrMap(header, "header")
         self.footer = Footer(controller=self.controller)
+        self.stats_widget = None
 
         self.histories = []
 
@@ -75,13 +79,24 @@ class ParentFrame(urwid.Frame):
                 controller=self.controller))
 
     def exit(self):
-        raise urwid.ExitMainLoop()
+        if self.exit_func:
+            self.exit_func()
+        else:
+            raise urwid.ExitMainLoop()
 
     def open_error(self):
         """Open ErrorWidget"""
         widget = ErrorWidget(controller=self.controller, context=self.context)
         self.open_view(widget, True)
 
+    def open_stats(self):
+        """Open StatsWidget of all summary lists"""
+        if self.stats_widget is None:
+            self.stats_widget = StatsWidget(
+                [self.main] + list(self.others.values()),
+                controller=self.controller, context=self.context)
+        self.open_view(self.stats_widget)
+
     def notify(self, message):
         """Notify message"""
         self.footer.notify(message)
@@ -0,0 +1,100 @@
+import time
+import urwid
+from collections import OrderedDict
+
+from gviewer.instrument import instrument
+
+
+class RedrawScheduler(object):
+    """ Limit the redraws of GViewer to at most fps frames per second
+
+    Redraws triggered by incoming messages, alarms or watched files
+    are coalesced into the next frame, and callbacks requested between frames
+    (like footer info update and auto scroll) run once right before it.
+    Redraws after user input are drawn immediately without waiting for the next frame
+
+    Attributes:
+        fps: max frames per second, None for no limit
+        loop: urwid.MainLoop that draw the screen, None if not attached
+        frames: number of frames had been drawn
+        last_render: seconds that the last frame took to render and draw
+    """
+    def __init__(self, fps=30, clock=time.time):
+        self.fps = fps
+        self.loop = None
+        self.frames = 0
+        self.last_render = None
+        self._clock = clock
+        self._callbacks = OrderedDict()
+        self._last_frame = None
+        self._alarm = None
+        self._input = False
+
+    def attach(self, loop):
+        self.loop = loop
+
+    def request(self, callback):
+        """ Run callback once before the next frame
+
+        Callbacks that are requested more than once in a frame only run once,
+        and run immediately if the scheduler is not attached
+        """
+        if self.loop is None:
+            callback()
+            return
+        self._callbacks[callback] = None
+
+    def on_input(self):
+        """ Draw the next frame as soon as the input is processed """
+        self._input = True
+
+    def on_idle(self):
+        """ Draw the frame if it is due, or schedule it at the frame interval """
+        if self._input or self.fps is None or self._last_frame is None:
+            self.draw()
+            return
+        delay = self._last_frame + 1.0 / self.fps - self._clock()
+        if delay <= 0:
+            self.draw()
+        elif self._alarm is None:
+            # NOTE: event loop enter idle again after the alarm, the frame is drawn then
+            self._alarm = self.loop.set_alarm_in(delay, self._on_alarm)
+
+    def draw(self):
+        """ Run the requested callbacks and draw the screen """
+        self._input = False
+        if self._alarm is not None:
+            self.loop.remove_alarm(self._alarm)
+            self._alarm = None
+        callbacks, self._callbacks = self._callbacks, OrderedDict()
+        for callback in callbacks:
+            callback()
+        self._last_frame = self._clock()
+        self.frames += 1
+        if self.loop.screen.started:
+            self.loop.draw_screen()
+            self.last_render = self._clock() - self._last_frame
+            if instrument.enabled:
+                instrument.record("render.frame", self.last_render)
+
+    def _on_alarm(self, loop, user_data):
+        self._alarm = None
+
+
+class MainLoop(urwid.MainLoop):
+    """ urwid.MainLoop that redraw through RedrawScheduler
+
+    Attributes:
+        scheduler: RedrawScheduler instance
+    """
+    def __init__(self, widget, scheduler, **kwargs):
+        super(MainLoop, self).__init__(widget, **kwargs)
+        self.scheduler = scheduler
+        scheduler.attach(self)
+
+    def process_input(self, keys):
+        self.scheduler.on_input()
+        return super(MainLoop, self).process_input(keys)
+
+    def entering_idle(self):
+        self.scheduler.on_idle()
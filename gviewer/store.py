@@ -1,44 +1,283 @@
+import codecs
+import json
+import mmap
+import os
+import sys
+import threading
+from array import array
+from collections import deque
+
+from gviewer.buffer import OFFSET_TYPECODE
+from gviewer.instrument import instrument
+from gviewer.util import stringfy
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # pragma: no cover, python 2 without futures
+    ProcessPoolExecutor = None
+
+
 class BaseDataStore(object):
     """ Base absctract class for data store
 
     Attributes:
         walkers: list of Walkers, that would listener any message received from data store
+        max_items: max number of messages that walkers would retain, None for unlimited
+        max_bytes: max total sizeof messages that walkers would retain, None for unlimited
+        memory_budget: max total sizeof messages kept in memory, others would be spilled to disk
+        spill_dir: directory for spilled messages, None for system temporary directory
+        executor: optional concurrent.futures Executor that run transform in batches
+        transform_batch_size: max number of messages per transform task
+        controller: Controller used to report transform errors
+        received: number of messages had been delivered to walkers
     """
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, memory_budget=None, spill_dir=None,
+                 executor=None, transform_batch_size=1000):
         self.walkers = []
+        self.loop = None
+        self.controller = None
+        self.received = 0
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.executor = executor
+        self.transform_batch_size = transform_batch_size
+        self._inflight = deque()
+        self._batch = []
+        self._batch_alarm = None
+
+        process_pool = ProcessPoolExecutor is not None and isinstance(executor, ProcessPoolExecutor)
+        if process_pool and getattr(self.transform, "__self__", None) is self:
+            raise ValueError(
+                "transform of {0} must be a staticmethod to run in ProcessPoolExecutor".format(
+                    type(self).__name__))
+        self._transform_waker = None
 
     def on_message(self, message):
-        transformed_msg = self.transform(message)
+        if self.executor is not None:
+            self._batch.append(message)
+            if len(self._batch) >= self.transform_batch_size or self._transform_waker is None:
+                self._submit_batch()
+            elif self._batch_alarm is None:
+                # NOTE: submit the messages received in the same tick as one batch
+                self._batch_alarm = self.loop.set_alarm_in(0, self._on_batch_alarm)
+            return
+        transformed_msg = instrument.timed("store.transform", self.transform)(message)
+        self.received += 1
+        start = instrument.start()
         for walker in self.walkers:
             walker.recv(transformed_msg)
+        instrument.stop("walker.receive", start)
+
+    def on_messages(self, messages):
+        """ Deliver a batch of messages
+
+        Each walker receive the whole transformed batch at once,
+        so that it would only be extended and refreshed once
+        """
+        if self.executor is not None:
+            self._submit_batch()
+            messages = list(messages)
+            for i in range(0, len(messages), self.transform_batch_size):
+                self._submit(messages[i:i + self.transform_batch_size])
+            return
+        transform = instrument.timed("store.transform", self.transform)
+        transformed_msgs = [transform(m) for m in messages]
+        self._deliver(transformed_msgs)
+
+    def _deliver(self, transformed_msgs):
+        self.received += len(transformed_msgs)
+        start = instrument.start()
+        for walker in self.walkers:
+            walker.recv_batch(transformed_msgs)
+        instrument.stop("walker.receive", start)
+
+    def _on_batch_alarm(self, loop, user_data):
+        self._batch_alarm = None
+        self._submit_batch()
+
+    def _submit_batch(self):
+        """ Submit the messages collected by on_message """
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._submit(batch)
+
+    def _submit(self, messages):
+        """ Run transform of messages in executor
+
+        Results are delivered in the submitted order on the event loop,
+        or immediately if no event loop is attached
+        """
+        future = self.executor.submit(_transform_batch, self.transform, messages)
+        self._inflight.append((future, len(messages)))
+        if self._transform_waker is None:
+            self.flush()
+        else:
+            future.add_done_callback(self._on_transformed)
+
+    def _on_transformed(self, future):
+        # NOTE: called in worker thread, results are delivered on the event loop
+        self._transform_waker.notify()
+
+    def _on_transform_wakeup(self, data):
+        self.collect()
+        return True
+
+    def collect(self):
+        """ Deliver transformed batches that are ready, in the submitted order
+
+        Batch that is not finished yet block the batches after it,
+        so that walkers always receive messages in arrival order
+
+        Returns:
+            number of batches that are still in progress
+        """
+        while self._inflight and self._inflight[0][0].done():
+            self._collect_one(self._inflight.popleft()[0])
+        return len(self._inflight)
+
+    def flush(self):
+        """ Wait for all submitted transforms and deliver them """
+        self._submit_batch()
+        while self._inflight:
+            self._collect_one(self._inflight.popleft()[0])
+
+    def pending(self):
+        """ Number of messages that not delivered yet """
+        return len(self._batch) + sum(count for _, count in self._inflight)
+
+    def _collect_one(self, future):
+        try:
+            results = future.result()
+        except Exception as e:
+            self._report_error(e)
+            return
+
+        transformed_msgs = []
+        error = None
+        for ok, result in results:
+            if ok:
+                transformed_msgs.append(result)
+            elif error is None:
+                error = result
+        if transformed_msgs:
+            self._deliver(transformed_msgs)
+        if error is not None:
+            self._report_error(error)
+
+    def _report_error(self, error):
+        if self.controller is None:
+            raise error
+        try:
+            raise error
+        except Exception:
+            self.controller.open_error()
+
+    def attach(self, loop, controller=None):
+        """ Attach the urwid MainLoop that GViewer run with
+
+        Args:
+            loop: urwid.MainLoop instance
+            controller: Controller used to report errors occurred outside walkers
+        """
+        self.loop = loop
+        self.controller = controller
+        if self.executor is not None:
+            self._transform_waker = _Waker(loop, self._on_transform_wakeup)
+
+    def create_event_loop(self):
+        """ urwid event loop that the data store required
+
+        Returns:
+            urwid EventLoop instance, or None if any event loop is acceptable
+        """
+        return None
 
     def register(self, walker):
         self.walkers.append(walker)
 
     def unregister(self, walker):
-        self.walkers.remove(walker)
+        # NOTE: walker could be a list, remove by identity instead of equality
+        self.walkers = [w for w in self.walkers if w is not walker]
+
+    @staticmethod
+    def transform(msg):
+        """ Transform message before delivered to walkers
 
-    def transform(self, msg):
+        With a ProcessPoolExecutor, transform would be pickled,
+        it must be a staticmethod so that the data store is not pickled with it
+        """
         return msg
 
+    def sizeof(self, msg):
+        """ Estimated size of message in bytes, used by max_bytes retention
+
+        Override it if message is a container that sys.getsizeof could not measure
+        """
+        return sys.getsizeof(msg)
+
     def setup(self):
         raise NotImplementedError
 
 
+def _transform_batch(transform, messages):
+    """ Transform messages in executor, exceptions are returned instead of raised
+
+    Returns:
+        list of (ok, transformed message or exception)
+    """
+    results = []
+    for message in messages:
+        try:
+            results.append((True, transform(message)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class _Waker(object):
+    """ Wake up urwid MainLoop from other threads
+
+    Notifications are coalesced until the callback run on the event loop
+
+    Attributes:
+        callback: callable run on the event loop, with the data read from pipe
+    """
+    def __init__(self, loop, callback):
+        self.callback = callback
+        self._notified = False
+        self._lock = threading.Lock()
+        self._pipe = loop.watch_pipe(self._on_pipe)
+
+    def notify(self):
+        """ Could be called from any thread """
+        with self._lock:
+            if self._notified:
+                return
+            self._notified = True
+        os.write(self._pipe, b"1")
+
+    def _on_pipe(self, data):
+        with self._lock:
+            self._notified = False
+        return self.callback(data)
+
+
 class StaticDataStore(BaseDataStore):
     """
     Used for static unmodified data that load data at first time
 
     Attributes:
         messages: list of any type of message
+        kwargs: retention and spill options defined in BaseDataStore
     """
-    def __init__(self, messages):
-        super(StaticDataStore, self).__init__()
+    def __init__(self, messages, **kwargs):
+        super(StaticDataStore, self).__init__(**kwargs)
         self.messages = messages
 
     def setup(self):
-        for message in self.messages:
-            self.on_message(message)
+        self.on_messages(self.messages)
 
 
 class AsyncDataStore(BaseDataStore):
@@ -47,10 +286,438 @@ class AsyncDataStore(BaseDataStore):
 
     Attributes:
         register_func: callable that would accept a callable for on_message callback
+        kwargs: retention and spill options defined in BaseDataStore
     """
-    def __init__(self, register_func):
-        super(AsyncDataStore, self).__init__()
+    def __init__(self, register_func, **kwargs):
+        super(AsyncDataStore, self).__init__(**kwargs)
         self.register_func = register_func
 
     def setup(self):
         self.register_func(self.on_message)
+
+
+class ThreadSafeDataStore(AsyncDataStore):
+    """
+    Used for async data that produced by other threads
+
+    Messages from any thread are queued, and drained on the urwid event loop
+    in batches, so walkers would only be modified on the UI thread
+
+    Attributes:
+        register_func: optional callable that would accept a callable for put callback
+        drain_budget: max number of messages to deliver per event loop tick
+    """
+    def __init__(self, register_func=None, drain_budget=1000, **kwargs):
+        super(ThreadSafeDataStore, self).__init__(register_func, **kwargs)
+        self.drain_budget = drain_budget
+        self._queue = deque()
+        self._waker = None
+        self._drain_alarm = None
+
+    def put(self, message):
+        """ Queue a message, could be called from any thread """
+        self._queue.append(message)
+        self._wakeup()
+
+    def setup(self):
+        if self.loop is not None:
+            self._waker = _Waker(self.loop, self._on_wakeup)
+        if self.register_func:
+            self.register_func(self.put)
+        if self._queue:
+            # NOTE: messages put before setup had no waker to notify
+            self._wakeup()
+
+    def drain(self):
+        """ Deliver queued messages up to drain_budget to walkers
+
+        Returns:
+            True if there are still messages remain in the queue
+        """
+        batch = []
+        while self._queue and len(batch) < self.drain_budget:
+            batch.append(self._queue.popleft())
+        if batch:
+            self.on_messages(batch)
+        return bool(self._queue)
+
+    def pending(self):
+        """ Number of queued messages and messages in transform that not delivered yet """
+        return len(self._queue) + super(ThreadSafeDataStore, self).pending()
+
+    def _wakeup(self):
+        if self._waker is not None:
+            self._waker.notify()
+
+    def _on_wakeup(self, data):
+        # NOTE: the pending alarm would drain the queue, so that only one budget is drained per tick
+        if self._drain_alarm is None:
+            self._drain()
+        return True
+
+    def _on_alarm(self, loop, user_data):
+        self._drain_alarm = None
+        self._drain()
+
+    def _drain(self):
+        if self.drain():
+            # NOTE: leave the rest to next tick so that input could be handled in between
+            self._drain_alarm = self.loop.set_alarm_in(0, self._on_alarm)
+
+
+class FileLine(object):
+    """ Line of file that is decoded only when its text is accessed
+
+    Attributes:
+        segment: FileSegment that the line belong to
+        index: line index in the segment
+    """
+    __slots__ = ("segment", "index")
+
+    def __init__(self, segment, index):
+        self.segment = segment
+        self.index = index
+
+    @property
+    def text(self):
+        return self.segment.line(self.index)
+
+    def __unicode__(self):
+        return self.text
+
+    def __str__(self):
+        return stringfy(self.text)
+
+
+class FileSegment(object):
+    """ mmap of one generation of a file with its line index
+
+    A new segment would be created when the file is rotated or truncated,
+    so that lines of the previous generation are still readable
+
+    Attributes:
+        path: file path
+        encoding: file encoding
+        ends: array of the offset of each line end
+        scanned: number of bytes had been indexed
+    """
+    def __init__(self, path, encoding="utf8"):
+        self.path = path
+        self.encoding = encoding
+        self.ends = array(OFFSET_TYPECODE)
+        self.scanned = 0
+        self.published = 0
+        self.finished = False
+
+        self._file = open(path, "rb")
+        self.inode = os.fstat(self._file.fileno()).st_ino
+        self._mmap = None
+        self._mapped = 0
+        self._lock = threading.Lock()
+
+    def size(self):
+        return os.fstat(self._file.fileno()).st_size
+
+    def scan(self):
+        """ Index the complete lines appended since last scan
+
+        Returns:
+            number of lines indexed
+        """
+        size = self.size()
+        if size > self._mapped:
+            self._remap(size)
+        if not self._mmap:
+            return 0
+
+        count = 0
+        pos = self.scanned
+        while True:
+            end = self._mmap.find(b"\n", pos, self._mapped)
+            if end < 0:
+                break
+            self.ends.append(end)
+            pos = end + 1
+            count += 1
+        self.scanned = pos
+        return count
+
+    def finish(self):
+        """ Index the last line that has no line break """
+        if not self.finished and self.scanned < self._mapped:
+            self.ends.append(self._mapped)
+            self.scanned = self._mapped
+        self.finished = True
+
+    def line(self, index):
+        start = self.ends[index - 1] + 1 if index else 0
+        with self._lock:
+            data = self._mmap[start:self.ends[index]]
+        return data.decode(self.encoding, "replace").rstrip(u"\r")
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._file.close()
+
+    def _remap(self, size):
+        new_mmap = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        with self._lock:
+            if self._mmap:
+                self._mmap.close()
+            self._mmap = new_mmap
+            self._mapped = size
+
+
+class FileDataStore(ThreadSafeDataStore):
+    """
+    Used for large file, like log file
+
+    The file is mmaped and its line offsets are indexed in a background thread,
+    every line is delivered as a FileLine that decode its text lazily.
+    FileLine only keep the line index, so memory_budget is not supported
+
+    Attributes:
+        path: file path
+        follow: keep delivering appended lines like tail -f, and reopen the file when rotated
+        encoding: file encoding
+        poll_interval: seconds between checking the file for appended data
+    """
+    def __init__(self, path, follow=False, encoding="utf8", poll_interval=0.5, **kwargs):
+        if kwargs.get("memory_budget") is not None:
+            raise ValueError("FileDataStore does not support memory_budget, FileLine could not be spilled")
+        super(FileDataStore, self).__init__(**kwargs)
+        self.path = path
+        self.follow = follow
+        self.encoding = encoding
+        self.poll_interval = poll_interval
+        self.segments = []
+        self.thread = None
+        self._stopped = threading.Event()
+
+    def setup(self):
+        super(FileDataStore, self).setup()
+        self.thread = threading.Thread(target=self._index)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def close(self):
+        """ Stop indexing the file and close the mmap and file of every segment """
+        self._stopped.set()
+        # NOTE: wait for the segment in scanning, its mmap is read without lock
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        for segment in self.segments:
+            segment.close()
+
+    def _index(self):
+        segment = self._open()
+        while True:
+            segment.scan()
+            if not self.follow:
+                segment.finish()
+            self._publish(segment)
+            if not self.follow or self._stopped.wait(self.poll_interval):
+                break
+            if self._rotated(segment):
+                segment.scan()
+                segment.finish()
+                self._publish(segment)
+                segment = self._open()
+
+    def _open(self):
+        segment = FileSegment(self.path, self.encoding)
+        self.segments.append(segment)
+        return segment
+
+    def _rotated(self, segment):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            # NOTE: file may be missing for a moment during rotation
+            return False
+        return stat.st_ino != segment.inode or stat.st_size < segment.scanned
+
+    def _publish(self, segment):
+        for index in range(segment.published, len(segment.ends)):
+            self.put(FileLine(segment, index))
+        segment.published = len(segment.ends)
+
+
+class JsonRecord(object):
+    """ Record of json file that is parsed only when its value is accessed
+
+    Attributes:
+        store: JsonDataStore that the record belong to
+        offset: byte offset of the record in the file
+        length: byte length of the record
+    """
+    __slots__ = ("store", "offset", "length")
+
+    def __init__(self, store, offset, length):
+        self.store = store
+        self.offset = offset
+        self.length = length
+
+    @property
+    def value(self):
+        return self.store.load(self.offset, self.length)
+
+
+class JsonDataStore(ThreadSafeDataStore):
+    """
+    Used for large json file, in JSON Lines or a top level JSON array
+
+    The file is parsed incrementally by chunks in a background thread,
+    and each record is delivered as soon as it is parsed.
+    Parse error is reported on the event loop after the records before it are delivered
+
+    Attributes:
+        path: file path
+        fmt: "lines" for JSON Lines, "array" for top level array,
+             "auto" to detect by the start of the file, see _detect_format
+        lazy: deliver JsonRecord that only keep the byte offset instead of parsed value,
+              memory_budget is not supported as JsonRecord could not be spilled
+        encoding: file encoding
+        chunk_size: bytes to read per chunk
+        error: exception that stop the parsing, None if no error
+    """
+    _detect_bytes = 65536
+
+    def __init__(self, path, fmt="auto", lazy=False, encoding="utf8",
+                 chunk_size=65536, **kwargs):
+        if lazy and kwargs.get("memory_budget") is not None:
+            raise ValueError("JsonDataStore does not support memory_budget with lazy, JsonRecord could not be spilled")
+        super(JsonDataStore, self).__init__(**kwargs)
+        self.path = path
+        self.fmt = fmt
+        self.lazy = lazy
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.error = None
+        self.thread = None
+        self._stopped = threading.Event()
+        self._file = None
+        self._file_lock = threading.Lock()
+        self._error_reported = False
+
+    def setup(self):
+        super(JsonDataStore, self).setup()
+        self.thread = threading.Thread(target=self._parse)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def close(self):
+        """ Stop parsing the file """
+        self._stopped.set()
+
+    def load(self, offset, length):
+        """ Parse the record at offset of the file """
+        with self._file_lock:
+            if self._file is None:
+                self._file = open(self.path, "rb")
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return json.loads(data.decode(self.encoding))
+
+    def drain(self):
+        remaining = super(JsonDataStore, self).drain()
+        if self.error is not None and not remaining and not self._error_reported:
+            self._error_reported = True
+            self._report_error(self.error)
+        return remaining
+
+    def _parse(self):
+        try:
+            for value, offset, length in self._records():
+                if self.lazy:
+                    self.put(JsonRecord(self, offset, length))
+                else:
+                    self.put(value)
+        except Exception as e:
+            self.error = e
+            # NOTE: called in worker thread, the error is reported when the queue is drained
+            self._wakeup()
+
+    def _detect_format(self):
+        """ Detect whether the file is JSON Lines or a top level array
+
+        Only the first _detect_bytes of the file are looked at.
+        A file start with "[" is a top level array, unless its first line is within them,
+        and is a complete value followed by other values,
+        i.e. JSON Lines whose first record is an array
+
+        Returns:
+            "lines" or "array"
+        """
+        with open(self.path, "rb") as f:
+            data = f.read(self._detect_bytes)
+            eof = len(data) < self._detect_bytes
+        text = codecs.getincrementaldecoder(self.encoding)(errors="ignore").decode(data, final=eof)
+        text = text.lstrip()
+        if not text.startswith(u"["):
+            return "lines"
+
+        line, newline, rest = text.partition(u"\n")
+        if not newline:
+            # NOTE: minified array, or the first line is too long to be a record of JSON Lines
+            return "array"
+        try:
+            _, end = json.JSONDecoder().raw_decode(line)
+        except ValueError:
+            return "array"
+        return "lines" if rest.strip() and not line[end:].strip() else "array"
+
+    def _records(self):
+        """ Generate (value, byte offset, byte length) of each record """
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder(self.encoding)()
+        buf = u""
+        pos = 0
+        offset = 0
+        eof = False
+        separators = None
+        fmt = self._detect_format() if self.fmt == "auto" else self.fmt
+
+        with open(self.path, "rb") as f:
+            while not self._stopped.is_set():
+                # NOTE: whitespace and separators are ascii so that each of them is one byte
+                start = pos
+                while pos < len(buf) and (buf[pos].isspace() or (separators and buf[pos] in separators)):
+                    pos += 1
+                offset += pos - start
+
+                if pos < len(buf) and separators is None:
+                    if fmt == "array":
+                        pos += 1
+                        offset += 1
+                        separators = u",]"
+                    else:
+                        separators = u""
+                    continue
+
+                end = None
+                if pos < len(buf):
+                    try:
+                        value, end = decoder.raw_decode(buf, pos)
+                    except ValueError:
+                        # NOTE: record of JSON Lines is complete once its line break is read
+                        if eof or (fmt == "lines" and buf.find(u"\n", pos) >= 0):
+                            raise
+
+                # NOTE: value end at buffer end may be cut, e.g. number
+                if end is None or (end == len(buf) and not eof):
+                    if eof:
+                        return
+                    chunk = f.read(self.chunk_size)
+                    eof = not chunk
+                    buf = buf[pos:] + text_decoder.decode(chunk, final=eof)
+                    pos = 0
+                    continue
+
+                length = len(buf[pos:end].encode(self.encoding)) if self.lazy else 0
+                yield value, offset, length
+                offset += length
+                pos = end
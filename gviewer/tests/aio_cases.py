@@ -0,0 +1,85 @@
+""" Test cases of gviewer.aio, imported by test_aio only on python that support its syntax """
+import asyncio
+import unittest
+import mock
+
+from gviewer.aio import AsyncioDataStore, start
+
+
+class TestAsyncioDataStore(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.walker = mock.Mock()
+
+    def _run_until_idle(self):
+        self.loop.run_until_complete(asyncio.sleep(0.01))
+
+    def test_consume_queue(self):
+        queue = asyncio.Queue()
+        data_store = AsyncioDataStore(queue, batch_size=2)
+        data_store.register(self.walker)
+        data_store.setup()
+
+        for i in range(3):
+            queue.put_nowait(i)
+        self._run_until_idle()
+
+        self.walker.recv_batch.assert_has_calls(
+            [mock.call([0, 1]), mock.call([2])])
+        self.assertEqual(data_store.pending(), 0)
+        self.assertEqual(data_store.received, 3)
+
+        data_store.close()
+        self._run_until_idle()
+
+    def test_consume_async_iterator(self):
+        async def source():
+            for i in range(3):
+                yield i
+
+        data_store = AsyncioDataStore(source())
+        data_store.register(self.walker)
+        data_store.attach(mock.Mock())
+        data_store.setup()
+        self._run_until_idle()
+
+        self.walker.recv_batch.assert_called_once_with([0, 1, 2])
+        data_store.loop.entering_idle.assert_called_with()
+
+    def test_resolve_running_loop(self):
+        data_store = AsyncioDataStore(asyncio.Queue())
+        other = asyncio.new_event_loop()
+        self.addCleanup(other.close)
+
+        async def run():
+            data_store.setup()
+            await asyncio.sleep(0)
+            data_store.close()
+
+        other.run_until_complete(run())
+        self.assertIs(data_store.aio_loop, other)
+
+    def test_create_event_loop(self):
+        data_store = AsyncioDataStore(asyncio.Queue())
+        self.assertIsNotNone(data_store.create_event_loop())
+
+
+class TestStart(unittest.TestCase):
+    def test_start_and_exit(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        viewer = mock.MagicMock()
+
+        async def run():
+            task = asyncio.ensure_future(start(viewer))
+            await asyncio.sleep(0)
+            viewer.setup_stores.assert_called_once_with()
+            self.assertFalse(task.done())
+
+            viewer.view.exit_func()
+            await task
+
+        loop.run_until_complete(run())
+        viewer.loop.start.return_value.__exit__.assert_called_once_with(None, None, None)
@@ -0,0 +1,17 @@
+import unittest
+
+from gviewer.benchmarks import delete
+from gviewer.view.summary import FilterSummaryListWalker
+
+
+class TestDeleteBenchmark(unittest.TestCase):
+    def test_measure(self):
+        self.assertGreater(delete.measure(FilterSummaryListWalker, 10), 0)
+        self.assertGreater(delete.measure(delete._LookupFilter, 10), 0)
+
+    def test_clear(self):
+        walker = delete._base_walker(10)
+        filter_walker = FilterSummaryListWalker(walker, " 500")
+        del filter_walker[:]
+        walker.compact()
+        self.assertEqual(len(walker), 5)
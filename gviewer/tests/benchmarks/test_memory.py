@@ -0,0 +1,10 @@
+import unittest
+
+from gviewer.benchmarks import memory
+
+
+class TestMemoryBenchmark(unittest.TestCase):
+    def test_measure(self):
+        for _, factory, baseline in memory.factories():
+            self.assertGreater(memory.measure(factory, count=10), 0)
+            self.assertGreater(memory.measure(baseline, count=10), 0)
@@ -0,0 +1,10 @@
+import unittest
+
+from gviewer.benchmarks import render
+from gviewer.view.summary import SummaryItemWidget
+
+
+class TestRenderBenchmark(unittest.TestCase):
+    def test_measure(self):
+        self.assertGreater(render.measure(SummaryItemWidget, rows=5, frames=3), 0)
+        self.assertGreater(render.measure(render._RebuildingItem, rows=5, frames=3), 0)
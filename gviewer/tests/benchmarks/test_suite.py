@@ -0,0 +1,60 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+
+from gviewer.benchmarks import suite
+from gviewer.view.detail import DetailWidget
+
+
+class TestHarness(unittest.TestCase):
+    def setUp(self):
+        self.harness = suite.Harness(detail_lines=10, size=(40, 5))
+
+    def test_feed(self):
+        self.harness.feed(25, batch_size=10)
+        self.assertEqual(len(self.harness.summary.base_walker), 25)
+
+    def test_press(self):
+        self.harness.feed(2)
+        self.harness.press("down")
+        self.assertEqual(self.harness.summary._w.focus_position, 1)
+        self.harness.press("enter")
+        self.assertIsInstance(self.harness.frame.contents["body"][0], DetailWidget)
+        self.assertEqual(self.harness.screen.frames, 2)
+
+
+class TestSuite(unittest.TestCase):
+    def test_ingest(self):
+        result = suite.ingest(20, batch_size=10)
+        self.assertEqual(result["count"], 20)
+        self.assertGreater(result["messages_per_second"], 0)
+
+    def test_filter_latency(self):
+        results = suite.filter_latency(sizes=(10, 20))
+        self.assertEqual([r["matches"] for r in results], [1, 2])
+
+    def test_detail_open(self):
+        results = suite.detail_open(lines=(5,))
+        self.assertEqual(results[0]["lines"], 5)
+
+    def test_scroll(self):
+        self.assertGreater(suite.scroll(10, frames=3)["seconds_per_frame"], 0)
+
+    def test_memory(self):
+        result = suite.memory(10)
+        self.assertGreater(result["peak_bytes_per_100k"], 0)
+
+    def test_main(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "results.json")
+            with mock.patch.object(suite, "run", return_value={"results": {}}) as run:
+                suite.main(["--quick", "--output", path])
+            run.assert_called_once_with(True)
+            with open(path) as f:
+                self.assertEqual(json.load(f), {"results": {}})
+        finally:
+            shutil.rmtree(directory)
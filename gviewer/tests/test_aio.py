@@ -0,0 +1,10 @@
+import sys
+import unittest
+
+if sys.version_info >= (3, 7):
+    from gviewer.tests.aio_cases import TestAsyncioDataStore, TestStart  # noqa: F401
+else:  # pragma: no cover
+    @unittest.skip("gviewer.aio requires python 3.7")
+    class TestAio(unittest.TestCase):
+        def test_aio(self):
+            pass
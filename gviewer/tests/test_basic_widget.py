@@ -104,6 +104,39 @@ class TestFocusableText(unittest.TestCase):
             [[(None, None, b"plaintext")]]
         )
 
+    def test_cache_canvas(self):
+        text = FocusableText([("attr1", "text1"), "text2"], attr_map="summary")
+        text.render((10,), False)
+        text.render((10,), True)
+        self.assertEqual(len(text._canvases), 2)
+
+        focused = text._focused
+        text.render((10,), True)
+        self.assertIs(text._focused, focused)
+
+    def test_render_with_attr(self):
+        text = FocusableText([("attr1", "text1"), "text2"], attr_map="summary", focus_map="focus")
+        self.assertIsInstance(text._w, urwid.Text)
+        self.assertEqual(
+            [w for w in text.render((10,), False).content()],
+            [[("attr1", None, b"text1"), ("summary", None, b"text2")]]
+        )
+        self.assertEqual(
+            [w for w in text.render((10,), True).content()],
+            [[("focus", None, b"text1text2")]]
+        )
+
+    def test_set_text(self):
+        text = FocusableText("text1")
+        text.render((5,), True)
+        text.set_text("text2")
+        self.assertEqual(len(text._canvases), 0)
+        self.assertEqual(text.get_plain_text(), "text2")
+        self.assertEqual(
+            [w for w in text.render((5,), True).content()],
+            [[(None, None, b"text2")]]
+        )
+
 
 class TestSearchWidget(unittest.TestCase):
     def setUp(self):
@@ -136,6 +169,17 @@ class TestSearchWidget(unittest.TestCase):
             "")
         self.clear_func.assert_called_with()
 
+    def test_invoke_change(self):
+        change_func = mock.Mock()
+        widget = SearchWidget(self.search_func, self.clear_func, change_func=change_func)
+        widget.keypress((10,), "a")
+        widget.keypress((10,), "b")
+        change_func.assert_called_with("ab")
+        widget.keypress((10,), "backspace")
+        change_func.assert_called_with("a")
+        widget.keypress((10,), "left")
+        self.assertEqual(change_func.call_count, 3)
+
 
 class TestSearchableText(unittest.TestCase):
     def test_found_next_one(self):
@@ -159,6 +203,22 @@ class TestSearchableText(unittest.TestCase):
         self.assertTrue(widget.search_prev("match"))
         self.assertEqual(widget.prev_index, (8, 3))
 
+    def test_highlight(self):
+        widget = SearchableText("aaamatchbbbmatchccc")
+        widget.highlight("match", 0, 11)
+        self.assertEqual(widget.prev_index, (16, 11))
+        self.assertEqual(
+            widget._w.get_text(),
+            (u"aaamatchbbbmatchccc", [(None, 11), ("match", 5)]))
+
+    def test_highlight_in_markup(self):
+        widget = SearchableText([("key", "match: "), ("value", "aaa match")])
+        widget.highlight("match", 1, 4)
+        self.assertEqual(widget.prev_index, (2, 1))
+        self.assertEqual(
+            widget._w.get_text(),
+            (u"match: aaa match", [("key", 7), (None, 4), ("match", 5)]))
+
     def test_search_in_markup(self):
         widget = SearchableText([("no-match", "aaa"), " xxx ", ("yaya", "match"), " match ", ("end", "end")])
 
@@ -0,0 +1,109 @@
+import unittest
+
+from gviewer.buffer import RingBuffer, SpillBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = RingBuffer([1, 2, 3, 4])
+
+    def test_index(self):
+        self.assertEqual(len(self.buffer), 4)
+        self.assertEqual(self.buffer[0], 1)
+        self.assertEqual(self.buffer[-1], 4)
+        self.assertEqual(self.buffer[1:3], [2, 3])
+        with self.assertRaises(IndexError):
+            self.buffer[4]
+
+    def test_popleft(self):
+        self.assertEqual(self.buffer.popleft(), 1)
+        self.assertEqual(self.buffer[0], 2)
+        self.assertEqual(self.buffer.offset, 1)
+
+        self.assertEqual(self.buffer.popleft(2), 2)
+        self.assertEqual(list(self.buffer), [4])
+        self.assertEqual(self.buffer.offset, 3)
+        self.assertEqual(self.buffer._head, 0)
+
+    def test_append_after_popleft(self):
+        self.buffer.popleft()
+        self.buffer.append(5)
+        self.buffer.extend([6, 7])
+        self.assertEqual(list(self.buffer), [2, 3, 4, 5, 6, 7])
+
+    def test_delitem(self):
+        self.buffer.popleft()
+        del self.buffer[1]
+        self.assertEqual(list(self.buffer), [2, 4])
+        del self.buffer[:]
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_setitem(self):
+        self.buffer.popleft()
+        self.buffer[0] = 10
+        self.assertEqual(list(self.buffer), [10, 3, 4])
+
+
+class TestSpillBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = SpillBuffer(10, sizeof=len, cache_size=1)
+        self.buffer.extend(["aaaa", "bbbb", "cccc", "dddd"])
+
+    def tearDown(self):
+        self.buffer.close()
+
+    def test_spill(self):
+        self.assertEqual(len(self.buffer), 4)
+        self.assertEqual(self.buffer.spilled_count(), 2)
+        self.assertEqual(list(self.buffer), ["aaaa", "bbbb", "cccc", "dddd"])
+        self.assertEqual(self.buffer[-1], "dddd")
+        self.assertEqual(self.buffer[1:3], ["bbbb", "cccc"])
+        with self.assertRaises(IndexError):
+            self.buffer[4]
+
+    def test_keep_one_resident(self):
+        self.buffer.append("e" * 20)
+        self.assertEqual(self.buffer.spilled_count(), 4)
+        self.assertEqual(self.buffer[4], "e" * 20)
+
+    def test_popleft(self):
+        self.assertEqual(self.buffer.popleft(3), 3)
+        self.assertEqual(list(self.buffer), ["dddd"])
+        self.assertEqual(self.buffer.offset, 3)
+
+    def test_delitem(self):
+        del self.buffer[1:3]
+        self.assertEqual(list(self.buffer), ["aaaa", "dddd"])
+        del self.buffer[0]
+        self.assertEqual(list(self.buffer), ["dddd"])
+
+    def test_cache_bounded_by_bytes(self):
+        buffer = SpillBuffer(8, sizeof=len, cache_size=256)
+        buffer.extend(["aaaa", "bbbb", "cccc", "dddd", "eeee"])
+        self.assertEqual(buffer.cache_bytes, 2)
+        self.assertEqual(buffer.spilled_count(), 3)
+        self.assertEqual(buffer[:3], ["aaaa", "bbbb", "cccc"])
+        self.assertEqual(list(buffer._cache), [2])
+        self.assertEqual(buffer._cache_total, 4)
+
+        buffer.cache_bytes = 8
+        self.assertEqual(buffer[:3], ["aaaa", "bbbb", "cccc"])
+        self.assertEqual(list(buffer._cache), [1, 2])
+        self.assertEqual(buffer._cache_total, 8)
+
+        buffer.popleft(2)
+        self.assertEqual(buffer._cache_total, 0)
+        buffer.close()
+
+    def test_keep_unpicklable_resident(self):
+        buffer = SpillBuffer(4, sizeof=lambda item: 4)
+        buffer.append("aaaa")
+        buffer.append(lambda: None)
+        with self.assertRaises(Exception):
+            buffer.append("cccc")
+        self.assertEqual(buffer.spilled_count(), 1)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer[0], "aaaa")
+        self.assertTrue(callable(buffer[1]))
+        self.assertEqual(buffer[2], "cccc")
+        buffer.close()
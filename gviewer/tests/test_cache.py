@@ -0,0 +1,55 @@
+import unittest
+
+from gviewer.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(2)
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+
+    def test_get(self):
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("c"))
+        self.assertEqual(self.cache.get("c", 3), 3)
+
+    def test_evict_least_recently_used(self):
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+
+    def test_pop(self):
+        self.assertEqual(self.cache.pop("a"), 1)
+        self.assertIsNone(self.cache.pop("a"))
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestWeighedLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(3, weigh=len, max_weight=5)
+
+    def test_evict_by_weight(self):
+        self.cache.put("a", [1, 2])
+        self.cache.put("b", [1, 2])
+        self.cache.put("c", [1, 2])
+        self.assertNotIn("a", self.cache)
+        self.assertIn("b", self.cache)
+        self.assertIn("c", self.cache)
+
+    def test_weight_grow_after_put(self):
+        a = [1]
+        self.cache.put("a", a)
+        self.cache.put("b", [1])
+        a.extend([2, 3, 4, 5])
+        self.cache.put("c", [1])
+        self.assertNotIn("a", self.cache)
+
+    def test_keep_entry_just_put(self):
+        self.cache.put("a", [1])
+        self.cache.put("b", list(range(10)))
+        self.assertEqual(len(self.cache), 1)
+        self.assertIn("b", self.cache)
@@ -0,0 +1,149 @@
+import threading
+import unittest
+import mock
+from concurrent.futures import ThreadPoolExecutor
+
+from gviewer.context import DisplayerContext
+from gviewer.displayer import BaseDisplayer
+from gviewer.index import TrigramIndex
+from gviewer.view.element import View, Group, Text
+
+
+class TestDisplayerContext(unittest.TestCase):
+    def setUp(self):
+        self.displayer = mock.Mock()
+        self.displayer.summary = mock.Mock(
+            side_effect=lambda m: [("title", m[0]), m[1]])
+        self.context = DisplayerContext(None, self.displayer, summary_cache_size=1)
+
+    def test_summary(self):
+        message = ("a", "b")
+        self.assertEqual(
+            self.context.summary(message), ([("title", "a"), "b"], "ab"))
+        self.context.summary(message)
+        self.displayer.summary.assert_called_once_with(message)
+
+    def test_summary_evicted(self):
+        message = ("a", "b")
+        self.context.summary(message)
+        self.context.summary(("c", "d"))
+        self.context.summary(message)
+        self.assertEqual(self.displayer.summary.call_count, 3)
+
+    def test_invalidate_summary(self):
+        message = ("a", "b")
+        self.context.summary(message)
+        self.context.invalidate_summary(message)
+        self.context.summary(message)
+        self.assertEqual(self.displayer.summary.call_count, 2)
+
+    def test_without_cache(self):
+        context = DisplayerContext(None, self.displayer, summary_cache_size=0)
+        message = ("a", "b")
+        context.summary(message)
+        context.summary(message)
+        self.assertEqual(self.displayer.summary.call_count, 2)
+
+    def test_cached_detail(self):
+        message, detail = ["a", "b"], mock.Mock()
+        self.assertIsNone(self.context.cached_detail(message, 0))
+        self.context.cache_detail(message, 0, detail)
+        self.assertIs(self.context.cached_detail(message, 0), detail)
+        self.assertIsNone(self.context.cached_detail(message, 1))
+        self.assertIsNone(self.context.cached_detail(["a", "b"], 0))
+
+    def test_invalidate_detail(self):
+        self.displayer.get_views.return_value = [("view1", None), ("view2", None)]
+        message = ["a", "b"]
+        self.context.cache_detail(message, 0, mock.Mock(loaded=lambda: 1))
+        self.context.cache_detail(message, 1, mock.Mock(loaded=lambda: 1))
+        self.context.invalidate_detail(message)
+        self.assertIsNone(self.context.cached_detail(message, 0))
+        self.assertIsNone(self.context.cached_detail(message, 1))
+
+    def test_detail_cache_weighed_by_loaded_lines(self):
+        context = DisplayerContext(None, self.displayer, detail_cache_lines=10)
+        small, large = mock.Mock(), mock.Mock()
+        small.loaded.return_value = 1
+        large.loaded.return_value = 10
+        context.cache_detail("small", 0, small)
+        context.cache_detail("large", 0, large)
+        self.assertIsNone(context.cached_detail("small", 0))
+        self.assertIs(context.cached_detail("large", 0), large)
+
+    def test_without_detail_cache(self):
+        context = DisplayerContext(None, self.displayer, detail_cache_size=0)
+        context.cache_detail("message", 0, "detail")
+        self.assertIsNone(context.cached_detail("message", 0))
+        context.invalidate_detail("message")
+
+    def test_create_summary_index(self):
+        context = DisplayerContext(None, BaseDisplayer(), summary_index=True)
+        self.assertIsInstance(context.create_summary_index(), TrigramIndex)
+
+    def test_create_summary_index_disabled(self):
+        context = DisplayerContext(None, BaseDisplayer())
+        self.assertIsNone(context.create_summary_index())
+
+    def test_create_summary_index_with_custom_match(self):
+        class Displayer(BaseDisplayer):
+            def match(self, keyword, message, summary):
+                return keyword in message
+
+        context = DisplayerContext(None, Displayer(), summary_index=True)
+        self.assertIsNone(context.create_summary_index())
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(1)
+        self.addCleanup(self.executor.shutdown)
+        self.threads = []
+        self.displayer = mock.Mock()
+        self.displayer.get_views.return_value = [("view", self._view)]
+        self.context = DisplayerContext(None, self.displayer, prefetch_executor=self.executor)
+
+    def _view(self, message):
+        self.threads.append(threading.current_thread())
+        if message == "error":
+            raise ValueError(message)
+        return View([Group("title", (Text(m) for m in message))])
+
+    def test_prefetch(self):
+        message = ["a", "b"]
+        self.context.prefetch([message])
+        view, text = self.context.prefetched_view(message, 0)
+
+        self.assertIsNot(self.threads[0], threading.current_thread())
+        self.assertEqual(view.groups[0].items[1].content, "b")
+        self.assertEqual(text, u"title\na\nb\n")
+        self.assertIsNone(self.context.prefetched_view(message, 0))
+
+    def test_skip_prefetching_and_cached(self):
+        prefetching, cached = ["a"], ["b"]
+        self.context.prefetch([prefetching])
+        self.context.cache_detail(cached, 0, mock.Mock(loaded=lambda: 1))
+        self.context.prefetch([prefetching, cached])
+        self.executor.shutdown()
+
+        self.assertEqual(len(self.threads), 1)
+        self.assertIsNotNone(self.context.prefetched_view(prefetching, 0))
+        self.assertIsNone(self.context.prefetched_view(cached, 0))
+
+    def test_cancel_out_of_range(self):
+        message = ["a"]
+        future = mock.Mock()
+        self.context._prefetching[(id(message), 0)] = (message, future)
+        self.context.prefetch([["b"]])
+        future.cancel.assert_called_with()
+        self.assertIsNone(self.context.prefetched_view(message, 0))
+
+    def test_failed(self):
+        self.context.prefetch(["error"])
+        self.assertIsNone(self.context.prefetched_view("error", 0))
+
+    def test_disabled(self):
+        context = DisplayerContext(None, self.displayer)
+        context.prefetch([["a"]])
+        self.assertIsNone(context.prefetched_view(["a"], 0))
+        self.assertEqual(self.threads, [])
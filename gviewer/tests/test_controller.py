@@ -2,6 +2,7 @@ import unittest
 import mock
 
 from gviewer.controller import Controller
+from gviewer.instrument import instrument
 
 
 class TestController(unittest.TestCase):
@@ -40,6 +41,10 @@ class TestController(unittest.TestCase):
         self.controller.back()
         self.parent.back.assert_called_with()
 
+    def test_open_stats(self):
+        self.controller.open_stats()
+        self.parent.open_stats.assert_called_with()
+
     def test_focus_body(self):
         self.controller._focus_body()
         self.assertEqual(self.parent.focus_position, "body")
@@ -47,3 +52,14 @@ class TestController(unittest.TestCase):
     def test_run_before_keypress(self):
         self.controller._run_before_keypress()
         self.parent.run_before_keypress.assert_called_with()
+
+    def test_timings(self):
+        self.controller.enable_instrument()
+        self.assertTrue(instrument.enabled)
+        instrument.record("stage", 0.5)
+        self.assertEqual(self.controller.timings()["stage"]["count"], 1)
+
+        self.controller.enable_instrument(False)
+        self.assertFalse(instrument.enabled)
+        self.controller.reset_timings()
+        self.assertEqual(self.controller.timings(), {})
@@ -0,0 +1,54 @@
+import unittest
+
+from gviewer.index import TrigramIndex
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.add(0, "GET /api/users")
+        self.index.add(1, "POST /api/users")
+        self.index.add(2, "GET /static/main.js")
+
+    def test_candidates(self):
+        self.assertEqual(self.index.candidates("GET"), [0, 2])
+        self.assertEqual(self.index.candidates("/api/"), [0, 1])
+        self.assertEqual(self.index.candidates("DELETE"), [])
+
+    def test_short_keyword(self):
+        self.assertIsNone(self.index.candidates("GE"))
+
+    def test_stale(self):
+        self.index.stale = True
+        self.assertIsNone(self.index.candidates("GET"))
+        self.index.rebuild([(0, "GET /")])
+        self.assertEqual(self.index.candidates("GET"), [0])
+
+    def test_discard_before(self):
+        self.index.discard_before(2, 2)
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.candidates("GET"), [2])
+        self.assertIsNone(self.index._postings.get("POS"))
+
+    def test_max_bytes(self):
+        index = TrigramIndex(max_bytes=1000)
+        index.add(0, "abcdef")
+        self.assertTrue(index.enabled)
+        self.assertGreater(index.nbytes, 0)
+
+        index.add(1, "ghijklmnopqrstuvwxyz")
+        self.assertFalse(index.enabled)
+        self.assertEqual(index.nbytes, 0)
+        self.assertIsNone(index.candidates("abc"))
+
+    def test_not_rebuild_when_disabled(self):
+        index = TrigramIndex(max_bytes=1000)
+        index.add(0, "abcdefghijklmnopqrstuvwxyz")
+        self.assertFalse(index.enabled)
+
+        index.stale = True
+        index.rebuild([(0, "abcdef")])
+        self.assertFalse(index.enabled)
+        self.assertFalse(index.stale)
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.candidates("abc"))
@@ -0,0 +1,86 @@
+import unittest
+import mock
+
+from gviewer.instrument import Histogram, Instrument, instrument
+from gviewer.context import DisplayerContext
+from gviewer.displayer import BaseDisplayer
+from gviewer.store import StaticDataStore
+from gviewer.view.summary import SummaryListWalker
+
+
+class TestHistogram(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(
+            Histogram().summary(),
+            {"count": 0, "p50": None, "p99": None, "max": 0.0})
+
+    def test_percentile(self):
+        histogram = Histogram()
+        for i in range(1, 101):
+            histogram.add(i * 0.001)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.total, 5.05)
+        self.assertEqual(histogram.max, 0.1)
+        self.assertAlmostEqual(histogram.percentile(50), 0.05, delta=0.05 * 0.05)
+        self.assertAlmostEqual(histogram.percentile(99), 0.099, delta=0.099 * 0.05)
+        self.assertEqual(histogram.percentile(100), 0.1)
+
+    def test_zero(self):
+        histogram = Histogram()
+        histogram.add(0)
+        self.assertEqual(histogram.percentile(50), 0)
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.now = 10.0
+        self.instrument = Instrument(clock=lambda: self.now)
+
+    def test_disabled(self):
+        func = mock.Mock()
+        self.assertIs(self.instrument.timed("stage", func), func)
+        self.assertIsNone(self.instrument.start())
+        self.instrument.stop("stage", None)
+        self.assertEqual(self.instrument.stats(), {})
+
+    def test_span(self):
+        self.instrument.enabled = True
+        start = self.instrument.start()
+        self.now += 0.5
+        self.instrument.stop("stage", start)
+        self.assertEqual(self.instrument.stats()["stage"]["count"], 1)
+        self.assertEqual(self.instrument.stats()["stage"]["max"], 0.5)
+
+    def test_timed(self):
+        self.instrument.enabled = True
+
+        def func(value):
+            self.now += 0.25
+            return value
+
+        timed = self.instrument.timed("stage", func)
+        self.assertEqual(timed(1), 1)
+        self.assertEqual(timed(2), 2)
+        self.assertEqual(self.instrument.stats()["stage"]["count"], 2)
+
+        self.instrument.reset()
+        self.assertEqual(self.instrument.stats(), {})
+
+
+class TestInstrumentHotPath(unittest.TestCase):
+    def tearDown(self):
+        instrument.enabled = False
+        instrument.reset()
+
+    def test_stages(self):
+        instrument.enabled = True
+        displayer_context = DisplayerContext(StaticDataStore(["summary 1", "summary 2"]), BaseDisplayer())
+        SummaryListWalker(
+            displayer_context=displayer_context, controller=mock.Mock(),
+            context=mock.Mock(), on_receive=mock.Mock())
+        displayer_context.store.setup()
+
+        stats = instrument.stats()
+        self.assertEqual(stats["store.transform"]["count"], 2)
+        self.assertEqual(stats["displayer.summary"]["count"], 2)
+        self.assertEqual(stats["walker.receive"]["count"], 1)
@@ -10,6 +10,7 @@ from gviewer.parent import ParentFrame, Footer, Helper, Notification
 from gviewer.store import StaticDataStore
 from gviewer.view.error import ErrorWidget
 from gviewer.view.element import View, Text, Group
+from gviewer.view.stats import StatsWidget
 from gviewer.view.summary import SummaryListWidget
 
 
@@ -83,6 +84,16 @@ class TestParentFrame(unittest.TestCase):
             self.widget.main
         )
 
+    def test_open_stats(self):
+        self.widget.open_stats()
+        stats_widget = self.widget.contents["body"][0]
+        self.assertIsInstance(stats_widget, StatsWidget)
+        self.assertEqual(len(stats_widget.summaries), 2)
+
+        self.widget.back()
+        self.widget.open_stats()
+        self.assertIs(self.widget.contents["body"][0], stats_widget)
+
     def test_back_to_exit(self):
         self.widget.back()
 
@@ -95,6 +106,11 @@ class TestParentFrame(unittest.TestCase):
         with self.assertRaises(urwid.ExitMainLoop):
             self.widget.keypress((0, 0), "q")
 
+    def test_exit_with_exit_func(self):
+        self.widget.exit_func = mock.Mock()
+        self.widget.exit()
+        self.widget.exit_func.assert_called_once_with()
+
     def test_open_error(self):
         try:
             raise ValueError("error")
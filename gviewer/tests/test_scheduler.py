@@ -0,0 +1,80 @@
+import unittest
+import urwid
+import mock
+
+from gviewer.scheduler import RedrawScheduler, MainLoop
+
+
+class TestRedrawScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        self.loop = mock.Mock()
+        self.scheduler = RedrawScheduler(fps=10, clock=lambda: self.now)
+        self.scheduler.attach(self.loop)
+        self.callback = mock.Mock()
+
+    def test_request_without_loop(self):
+        scheduler = RedrawScheduler()
+        scheduler.request(self.callback)
+        self.callback.assert_called_once_with()
+
+    def test_first_frame(self):
+        self.scheduler.request(self.callback)
+        self.callback.assert_not_called()
+        self.scheduler.on_idle()
+        self.callback.assert_called_once_with()
+        self.loop.draw_screen.assert_called_once_with()
+        self.assertEqual(self.scheduler.frames, 1)
+
+    def test_coalesce_frames(self):
+        self.scheduler.on_idle()
+        self.now += 0.02
+        self.scheduler.request(self.callback)
+        self.scheduler.request(self.callback)
+        self.scheduler.on_idle()
+        self.scheduler.on_idle()
+        self.loop.set_alarm_in.assert_called_once_with(
+            mock.ANY, self.scheduler._on_alarm)
+        self.assertAlmostEqual(self.loop.set_alarm_in.call_args[0][0], 0.08)
+        self.callback.assert_not_called()
+
+        self.now += 0.08
+        self.scheduler._on_alarm(self.loop, None)
+        self.scheduler.on_idle()
+        self.callback.assert_called_once_with()
+        self.assertEqual(self.loop.draw_screen.call_count, 2)
+
+    def test_input_draw_immediately(self):
+        self.scheduler.on_idle()
+        self.scheduler.on_idle()
+        self.scheduler.request(self.callback)
+        self.scheduler.on_input()
+        self.scheduler.on_idle()
+        self.callback.assert_called_once_with()
+        self.loop.remove_alarm.assert_called_once_with(self.loop.set_alarm_in.return_value)
+        self.assertEqual(self.loop.draw_screen.call_count, 2)
+
+    def test_no_limit(self):
+        self.scheduler.fps = None
+        self.scheduler.on_idle()
+        self.scheduler.on_idle()
+        self.assertEqual(self.loop.draw_screen.call_count, 2)
+
+    def test_screen_not_started(self):
+        self.loop.screen.started = False
+        self.scheduler.request(self.callback)
+        self.scheduler.on_idle()
+        self.callback.assert_called_once_with()
+        self.loop.draw_screen.assert_not_called()
+
+
+class TestMainLoop(unittest.TestCase):
+    def test_redraw_by_scheduler(self):
+        scheduler = mock.Mock()
+        loop = MainLoop(urwid.Filler(urwid.Text("")), scheduler, screen=mock.Mock())
+        scheduler.attach.assert_called_once_with(loop)
+
+        loop.entering_idle()
+        scheduler.on_idle.assert_called_once_with()
+        loop.process_input(["a"])
+        scheduler.on_input.assert_called_once_with()
@@ -1,7 +1,16 @@
+import os
+import select
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 import mock
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-from gviewer.store import StaticDataStore, AsyncDataStore
+from gviewer.store import (
+    StaticDataStore, AsyncDataStore, ThreadSafeDataStore,
+    FileDataStore, FileLine, JsonDataStore, JsonRecord)
 
 
 class TestStaticDataStore(unittest.TestCase):
@@ -16,8 +25,18 @@ class TestStaticDataStore(unittest.TestCase):
         self.assertEqual(len(self.data_store.walkers), 1)
 
         self.data_store.setup()
-        self.walker.recv.assert_has_calls(
-            [mock.call("message 1"), mock.call("message 2")], any_order=True)
+        self.walker.recv_batch.assert_called_once_with(
+            ["message 1", "message 2"])
+
+    def test_on_message(self):
+        self.data_store.on_message("message 3")
+        self.walker.recv.assert_called_once_with("message 3")
+
+    def test_on_messages_with_transform(self):
+        self.data_store.transform = lambda m: m.upper()
+        self.data_store.on_messages(["message 3", "message 4"])
+        self.walker.recv_batch.assert_called_once_with(
+            ["MESSAGE 3", "MESSAGE 4"])
 
     def test_register_new_walker(self):
         walker2 = mock.Mock()
@@ -26,15 +45,121 @@ class TestStaticDataStore(unittest.TestCase):
         self.assertEqual(len(self.data_store.walkers), 2)
 
         self.data_store.setup()
-        self.walker.recv.assert_has_calls(
-            [mock.call("message 1"), mock.call("message 2")], any_order=True)
-        walker2.recv.assert_has_calls(
-            [mock.call("message 1"), mock.call("message 2")], any_order=True)
+        self.walker.recv_batch.assert_called_once_with(
+            ["message 1", "message 2"])
+        walker2.recv_batch.assert_called_once_with(
+            ["message 1", "message 2"])
 
     def test_unregister(self):
         self.data_store.unregister(self.walker)
         self.assertEqual(len(self.data_store.walkers), 0)
 
+    def test_options(self):
+        data_store = StaticDataStore([], max_items=10, memory_budget=1024)
+        self.assertEqual(data_store.max_items, 10)
+        self.assertEqual(data_store.memory_budget, 1024)
+
+
+def _slow_upper(message):
+    if message == "error":
+        raise ValueError(message)
+    # NOTE: earlier messages finish later to verify the delivery order
+    time.sleep(0.01 * (3 - int(message[-1])))
+    return message.upper()
+
+
+class _UpperDataStore(StaticDataStore):
+    @staticmethod
+    def transform(message):
+        return message.upper()
+
+
+class _MethodDataStore(StaticDataStore):
+    def transform(self, message):
+        return message.upper()
+
+
+class TestProcessTransform(unittest.TestCase):
+    def setUp(self):
+        self.executor = ProcessPoolExecutor(1)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_staticmethod(self):
+        walker = mock.Mock()
+        data_store = _UpperDataStore(["m1", "m2"], executor=self.executor)
+        data_store.register(walker)
+        data_store.setup()
+        walker.recv_batch.assert_called_once_with(["M1", "M2"])
+
+    def test_reject_method(self):
+        with self.assertRaises(ValueError):
+            _MethodDataStore([], executor=self.executor)
+
+
+class TestParallelTransform(unittest.TestCase):
+    def setUp(self):
+        self.walker = mock.Mock()
+        self.executor = ThreadPoolExecutor(4)
+        self.addCleanup(self.executor.shutdown)
+
+        self.data_store = AsyncDataStore(
+            None, executor=self.executor, transform_batch_size=1)
+        self.data_store.transform = _slow_upper
+        self.data_store.register(self.walker)
+
+    def _delivered(self):
+        return [m for c in self.walker.recv_batch.call_args_list for m in c[0][0]]
+
+    def test_without_loop(self):
+        self.data_store.on_messages(["m1", "m2", "m3"])
+        self.assertEqual(self._delivered(), ["M1", "M2", "M3"])
+
+    def test_ordered_delivery(self):
+        self.data_store.attach(mock.Mock(), mock.Mock())
+        self.data_store._transform_waker = mock.Mock()
+        self.data_store.on_messages(["m1", "m2", "m3"])
+
+        self.assertEqual(self.data_store.pending(), 3)
+        for future, _ in list(self.data_store._inflight):
+            future.result()
+        self.assertEqual(self.data_store.collect(), 0)
+        self.assertEqual(self.data_store.pending(), 0)
+        self.assertEqual(self.data_store.received, 3)
+        self.assertEqual(self._delivered(), ["M1", "M2", "M3"])
+        self.assertTrue(self.data_store._transform_waker.notify.called)
+
+    def test_batch_on_message(self):
+        loop = mock.Mock()
+        self.data_store.attach(loop, mock.Mock())
+        self.data_store._transform_waker = mock.Mock()
+        self.data_store.transform_batch_size = 2
+        for i in range(5):
+            self.data_store.on_message("m{0}".format(i % 4))
+
+        self.assertEqual([count for _, count in self.data_store._inflight], [2, 2])
+        self.assertEqual(self.data_store.pending(), 5)
+        loop.set_alarm_in.assert_called_once_with(0, self.data_store._on_batch_alarm)
+
+        self.data_store._on_batch_alarm(loop, None)
+        self.assertEqual([count for _, count in self.data_store._inflight], [2, 2, 1])
+        self.data_store.flush()
+        self.assertEqual(self._delivered(), ["M0", "M1", "M2", "M3", "M0"])
+
+    def test_error(self):
+        controller = mock.Mock()
+        self.data_store.attach(mock.Mock(), controller)
+        self.data_store._transform_waker = mock.Mock()
+        self.data_store.transform_batch_size = 10
+        self.data_store.on_messages(["m1", "error", "m3"])
+
+        self.data_store.flush()
+        self.assertEqual(self._delivered(), ["M1", "M3"])
+        controller.open_error.assert_called_once_with()
+
+    def test_error_without_controller(self):
+        with self.assertRaises(ValueError):
+            self.data_store.on_message("error")
+
 
 class TestAsyncDataStore(unittest.TestCase):
     def setUp(self):
@@ -49,3 +174,268 @@ class TestAsyncDataStore(unittest.TestCase):
         self.data_store.setup()
         self.register_func.assert_called_with(
             self.data_store.on_message)
+
+
+class TestThreadSafeDataStore(unittest.TestCase):
+    def setUp(self):
+        self.walker = mock.Mock()
+        self.loop = mock.Mock()
+        self.loop.watch_pipe = mock.Mock(return_value=self._pipe())
+
+        self.data_store = ThreadSafeDataStore(drain_budget=2)
+        self.data_store.register(self.walker)
+
+    def _pipe(self):
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        self.read_fd = read_fd
+        return write_fd
+
+    def test_drain_without_loop(self):
+        self.data_store.setup()
+        self.data_store.put("message 1")
+        self.assertEqual(self.data_store.pending(), 1)
+
+        self.assertFalse(self.data_store.drain())
+        self.walker.recv_batch.assert_called_once_with(["message 1"])
+
+    def test_drain_budget(self):
+        self.data_store.attach(self.loop)
+        self.data_store.setup()
+        for i in range(3):
+            self.data_store.put("message {0}".format(i))
+
+        self.assertEqual(os.read(self.read_fd, 10), b"1")
+        self.assertTrue(self.data_store._on_wakeup(b"1"))
+        self.walker.recv_batch.assert_called_once_with(["message 0", "message 1"])
+        self.loop.set_alarm_in.assert_called_once_with(0, self.data_store._on_alarm)
+
+        self.data_store._on_alarm(self.loop, None)
+        self.walker.recv_batch.assert_called_with(["message 2"])
+        self.assertEqual(self.data_store.pending(), 0)
+
+    def test_wakeup_for_messages_put_before_setup(self):
+        self.data_store.attach(self.loop)
+        for i in range(3):
+            self.data_store.put("message {0}".format(i))
+        self.data_store.setup()
+
+        self.assertEqual(select.select([self.read_fd], [], [], 0)[0], [self.read_fd])
+        self.assertEqual(os.read(self.read_fd, 10), b"1")
+        self.data_store._on_wakeup(b"1")
+        self.walker.recv_batch.assert_called_once_with(["message 0", "message 1"])
+
+    def test_drain_budget_under_sustained_load(self):
+        self.data_store.attach(self.loop)
+        self.data_store.setup()
+        for i in range(10):
+            self.data_store.put("message {0}".format(i))
+
+        self.data_store._on_wakeup(b"1")
+        # NOTE: wakeups while an alarm is pending do not drain or schedule another alarm
+        for i in range(3):
+            self.data_store.put("message {0}".format(10 + i))
+            self.data_store._on_wakeup(b"1")
+        self.assertEqual(self.walker.recv_batch.call_count, 1)
+        self.assertEqual(self.loop.set_alarm_in.call_count, 1)
+
+        self.data_store._on_alarm(self.loop, None)
+        self.assertEqual(self.walker.recv_batch.call_count, 2)
+        self.assertEqual(self.loop.set_alarm_in.call_count, 2)
+        self.assertEqual(self.data_store.pending(), 9)
+
+    def test_put_from_threads(self):
+        self.data_store.drain_budget = 10000
+        self.data_store.attach(self.loop)
+        self.data_store.setup()
+
+        def produce():
+            for i in range(1000):
+                self.data_store.put(i)
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.data_store.drain()
+        self.assertEqual(len(self.walker.recv_batch.call_args[0][0]), 4000)
+
+    def test_register_func(self):
+        register_func = mock.Mock()
+        data_store = ThreadSafeDataStore(register_func)
+        data_store.setup()
+        register_func.assert_called_with(data_store.put)
+
+
+class TestFileDataStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "test.log")
+        self.walker = mock.Mock()
+        self.walker.recv_batch = mock.Mock(side_effect=self._recv_batch)
+        self.lines = []
+
+    def _recv_batch(self, messages):
+        self.lines.extend(m.text for m in messages)
+
+    def _close(self, data_store):
+        data_store.close()
+
+    def _write(self, content, mode="ab"):
+        with open(self.path, mode) as f:
+            f.write(content)
+
+    def _wait_for(self, data_store, count):
+        deadline = time.time() + 5
+        while len(self.lines) < count and time.time() < deadline:
+            data_store.drain()
+            time.sleep(0.01)
+
+    def test_read_lines(self):
+        self._write(u"line 1\r\nline 2\n\u54c8 3".encode("utf8"))
+        data_store = FileDataStore(self.path)
+        data_store.register(self.walker)
+        data_store.setup()
+        data_store.thread.join()
+        self.addCleanup(self._close, data_store)
+        data_store.drain()
+
+        self.assertEqual(self.lines, [u"line 1", u"line 2", u"\u54c8 3"])
+        self.assertEqual(list(data_store.segments[0].ends), [7, 14, 20])
+
+    def test_empty_file(self):
+        self._write(b"")
+        data_store = FileDataStore(self.path)
+        data_store.register(self.walker)
+        data_store.setup()
+        data_store.thread.join()
+        self.addCleanup(self._close, data_store)
+        data_store.drain()
+
+        self.assertEqual(self.lines, [])
+
+    def test_reject_memory_budget(self):
+        with self.assertRaises(ValueError):
+            FileDataStore(self.path, memory_budget=1024)
+
+    def test_close_segments(self):
+        self._write(b"line 1\n")
+        data_store = FileDataStore(self.path, follow=True, poll_interval=0.01)
+        data_store.register(self.walker)
+        data_store.setup()
+        self._wait_for(data_store, 1)
+        data_store.close()
+
+        self.assertFalse(data_store.thread.is_alive())
+        segment = data_store.segments[0]
+        self.assertTrue(segment._file.closed)
+        self.assertIsNone(segment._mmap)
+
+    def test_follow_and_rotate(self):
+        self._write(b"line 1\n")
+        data_store = FileDataStore(self.path, follow=True, poll_interval=0.01)
+        data_store.register(self.walker)
+        data_store.setup()
+        self.addCleanup(self._close, data_store)
+
+        self._wait_for(data_store, 1)
+        self._write(b"line 2\nline")
+        self._wait_for(data_store, 2)
+        self.assertEqual(self.lines, ["line 1", "line 2"])
+
+        self._write(b" 3\n")
+        self._wait_for(data_store, 3)
+
+        os.rename(self.path, self.path + ".1")
+        self._write(b"line 4\n", mode="wb")
+        self._wait_for(data_store, 4)
+
+        self.assertEqual(self.lines, ["line 1", "line 2", "line 3", "line 4"])
+        self.assertEqual(len(data_store.segments), 2)
+        self.assertEqual(str(FileLine(data_store.segments[0], 0)), "line 1")
+
+
+class TestJsonDataStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "test.json")
+        self.walker = mock.Mock()
+        self.messages = []
+        self.walker.recv_batch = mock.Mock(side_effect=self.messages.extend)
+
+    def _load(self, content, drain=True, **kwargs):
+        with open(self.path, "wb") as f:
+            f.write(content.encode("utf8"))
+        data_store = JsonDataStore(self.path, chunk_size=4, **kwargs)
+        data_store.register(self.walker)
+        data_store.setup()
+        data_store.thread.join()
+        if drain:
+            data_store.drain()
+        return data_store
+
+    def test_json_lines(self):
+        data_store = self._load(u'{"a": 1}\n{"b": "\\u54c8"}\n123\n[1, 2]\n')
+        self.assertIsNone(data_store.error)
+        self.assertEqual(self.messages, [{"a": 1}, {"b": u"\u54c8"}, 123, [1, 2]])
+
+    def test_reject_memory_budget_with_lazy(self):
+        with self.assertRaises(ValueError):
+            JsonDataStore(self.path, lazy=True, memory_budget=1024)
+        JsonDataStore(self.path, memory_budget=1024)
+
+    def test_json_array(self):
+        data_store = self._load(u'[\n  {"a": [1, 2]},\n  [3],\n  45\n]\n')
+        self.assertIsNone(data_store.error)
+        self.assertEqual(self.messages, [{"a": [1, 2]}, [3], 45])
+
+    def test_json_lines_start_with_array(self):
+        self._load(u'[1, 2]\n[3]\n', fmt="lines")
+        self.assertEqual(self.messages, [[1, 2], [3]])
+
+    def test_detect_json_lines_start_with_array(self):
+        data_store = self._load(u'\n[1, 2]\n\n  \n[3]\n')
+        self.assertIsNone(data_store.error)
+        self.assertEqual(self.messages, [[1, 2], [3]])
+
+    def test_detect_minified_array(self):
+        self._load(u'[1, [2], {"a": 3}]\n\n')
+        self.assertEqual(self.messages, [1, [2], {"a": 3}])
+
+    def test_detect_long_first_line_as_array(self):
+        with mock.patch.object(JsonDataStore, "_detect_bytes", 8):
+            self._load(u'[1, 2, 3, 4]\n')
+        self.assertEqual(self.messages, [1, 2, 3, 4])
+
+    def test_invalid_line_not_joined_with_next_lines(self):
+        data_store = self._load(u'{"a": 1}\n{"b":\n2}\n', fmt="lines", drain=False)
+        with self.assertRaises(ValueError):
+            data_store.drain()
+        self.assertEqual(self.messages, [{"a": 1}])
+
+    def test_lazy(self):
+        self._load(u'[{"a": "\u54c8"}, {"b": 2}]', lazy=True)
+        self.assertIsInstance(self.messages[0], JsonRecord)
+        self.assertEqual(self.messages[0].value, {"a": u"\u54c8"})
+        self.assertEqual(self.messages[1].value, {"b": 2})
+        self.messages[0].store._file.close()
+
+    def test_invalid(self):
+        data_store = self._load(u'{"a": 1}\n{"b": \n', drain=False)
+        with self.assertRaises(ValueError):
+            data_store.drain()
+        self.assertEqual(self.messages, [{"a": 1}])
+        self.assertIsInstance(data_store.error, ValueError)
+
+    def test_report_invalid_on_loop(self):
+        data_store = self._load(u'{"a": 1}\n{"b": \n', drain=False)
+        data_store.controller = mock.Mock()
+        data_store.drain()
+        data_store.drain()
+        self.assertEqual(self.messages, [{"a": 1}])
+        data_store.controller.open_error.assert_called_once_with()
@@ -7,11 +7,12 @@ from gviewer.view.detail import DetailWidget, Tabs
 from gviewer.view.detail import _verify_keys
 from gviewer.view.element import View, Text, Group
 from gviewer.action import Actions
+from gviewer.context import DisplayerContext
 
 
 class TestDetailWidget(unittest.TestCase):
     def setUp(self):
-        self.displayer_context = mock.Mock()
+        self.displayer_context = DisplayerContext(None, mock.Mock())
 
         self.displayer_context.displayer.get_views = mock.Mock(return_value=[
             ("View 1", self._view1),
@@ -85,6 +86,56 @@ class TestDetailWidget(unittest.TestCase):
         self.assertIsNot(self.new_widget, self.widget)
         self.assertEqual(self.new_widget.index, 0)
 
+    def test_switch_view_from_cache(self):
+        self.widget.keypress((0,), "tab")
+        second = self.new_widget
+        second.keypress((0,), "shift tab")
+        first = self.new_widget
+        first.keypress((0,), "tab")
+
+        self.assertIs(self.new_widget, second)
+        self.assertIsNot(first, self.widget)
+        self.assertIs(DetailWidget.cached(
+            self.test_message, self.displayer_context, index=0,
+            controller=self.controller, context=self.context), first)
+
+    def test_cached(self):
+        widget = DetailWidget.cached(
+            self.test_message, self.displayer_context, index=1,
+            controller=self.controller, context=self.context)
+        self.assertEqual(widget.index, 1)
+        self.assertIs(DetailWidget.cached(
+            self.test_message, self.displayer_context, index=1,
+            controller=self.controller, context=self.context), widget)
+        self.assertEqual(widget.loaded(), 1)
+
+    def test_cached_from_prefetched_view(self):
+        view = self._display("prefetched")
+        self.displayer_context.prefetched_view = mock.Mock(return_value=(view, u"Title\nprefetched\n"))
+        widget = DetailWidget.cached(
+            self.test_message, self.displayer_context, index=2,
+            controller=self.controller, context=self.context)
+
+        self.displayer_context.prefetched_view.assert_called_with(self.test_message, 2)
+        self.assertIs(widget.view, view)
+        self.assertEqual(widget.content_widget.text(), u"Title\nprefetched\n")
+
+    def test_invalidate_cache_by_action(self):
+        action = mock.Mock()
+        self.displayer_context.displayer.get_views = mock.Mock(return_value=[
+            ("View 1", lambda m: View([Group("Title", [Text(m["view1"])])],
+                                      actions=Actions([("a", "aaa", action)])))
+        ])
+        widget = DetailWidget.cached(
+            self.test_message, self.displayer_context,
+            controller=self.controller, context=self.context)
+
+        widget.keypress((10, 5), "a")
+        action.assert_called_with(self.controller, self.test_message)
+        self.assertIsNot(DetailWidget.cached(
+            self.test_message, self.displayer_context,
+            controller=self.controller, context=self.context), widget)
+
     def test_no_tab(self):
         self.displayer_context.displayer.get_views = mock.Mock(return_value=[
             ("View 1", lambda m: self._display(m["view1"]))
@@ -159,6 +210,17 @@ class TestDetailWidget(unittest.TestCase):
             render_to_content(self.widget.content_widget, (5, 3)),
             no_match)
 
+    def test_search_info(self):
+        for key in "view\n":
+            self.widget.search_widget.keypress((4,), "enter" if key == "\n" else key)
+        self.controller._update_info.assert_called_with(self.widget, u"View 1 match 1 of 1")
+
+        self.widget.keypress((0,), "n")
+        self.controller._update_info.assert_called_with(self.widget, u"View 1 match 0 of 1")
+
+        self.widget.keypress((0,), "N")
+        self.controller._update_info.assert_called_with(self.widget, u"View 1 match 1 of 1")
+
     def test_open_failed(self):
         self.widget._open(10)
         self.controller.open_error.assert_called_with()
@@ -6,7 +6,7 @@ from ..util import render_to_content, render_widgets_to_content
 from gviewer.basic_widget import SearchableText
 from gviewer.view.element import (
     Text, Prop, Group, PropsGroup, View,
-    TitleWidget, ContentWidget, EmptyLine)
+    TitleWidget, ContentWidget, EmptyLine, LazyListWalker, SearchIndex)
 
 
 class TestText(unittest.TestCase):
@@ -27,6 +27,9 @@ class TestText(unittest.TestCase):
         self.assertEqual(
             str(Text([("aaa", u"bbb"), u"ccc"])), "bbbccc")
 
+    def test_slots(self):
+        self.assertFalse(hasattr(Text("text"), "__dict__"))
+
 
 class TestProp(unittest.TestCase):
     def test_widget(self):
@@ -124,7 +127,7 @@ class TestView(unittest.TestCase):
         self.assertTrue(isinstance(widget, ContentWidget))
 
         contents = widget._w.body
-        self.assertEqual(len(contents), 6)
+        self.assertEqual(len(contents.positions()), 6)
         self.assertIsInstance(contents[0], TitleWidget)
         self.assertIsInstance(contents[1], SearchableText)
         self.assertIsInstance(contents[2], EmptyLine)
@@ -135,9 +138,34 @@ class TestView(unittest.TestCase):
     def test_empty_widget(self):
         view = View([])
         contents = view.widget(None)._w.body
-        self.assertEqual(len(contents), 1)
+        self.assertEqual(len(contents.positions()), 1)
         self.assertIsInstance(contents[0], EmptyLine)
 
+    def test_generator_groups(self):
+        consumed = []
+
+        def lines(group):
+            for i in range(100):
+                consumed.append((group, i))
+                yield Text("{0} line {1}".format(group, i))
+
+        view = View(Group(g, lines(g)) for g in ("group1", "group2"))
+        widget = view.widget(None)
+        render_to_content(widget, (15, 3))
+        self.assertLess(len(consumed), 10)
+
+        # NOTE: search index consume the whole content, but widgets are only built for the match
+        widget.search_next("group2 line 50")
+        self.assertEqual(widget._w.get_focus()[1], 153)
+        self.assertEqual(len(consumed), 200)
+        self.assertEqual(len(widget.walker._widgets), 4)
+
+    def test_text(self):
+        view = View(Group(g, (Text(g + " content"),)) for g in ("group1", "group2"))
+        self.assertEqual(
+            view.widget(None).text(),
+            u"group1\ngroup1 content\n\ngroup2\ngroup2 content\n")
+
     def test_actions(self):
         action = mock.Mock()
         controller = mock.Mock()
@@ -333,3 +361,121 @@ class TestContentWidget(unittest.TestCase):
             render_to_content(widget, (15, 3)),
             second_match
         )
+
+
+class TestLazyListWalker(unittest.TestCase):
+    def setUp(self):
+        def elements():
+            for i in range(3):
+                yield Text("line {0}".format(i))
+
+        self.walker = LazyListWalker(elements(), None)
+
+    def test_walk(self):
+        self.assertEqual(self.walker.get_prev(0), (None, None))
+        widget, position = self.walker.get_next(0)
+        self.assertEqual(position, 1)
+        self.assertEqual(widget.get_plain_text(), "line 1")
+        self.assertIs(self.walker[1], widget)
+        self.assertEqual(len(self.walker._elements), 2)
+
+        self.assertEqual(self.walker.get_next(2), (None, None))
+        self.assertEqual(list(self.walker.positions(reverse=True)), [2, 1, 0])
+
+    def test_set_focus(self):
+        self.walker.set_focus(2)
+        self.assertEqual(self.walker.get_focus()[1], 2)
+        with self.assertRaises(IndexError):
+            self.walker.set_focus(3)
+
+    def test_next_and_prev_position(self):
+        self.assertEqual(self.walker.next_position(1), 2)
+        with self.assertRaises(IndexError):
+            self.walker.next_position(2)
+        self.assertEqual(self.walker.prev_position(1), 0)
+        with self.assertRaises(IndexError):
+            self.walker.prev_position(0)
+
+    def test_chunks_without_widget(self):
+        walker = LazyListWalker(View([PropsGroup("title", [Prop("key", "value")])]).elements(), None)
+        walker.load(2)
+        self.assertIsNone(walker.chunks(0))
+        self.assertEqual(walker.chunks(1), [u"key : ", u"value"])
+        self.assertIsNone(walker.chunks(2))
+        self.assertEqual(walker._widgets, {})
+
+    def test_widgets(self):
+        widget = SearchableText("content")
+        walker = LazyListWalker([widget, EmptyLine()], None)
+        self.assertIs(walker[0], widget)
+        walker.load(1)
+        self.assertEqual(walker.chunks(0), [u"content"])
+        self.assertIsNone(walker.chunks(1))
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex([
+            [u"aaa bbb aaa"],
+            None,
+            [u"key: ", u"aaa"],
+            [u"aa", u"a"]])
+
+    def test_text(self):
+        self.assertEqual(self.index.text, u"aaa bbb aaa\n\nkey: aaa\naaa\n")
+
+    def test_matches(self):
+        self.assertEqual(self.index.matches(u"aaa"), [0, 8, 18])
+        self.assertIs(self.index.matches(u"aaa"), self.index.matches(u"aaa"))
+        self.assertEqual(self.index.matches(u"a\n"), [])
+        self.assertEqual(self.index.matches(u""), [])
+
+    def test_locate(self):
+        self.assertEqual(self.index.locate(8), (0, 0, 8))
+        self.assertEqual(self.index.locate(18), (2, 1, 0))
+
+    def test_row_start(self):
+        self.assertEqual(self.index.row_start(2), 13)
+        self.assertEqual(self.index.row_start(10), len(self.index.text))
+
+
+class TestContentWidgetSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.widget = View([
+            Group("aaa title", [Text(u"aaa bbb aaa"), Text([("attr", u"ccc"), u" aaa"])]),
+            PropsGroup("props", [Prop("aaa", "ddd aaa")])]).widget(None)
+
+    def _highlighted(self, row=None):
+        row = self.widget._w.get_focus()[1] if row is None else row
+        return self.widget.walker[row]._w.base_widget.get_text()
+
+    def test_search_next_and_prev(self):
+        positions = []
+        for _ in range(5):
+            self.widget.search_next(u"aaa")
+            positions.append((self.widget._w.get_focus()[1], self.widget.search_info()))
+        self.assertEqual(positions, [
+            (1, "match 1 of 5"), (1, "match 2 of 5"), (2, "match 3 of 5"),
+            (5, "match 4 of 5"), (5, "match 5 of 5")])
+
+        self.widget.search_next(u"aaa")
+        self.assertEqual(self.widget.search_info(), "match 0 of 5")
+
+        self.widget.search_prev(u"aaa")
+        self.assertEqual(self.widget.search_info(), "match 5 of 5")
+        self.widget.search_prev(u"aaa")
+        self.assertEqual(self.widget.search_info(), "match 4 of 5")
+        self.assertEqual(self._highlighted()[0], u"aaa : ddd aaa")
+
+    def test_highlight_second_match_in_row(self):
+        self.widget.search_next(u"aaa")
+        self.widget.search_next(u"aaa")
+        self.assertEqual(self._highlighted(1), (u"aaa bbb aaa", [(None, 8), ("match", 3)]))
+
+    def test_search_from_focus(self):
+        self.widget._w.set_focus(2)
+        self.widget.search_next(u"aaa")
+        self.assertEqual(self.widget.search_info(), "match 3 of 5")
+
+    def test_search_info_without_search(self):
+        self.assertIsNone(self.widget.search_info())
@@ -0,0 +1,104 @@
+import re
+import unittest
+import mock
+
+from ..util import render_to_text
+from gviewer.scheduler import RedrawScheduler
+from gviewer.view.stats import StatsWidget, rss
+
+
+class TestStatsWidget(unittest.TestCase):
+    def setUp(self):
+        self.controller = mock.Mock()
+        self.context = mock.Mock()
+        self.context.scheduler = RedrawScheduler()
+
+        self.store = mock.Mock(received=0)
+        self.store.pending.return_value = 3
+        self.summary = mock.Mock()
+        self.summary.name = "Main"
+        self.summary.displayer_context.store = self.store
+        self.summary.base_walker = self.summary.current_walker = mock.MagicMock(evicted=2)
+        self.summary.base_walker.__len__.return_value = 10
+
+        self.now = 100.0
+        self.widget = StatsWidget(
+            [self.summary], clock=lambda: self.now,
+            controller=self.controller, context=self.context)
+
+    def _stats(self):
+        lines = [line.strip() for line in render_to_text(self.widget, (40, 20))]
+        return dict(re.split(r"\s{2,}", line, 1) for line in lines if re.search(r"\s{2,}", line))
+
+    def test_render(self):
+        text = render_to_text(self.widget, (40, 20))
+        self.assertEqual(text[0].strip(), "Main")
+        self.assertIn("Process", [line.strip() for line in text])
+        stats = self._stats()
+        self.assertEqual(stats["ingest rate"], "-")
+        self.assertEqual(stats["queue depth"], "3")
+        self.assertEqual(stats["walker length"], "10")
+        self.assertEqual(stats["evicted"], "2")
+        self.assertNotIn("filtered length", stats)
+
+    def test_rate(self):
+        self.store.received = 50
+        self.context.scheduler.frames = 4
+        self.now += 2
+        self.widget.refresh()
+
+        stats = self._stats()
+        self.assertEqual(stats["ingest rate"], "25.0/s")
+        self.assertEqual(stats["redraws"], "2.0/s")
+
+    def test_filtered(self):
+        self.summary.current_walker = mock.MagicMock(keywords=["GET", "500"])
+        self.summary.current_walker.__len__.return_value = 4
+        self.widget.refresh()
+
+        self.assertEqual(self._stats()["filtered length"], "4 /GET > /500")
+
+    def test_update_info(self):
+        loop = mock.Mock()
+        self.context.scheduler.attach(loop)
+
+        self.widget.update_info()
+        self.controller._update_info.assert_called_with(self.widget, "Stats")
+        loop.set_alarm_in.assert_called_once_with(1.0, self.widget._on_alarm)
+
+        # NOTE: alarm is not set twice
+        self.widget.update_info()
+        loop.set_alarm_in.assert_called_once_with(1.0, self.widget._on_alarm)
+
+    def test_alarm_when_displayed(self):
+        loop = mock.Mock()
+        self.context.scheduler.attach(loop)
+        self.widget.update_info()
+
+        render_to_text(self.widget, (40, 20))
+        self.store.received = 10
+        self.now += 1
+        self.widget._on_alarm(loop, None)
+
+        self.assertEqual(self._stats()["ingest rate"], "10.0/s")
+        self.assertEqual(loop.set_alarm_in.call_count, 2)
+
+    def test_alarm_stop_when_not_displayed(self):
+        loop = mock.Mock()
+        self.context.scheduler.attach(loop)
+        self.widget.update_info()
+
+        self.widget._on_alarm(loop, None)
+        self.assertEqual(loop.set_alarm_in.call_count, 1)
+
+    def test_quit(self):
+        loop = mock.Mock()
+        self.context.scheduler.attach(loop)
+        self.widget.update_info()
+
+        self.widget.keypress((0, ), "q")
+        loop.remove_alarm.assert_called_with(loop.set_alarm_in.return_value)
+        self.controller.back.assert_called_with()
+
+    def test_rss(self):
+        self.assertGreater(rss(), 0)
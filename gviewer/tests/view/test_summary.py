@@ -5,15 +5,17 @@ import mock
 from ..util import render_to_content, render_widgets_to_content
 from gviewer.view.summary import (
     SummaryItemWidget, SummaryListWalker,
-    FilterSummaryListWalker, SummaryListWidget)
-from gviewer.view.summary import _verify_keys
+    FilterSummaryListWalker, SummaryListWidget,
+    VirtualSummaryListWalker, VirtualFilterSummaryListWalker)
+from gviewer.view.summary import _verify_keys, _UNLOADED
 from gviewer.view.detail import DetailWidget
 from gviewer.view.element import View
 from gviewer.action import Actions
-from gviewer.store import StaticDataStore
+from gviewer.store import StaticDataStore, AsyncDataStore
 from gviewer.context import DisplayerContext
 from gviewer.config import Config
 from gviewer.displayer import BaseDisplayer
+from gviewer.scheduler import RedrawScheduler
 
 
 class TestSummaryItemWidget(unittest.TestCase):
@@ -60,10 +62,21 @@ class TestSummaryItemWidget(unittest.TestCase):
         self.assertIsNone(self.widget.keypress(None, "a"))
         self.action_a.assert_called_with(self.controller, "message", self.widget)
 
+    def test_keypress_custom_action_invalidate_detail_cache(self):
+        self.get_views = mock.Mock(return_value=[("view", None)])
+        self.displayer_context.cache_detail("message", 0, "detail")
+        self.widget.keypress(None, "a")
+        self.assertIsNone(self.displayer_context.cached_detail("message", 0))
+
     def test_set_title(self):
         self.widget.set_title("hahaha")
         self.assertEqual(self.widget.get_title_as_plain_text(), "hahaha")
 
+    def test_set_title_invalidate_summary_cache(self):
+        self.displayer_context.summary_cache.put(id("message"), ("message", "summary", "summary"))
+        self.widget.set_title("hahaha")
+        self.assertNotIn(id("message"), self.displayer_context.summary_cache)
+
 
 class TestSummaryListWalker(unittest.TestCase):
     def setUp(self):
@@ -74,7 +87,7 @@ class TestSummaryListWalker(unittest.TestCase):
         self.context = mock.Mock()
         self.context.config.keys = dict()
 
-        self.displayer_context = mock.Mock()
+        self.displayer_context = DisplayerContext(mock.Mock(), mock.Mock())
         self.displayer_context.displayer.summary = mock.Mock(
             side_effect=lambda m: m)
         self.displayer_context.displayer.match = mock.Mock(
@@ -112,6 +125,21 @@ class TestSummaryListWalker(unittest.TestCase):
         self.assertEqual(len(self.walker), 0)
         self.assertTrue(self.error)
 
+    def test_recv_batch(self):
+        self.walker.recv_batch(["message 1", "message 2", "message 3"])
+        self.assertEqual(len(self.walker), 3)
+        self.assertEqual(self.walker.focus, 0)
+        self.on_receive.assert_called_once_with(3, self.walker)
+
+    def test_recv_batch_with_one_failed(self):
+        self.displayer_context.displayer.summary = mock.Mock(
+            side_effect=lambda m: str(int(m[-1])))
+
+        self.walker.recv_batch(["message 1", "message x", "message 3"])
+        self.assertEqual(len(self.walker), 2)
+        self.assertTrue(self.error)
+        self.on_receive.assert_called_once_with(2, self.walker)
+
 
 class TestFilterSummaryListWalker(unittest.TestCase):
     def setUp(self):
@@ -122,8 +150,7 @@ class TestFilterSummaryListWalker(unittest.TestCase):
         self.context = mock.Mock()
         self.context.config.keys = dict()
 
-        self.displayer_context = mock.Mock()
-        self.displayer_context.displayer = BaseDisplayer()
+        self.displayer_context = DisplayerContext(mock.Mock(), BaseDisplayer(), summary_index=True)
         self.on_receive = mock.Mock()
         self.error = False
 
@@ -157,13 +184,21 @@ class TestFilterSummaryListWalker(unittest.TestCase):
     def test_recv_with_match(self):
         walker = FilterSummaryListWalker(
             self.original_walker, "summary 1")
-        walker.recv("summary 1111")
+        self.original_walker.recv("summary 1111")
         self.assertEqual(len(walker), 2)
+        self.assertIs(walker[1], self.original_walker[2])
+
+    def test_recv_batch(self):
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary 1")
+        self.original_walker.recv_batch(["summary 11", "summary 2", "summary 12"])
+        self.assertEqual(len(walker), 3)
+        self.on_receive.assert_has_calls([mock.call(3, self.original_walker), mock.call(2, walker)])
 
     def test_recv_with_not_match(self):
         walker = FilterSummaryListWalker(
             self.original_walker, "summary 1")
-        walker.recv("summary")
+        self.original_walker.recv("summary")
         self.assertEqual(len(walker), 1)
 
     def test_recv_failed(self):
@@ -172,21 +207,32 @@ class TestFilterSummaryListWalker(unittest.TestCase):
         walker = FilterSummaryListWalker(
             self.original_walker, "summary 1")
 
-        walker.recv("summary 1")
+        self.original_walker.recv("summary 1")
         self.assertEqual(len(walker), 1)
         self.assertTrue(self.error)
 
+    def test_not_registered(self):
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary 1")
+        self.displayer_context.store.register.assert_called_once_with(self.original_walker)
+        self.assertEqual(self.original_walker._children, [walker])
+
     def test_close(self):
         walker = FilterSummaryListWalker(
             self.original_walker, "summary 1")
         walker.close()
-        self.displayer_context.store.unregister.assert_called_once_with(walker)
+        self.assertEqual(self.original_walker._children, [])
+        self.original_walker.recv("summary 1")
+        self.assertEqual(len(walker), 1)
 
     def test_del_one_item(self):
         walker = FilterSummaryListWalker(
             self.original_walker, "")
         del walker[0]
         self.assertEqual(len(walker), 1)
+        self.assertTrue(self.original_walker[0].deleted)
+
+        self.original_walker.compact()
         self.assertEqual(len(self.original_walker), 1)
         self.assertIs(walker[0], self.original_walker[0])
 
@@ -195,8 +241,369 @@ class TestFilterSummaryListWalker(unittest.TestCase):
             self.original_walker, "summary 1")
         del walker[:]
         self.assertEqual(len(walker), 0)
+        self.original_walker.compact()
         self.assertEqual(len(self.original_walker), 1)
 
+    def test_compact_when_half_deleted(self):
+        self.original_walker.recv_batch(["summary 3", "summary 4"])
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary")
+        del walker[0]
+        self.assertEqual(len(self.original_walker), 4)
+        del walker[0:2]
+        self.assertEqual(
+            [w.message for w in self.original_walker], ["summary 4"])
+        self.assertEqual(self.original_walker.position(walker[0]), 0)
+
+    def test_del_item_in_other_filter(self):
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary")
+        other = FilterSummaryListWalker(
+            self.original_walker, "summary 1")
+        progressive = FilterSummaryListWalker(
+            self.original_walker, "summary", progressive=True)
+        del walker[0]
+        self.assertEqual(len(other), 0)
+        progressive.scan()
+        self.assertEqual([w.message for w in progressive], ["message 2"])
+
+    def test_del_item_while_scanning(self):
+        self.original_walker.recv_batch(["summary 3", "summary 4"])
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary", progressive=True)
+        walker.scan(2)
+        self.original_walker.recv("summary 5")
+        del walker[0]
+        walker.scan()
+        self.assertEqual(
+            [w.get_title_as_plain_text() for w in walker],
+            ["summary 2", "summary 3", "summary 4", "summary 5"])
+
+    def test_del_item_in_other_filter_while_scanning(self):
+        self.original_walker.recv_batch(["summary 3", "summary 4"])
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary")
+        progressive = FilterSummaryListWalker(
+            self.original_walker, "summary", progressive=True)
+        progressive.scan(2)
+        self.original_walker.recv("summary 5")
+        del walker[0]
+        progressive.scan()
+        self.assertEqual(
+            [w.get_title_as_plain_text() for w in progressive],
+            ["summary 2", "summary 3", "summary 4", "summary 5"])
+
+    def test_item_id(self):
+        self.original_walker.recv("summary 3")
+        self.assertEqual([w.item_id for w in self.original_walker], [0, 1, 2])
+        del self.original_walker[0]
+        self.assertEqual(self.original_walker.position(self.original_walker[1]), 1)
+        self.assertEqual(self.original_walker.candidates("summary 3"), [1])
+
+    def test_construct_with_summary_index(self):
+        self.original_walker.recv_batch(["summary 3", "summary 13"])
+        self.assertEqual(self.original_walker.candidates("summary 1"), [0, 3])
+
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary 1")
+        self.assertEqual(
+            [w.message for w in walker], ["message 1", "summary 13"])
+
+    def test_progressive(self):
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary", progressive=True)
+        self.assertEqual(len(walker), 0)
+        self.assertTrue(walker.scan(1))
+        self.assertEqual(walker.scan_progress(), (1, 2))
+
+        self.original_walker.recv("summary 3")
+        self.assertFalse(walker.scan(1))
+        self.assertEqual(
+            [w.message for w in walker], ["message 1", "message 2", "summary 3"])
+
+    def test_cancel_scan(self):
+        walker = FilterSummaryListWalker(
+            self.original_walker, "summary", progressive=True)
+        walker.scan(1)
+        walker.cancel_scan()
+        self.assertFalse(walker.scanning())
+        self.assertEqual(len(walker), 1)
+
+    def test_summary_index_after_delete(self):
+        del self.original_walker[0]
+        self.assertTrue(self.original_walker.summary_index.stale)
+        self.assertEqual(self.original_walker.candidates("summary 2"), [0])
+
+    def test_summary_index_after_set_title(self):
+        self.original_walker.candidates("summary")
+        self.original_walker.recv("summary 3")
+        self.original_walker[2].set_title("marked")
+        walker = FilterSummaryListWalker(
+            self.original_walker, "marked")
+        self.assertEqual(len(walker), 1)
+
+
+class TestVirtualSummaryListWalker(unittest.TestCase):
+    def setUp(self):
+        self.controller = mock.Mock()
+        self.context = mock.Mock()
+        self.context.config.keys = dict()
+
+        self.displayer_context = DisplayerContext(mock.Mock(), BaseDisplayer(), summary_index=True)
+        self.displayer_context.store.max_items = None
+        self.displayer_context.store.max_bytes = None
+        self.displayer_context.store.memory_budget = None
+        self.on_receive = mock.Mock()
+
+        self.walker = VirtualSummaryListWalker(
+            controller=self.controller, context=self.context,
+            displayer_context=self.displayer_context,
+            on_receive=self.on_receive, pool_size=2)
+        for i in range(5):
+            self.walker.recv("summary {0}".format(i))
+
+    def test_recv_without_widget(self):
+        self.assertEqual(len(self.walker), 5)
+        self.assertEqual(len(self.walker._pool), 0)
+        self.assertEqual(self.on_receive.call_count, 5)
+
+    def test_materialize(self):
+        widget = self.walker[3]
+        self.assertIsInstance(widget, SummaryItemWidget)
+        self.assertEqual(widget.message, "summary 3")
+        self.assertEqual(widget.get_title_as_plain_text(), "summary 3")
+        self.assertIs(self.walker[3], widget)
+        self.assertIs(self.walker[-2], widget)
+
+    def test_recycle_pool(self):
+        first = self.walker[0]
+        self.walker[1]
+        self.walker[2]
+        self.assertEqual(len(self.walker._pool), 2)
+        self.assertIs(self.walker[3], first)
+        self.assertEqual(first.message, "summary 3")
+
+    def test_focus(self):
+        self.assertEqual(self.walker.get_focus()[1], 0)
+        self.walker.set_focus(4)
+        self.assertEqual(self.walker.get_focus()[1], 4)
+        self.assertEqual(self.walker.get_next(4), (None, None))
+        self.assertEqual(self.walker.get_prev(4)[1], 3)
+        self.assertEqual(self.walker.get_prev(0), (None, None))
+
+    def test_cache_summary(self):
+        walker = VirtualSummaryListWalker(
+            controller=self.controller, context=self.context,
+            displayer_context=self.displayer_context,
+            on_receive=self.on_receive, cache_summary=True)
+        walker.recv("summary")
+        self.assertEqual(list(walker.summaries), [("summary", "summary")])
+
+    def test_set_title(self):
+        self.walker[1].set_title("marked")
+        self.walker._clear_pool()
+        self.assertEqual(self.walker[1].get_title_as_plain_text(), "marked")
+
+    def test_del_item(self):
+        self.walker.set_focus(4)
+        del self.walker[4]
+        self.assertEqual(len(self.walker), 4)
+        self.assertEqual(self.walker.get_focus()[1], 3)
+
+        del self.walker[:]
+        self.assertEqual(len(self.walker), 0)
+        self.assertEqual(self.walker.get_focus(), (None, None))
+
+    def test_recv_batch(self):
+        self.on_receive.reset_mock()
+        self.walker.recv_batch(["summary 5", "summary 6"])
+        self.assertEqual(len(self.walker), 7)
+        self.on_receive.assert_called_once_with(2, self.walker)
+
+    def test_filter(self):
+        walker = VirtualFilterSummaryListWalker(self.walker, "summary 1")
+        self.assertEqual(len(walker), 1)
+
+        self.walker.recv("summary 11")
+        self.walker.recv("summary 22")
+        self.assertEqual(len(walker), 2)
+        self.assertEqual(walker[1].message, "summary 11")
+
+        walker.close()
+        self.walker.recv("summary 111")
+        self.assertEqual(len(walker), 2)
+
+    def test_filter_progressive(self):
+        walker = VirtualFilterSummaryListWalker(self.walker, "summary", progressive=True)
+        self.assertEqual(walker.scan_progress(), (0, 5))
+        self.assertTrue(walker.scan(2))
+        self.walker.recv("summary 5")
+        self.assertEqual([m for m, _ in walker.items()], ["summary 0", "summary 1", "summary 5"])
+
+        del self.walker[2]
+        self.assertEqual(walker.scan_progress(), (2, 4))
+        self.assertFalse(walker.scan())
+        self.assertEqual(
+            [m for m, _ in walker.items()],
+            ["summary 0", "summary 1", "summary 3", "summary 4", "summary 5"])
+
+    def test_filter_with_summary_index(self):
+        self.assertEqual(self.walker.candidates("summary 3"), [3])
+        walker = VirtualFilterSummaryListWalker(self.walker, "summary 3")
+        self.assertEqual(walker[0].message, "summary 3")
+
+        self.walker[1].set_title("marked")
+        walker = VirtualFilterSummaryListWalker(self.walker, "marked")
+        self.assertEqual(walker[0].message, "summary 1")
+
+    def test_filter_set_title(self):
+        walker = VirtualFilterSummaryListWalker(self.walker, "summary 3")
+        walker[0].set_title("marked")
+        self.assertEqual(self.walker[3].get_title_as_plain_text(), "marked")
+
+    def test_filter_after_base_delete(self):
+        walker = VirtualFilterSummaryListWalker(self.walker, "summary 3")
+        del self.walker[0]
+        self.assertEqual(len(walker), 1)
+        self.assertEqual(walker[0].message, "summary 3")
+        del self.walker[2]
+        self.assertEqual(len(walker), 0)
+
+    def test_filter_del_items(self):
+        walker = VirtualFilterSummaryListWalker(self.walker, "summary 1")
+        del walker[:]
+        self.assertEqual(len(walker), 0)
+        self.assertEqual(len(self.walker), 4)
+        self.assertNotIn("summary 1", list(self.walker.messages))
+
+    def test_stacked_filter(self):
+        parent = VirtualFilterSummaryListWalker(self.walker, "summary")
+        child = VirtualFilterSummaryListWalker(self.walker, "3", parent=parent)
+        self.assertEqual(child.keywords, ["summary", "3"])
+        self.assertEqual(len(child), 1)
+
+        self.walker.recv("summary 13")
+        self.walker.recv("other 3")
+        self.assertEqual(len(parent), 6)
+        self.assertEqual([m for m, _ in child.items()], ["summary 3", "summary 13"])
+
+        del self.walker[3]
+        self.assertEqual(len(parent), 5)
+        self.assertEqual([m for m, _ in child.items()], ["summary 13"])
+
+        child.close()
+        self.walker.recv("summary 23")
+        self.assertEqual(len(child), 1)
+        self.assertEqual(len(parent), 6)
+
+
+class _Unpicklable(str):
+    def __reduce_ex__(self, protocol):
+        raise TypeError("could not pickle")
+
+
+class TestBoundedVirtualSummaryListWalker(unittest.TestCase):
+    def setUp(self):
+        self.controller = mock.Mock()
+        self.context = mock.Mock()
+        self.on_receive = mock.Mock()
+
+    def _walker(self, store):
+        return VirtualSummaryListWalker(
+            controller=self.controller, context=self.context,
+            displayer_context=DisplayerContext(store, BaseDisplayer(), summary_index=True),
+            on_receive=self.on_receive)
+
+    def test_max_items(self):
+        walker = self._walker(AsyncDataStore(None, max_items=3))
+        walker.recv_batch(["m1", "m2", "m3", "m4"])
+        walker.recv("m5")
+        self.assertEqual(list(walker.messages), ["m3", "m4", "m5"])
+        self.assertEqual(walker.evicted, 2)
+
+    def test_max_bytes(self):
+        store = AsyncDataStore(None, max_bytes=10)
+        store.sizeof = len
+        walker = self._walker(store)
+        walker.recv_batch(["aaaa", "bbbb", "cccc"])
+        self.assertEqual(list(walker.messages), ["bbbb", "cccc"])
+        walker.recv("dddddddddddd")
+        self.assertEqual(list(walker.messages), ["dddddddddddd"])
+        self.assertEqual(walker.evicted, 3)
+
+    def test_keep_focus_when_evict(self):
+        walker = self._walker(AsyncDataStore(None, max_items=3))
+        walker.recv_batch(["m1", "m2", "m3"])
+        walker.set_focus(2)
+        walker.recv("m4")
+        self.assertEqual(walker.get_focus()[1], 1)
+        self.assertEqual(walker.get_focus()[0].message, "m3")
+
+    def test_filter_walker_evict(self):
+        walker = self._walker(AsyncDataStore(None, max_items=2))
+        walker.recv_batch(["m1", "n1"])
+        filter_walker = VirtualFilterSummaryListWalker(walker, "m")
+        walker.recv("m2")
+        walker.recv("m3")
+        self.assertEqual(list(walker.messages), ["m2", "m3"])
+        self.assertEqual([m for m, _ in filter_walker.items()], ["m2", "m3"])
+        self.assertEqual(filter_walker.evicted, 1)
+
+    def test_summary_index_evict(self):
+        walker = self._walker(AsyncDataStore(None, max_items=2))
+        walker.recv_batch(["m11", "m12", "m13"])
+        self.assertEqual(walker.candidates("m1"), None)
+        self.assertEqual(walker.candidates("m13"), [2])
+        filter_walker = VirtualFilterSummaryListWalker(walker, "m12")
+        self.assertEqual([m for m, _ in filter_walker.items()], ["m12"])
+
+    def test_spill(self):
+        store = AsyncDataStore(None, memory_budget=10)
+        store.sizeof = len
+        walker = self._walker(store)
+        walker.recv_batch(["aaaa", "bbbb", "cccc", "dddd"])
+        self.assertEqual(walker.messages.spilled_count(), 2)
+        self.assertEqual(walker[0].message, "aaaa")
+        self.assertEqual(walker[3].message, "dddd")
+
+        filter_walker = VirtualFilterSummaryListWalker(walker, "b")
+        self.assertEqual(filter_walker[0].message, "bbbb")
+        del filter_walker[0]
+        self.assertEqual(list(walker.messages), ["aaaa", "cccc", "dddd"])
+
+    def test_spill_failed(self):
+        store = AsyncDataStore(None, memory_budget=4, max_bytes=100)
+        store.sizeof = lambda m: 4
+        walker = VirtualSummaryListWalker(
+            controller=self.controller, context=self.context,
+            displayer_context=DisplayerContext(store, BaseDisplayer()),
+            on_receive=self.on_receive, cache_summary=True)
+        unpicklable = _Unpicklable("bbbb")
+        walker.recv_batch(["aaaa", unpicklable, "cccc"])
+
+        self.controller.open_error.assert_called_once_with()
+        self.assertEqual(len(walker.messages), 3)
+        self.assertEqual(len(walker.summaries), 3)
+        self.assertEqual(len(walker.sizes), 3)
+        self.assertIs(walker[1].message, unpicklable)
+        self.assertEqual(walker[2].get_title_as_plain_text(), "cccc")
+
+    def test_spill_not_keep_loaded_messages(self):
+        store = AsyncDataStore(None, memory_budget=10)
+        store.sizeof = len
+        walker = self._walker(store)
+        walker.recv_batch(["aaaa", "bbbb", "cccc", "dddd"])
+        self.assertEqual(len(walker.displayer_context.summary_cache), 0)
+
+        widget = walker[0]
+        self.assertEqual(widget.get_title_as_plain_text(), "aaaa")
+        self.assertEqual(len(walker.displayer_context.summary_cache), 0)
+        self.assertIs(widget._message, _UNLOADED)
+        self.assertEqual(widget.message, "aaaa")
+
+        filter_walker = VirtualFilterSummaryListWalker(walker, "c")
+        self.assertEqual(filter_walker[0].message, "cccc")
+
 
 class TestSummaryListWidget(unittest.TestCase):
     def setUp(self):
@@ -208,6 +615,7 @@ class TestSummaryListWidget(unittest.TestCase):
 
         self.context = mock.Mock()
         self.context.config = Config()
+        self.context.scheduler = RedrawScheduler()
 
         self.widget = SummaryListWidget(
             self.displayer_context,
@@ -225,6 +633,23 @@ class TestSummaryListWidget(unittest.TestCase):
             ], (9, 2))
         )
 
+    def test_prefetch(self):
+        self.displayer_context.prefetch_executor = mock.Mock()
+        self.displayer_context.prefetch = mock.Mock()
+        self.displayer_context.store.on_messages(["summary 3", "summary 4"])
+        self.widget._w.set_focus(2)
+        self.widget.update_info()
+        self.displayer_context.prefetch.assert_called_with(["summary 3", "summary 2", "summary 4"])
+
+        self.widget._filter("summary 1")
+        self.displayer_context.prefetch.assert_called_with(["summary 1"])
+
+    def test_prefetch_empty(self):
+        self.displayer_context.prefetch_executor = mock.Mock()
+        self.displayer_context.prefetch = mock.Mock()
+        self.widget._filter("nothing")
+        self.displayer_context.prefetch.assert_not_called()
+
     def test_open_search(self):
         self.widget._open_search()
         self.controller.open_edit.assert_called_with(self.widget.search_widget)
@@ -262,6 +687,10 @@ class TestSummaryListWidget(unittest.TestCase):
         self.assertIsNone(self.widget.keypress((0, 0), "?"))
         self.controller.open_view.assert_called_with(self.widget.help_widget)
 
+    def test_keypress_open_stats(self):
+        self.assertIsNone(self.widget.keypress((0, 0), "S"))
+        self.controller.open_stats.assert_called_with()
+
     def test_keypress_bottom_and_top(self):
         self.widget.keypress((10, 10), "G")
         self.assertEqual(self.widget._w.focus_position, 1)
@@ -322,6 +751,202 @@ class TestSummaryListWidget(unittest.TestCase):
         widget.current_walker.recv("summary 4")
         self.assertEqual(widget._w.focus_position, 0)
 
+    def test_auto_scroll_filtered_with_deferred_scheduler(self):
+        displayer_context = DisplayerContext(
+            StaticDataStore(["summary 1", "other 2", "summary 3"]),
+            BaseDisplayer())
+        self.context.config = Config(auto_scroll=True)
+        self.context.scheduler.attach(mock.Mock())
+        widget = SummaryListWidget(
+            displayer_context,
+            controller=self.controller,
+            context=self.context)
+        displayer_context.store.setup()
+        self.context.scheduler.draw()
+
+        widget._filter("summary")
+        widget._w.set_focus(1)
+        displayer_context.store.on_message("summary 4")
+        self.context.scheduler.draw()
+        self.assertEqual(len(widget.current_walker), 3)
+        self.assertEqual(widget._w.focus_position, 2)
+
+        widget._w.set_focus(1)
+        displayer_context.store.on_message("summary 5")
+        self.context.scheduler.draw()
+        self.assertEqual(widget._w.focus_position, 1)
+
+    def test_progressive_filter(self):
+        loop = mock.Mock()
+        self.displayer_context.store.loop = loop
+        self.context.config = Config(filter_chunk_size=1)
+
+        self.widget._filter("2")
+        self.assertEqual(len(self.widget.current_walker), 0)
+        loop.set_alarm_in.assert_called_once_with(0, self.widget._scan)
+
+        self.widget._scan(loop, None)
+        self.controller._update_info.assert_called_with(
+            self.widget, "GViewer[0/0] /2 scanning 1/2")
+        self.widget._scan(loop, None)
+        self.assertEqual(len(self.widget.current_walker), 1)
+        self.controller._update_info.assert_called_with(
+            self.widget, "GViewer[1/1] /2")
+        self.assertIsNone(self.widget._scan_alarm)
+
+    def test_cancel_progressive_filter(self):
+        loop = mock.Mock()
+        self.displayer_context.store.loop = loop
+
+        self.widget._filter("summary 2")
+        self.assertIsNone(self.widget.keypress((10, 10), "esc"))
+        loop.remove_alarm.assert_called_once_with(loop.set_alarm_in.return_value)
+        self.assertFalse(self.widget.current_walker.scanning())
+
+        self.widget.keypress((10, 10), "q")
+        self.widget._filter("summary")
+        self.widget._filter("summary 2")
+        self.assertEqual(loop.remove_alarm.call_count, 2)
+        self.controller.notify.assert_called_once_with("scanning stopped at 0/2")
+        self.assertEqual(self.widget.current_walker.parent.keyword, "summary")
+
+    def test_search_as_you_type(self):
+        loop = mock.Mock()
+        self.displayer_context.store.loop = loop
+        self.widget._open_search()
+
+        self.widget._on_search_change("sum")
+        self.widget._on_search_change("summ")
+        loop.remove_alarm.assert_called_once_with(loop.set_alarm_in.return_value)
+        loop.set_alarm_in.assert_called_with(0.15, self.widget._live_search, "summ")
+
+        self.widget._live_search(loop, "summ")
+        self.widget._scan(loop, None)
+        parent = self.widget.current_walker
+        self.assertEqual(len(parent), 2)
+
+        self.widget._live_search(loop, "summary 2")
+        self.assertEqual(self.widget.current_walker.scan_progress(), (0, 2))
+        self.widget._scan(loop, None)
+        self.assertEqual(len(self.widget.current_walker), 1)
+
+        self.widget._live_search(loop, "summ")
+        self.assertIs(self.widget.current_walker, parent)
+
+        self.widget._filter("summ")
+        self.assertIs(self.widget.current_walker, parent)
+        self.assertEqual(len(self.widget._search_cache), 0)
+
+    def test_stacked_filter(self):
+        self.widget._filter("summary")
+        parent = self.widget.current_walker
+        self.widget._open_search()
+        self.widget._filter("2")
+        child = self.widget.current_walker
+        self.assertIs(child.parent, parent)
+        self.assertEqual(len(child), 1)
+        self.controller._update_info.assert_called_with(
+            self.widget, "GViewer[1/1] /summary > /2")
+
+        self.displayer_context.store.on_message("summary 22")
+        self.displayer_context.store.on_message("summary 3")
+        self.assertEqual(len(child), 2)
+        self.assertEqual(len(parent), 4)
+        self.assertEqual(len(self.displayer_context.store.walkers), 1)
+
+        self.widget.keypress((10, 10), "x")
+        self.assertEqual(len(parent), 3)
+
+        self.widget.keypress((10, 10), "q")
+        self.assertIs(self.widget.current_walker, parent)
+        self.assertEqual(parent._children, [])
+
+        self.widget.keypress((10, 10), "q")
+        self.assertIs(self.widget.current_walker, self.widget.base_walker)
+        self.assertEqual(len(self.widget.base_walker), 3)
+
+    def test_clear_stacked_search(self):
+        self.widget._filter("summary")
+        parent = self.widget.current_walker
+        self.widget._open_search()
+        self.widget._filter("2")
+        child = self.widget.current_walker
+        self.widget._open_search()
+        self.widget._clear_search()
+        self.assertIs(self.widget.current_walker, child)
+        self.assertIs(child.parent, parent)
+        self.assertEqual(parent._children, [child])
+
+
+class TestVirtualSummaryListWidget(unittest.TestCase):
+    def setUp(self):
+        self.controller = mock.Mock()
+
+        self.displayer_context = DisplayerContext(
+            StaticDataStore(["summary 1", "summary 2"]),
+            BaseDisplayer())
+
+        self.context = mock.Mock()
+        self.context.config = Config(virtual_list=True)
+        self.context.scheduler = RedrawScheduler()
+
+        self.widget = SummaryListWidget(
+            self.displayer_context,
+            controller=self.controller,
+            context=self.context)
+
+        self.displayer_context.store.setup()
+
+    def test_render(self):
+        self.assertEqual(
+            render_to_content(self.widget, (9, 2)),
+            render_widgets_to_content([
+                urwid.AttrMap(urwid.Text("summary 1"), "summary"),
+                urwid.AttrMap(urwid.Text("summary 2"), "summary")
+            ], (9, 2))
+        )
+
+    def test_keypress_bottom_and_top(self):
+        self.widget.keypress((10, 10), "G")
+        self.controller._update_info.assert_called_with(
+            self.widget, "GViewer[2/2]")
+        self.widget.keypress((10, 10), "g")
+        self.controller._update_info.assert_called_with(
+            self.widget, "GViewer[1/2]")
+
+    def test_keypress_clear_item(self):
+        self.widget.keypress((10, 10), "x")
+        self.assertEqual(len(self.widget.current_walker), 1)
+        self.controller._update_info.assert_called_with(
+            self.widget, "GViewer[1/1]")
+
+    def test_keypress_clear_items_when_search(self):
+        self.widget._filter("summary 1")
+        self.assertIsInstance(self.widget.current_walker, VirtualFilterSummaryListWalker)
+        self.widget.keypress((10, 10), "X")
+        self.assertEqual(len(self.widget.current_walker), 0)
+
+        self.widget.keypress((10, 10), "q")
+        self.assertIs(self.widget.current_walker, self.widget.base_walker)
+        self.assertEqual(len(self.widget.current_walker), 1)
+
+
+class TestBoundedSummaryListWidget(unittest.TestCase):
+    def test_evicted_info(self):
+        controller = mock.Mock()
+        context = mock.Mock()
+        context.config = Config()
+        context.scheduler = RedrawScheduler()
+        store = AsyncDataStore(None, max_items=2)
+        widget = SummaryListWidget(
+            DisplayerContext(store, BaseDisplayer()),
+            controller=controller, context=context)
+
+        self.assertIsInstance(widget.base_walker, VirtualSummaryListWalker)
+        store.on_messages(["summary 1", "summary 2", "summary 3"])
+        controller._update_info.assert_called_with(
+            widget, "GViewer[1/2] evicted:1")
+
 
 class TestSummary(unittest.TestCase):
     def test_verify_keys(self):
@@ -3,6 +3,8 @@ import time
 from collections import OrderedDict
 
 from gviewer.basic_widget import BasicWidget, SearchWidget
+from gviewer.instrument import instrument
+from gviewer.util import stringfy
 from gviewer.view.helper import (
     HelpWidget, HelpContent, HelpCategory,
     make_category_with_actions)
@@ -28,23 +30,29 @@ def _verify_keys(actions):
 class DetailWidget(BasicWidget):
     """ Display content for message
 
+    Use DetailWidget.cached to reuse the widget built for the same message and view
+
     Attributes:
         message: message generate by DataStore
         displayer_context: DisplayerContext instance
         index: view's index
+        view: View built in advance, None to build it by the view callable
+        text: plain text of view if it is known in advance
     """
-    def __init__(self, message, displayer_context, index=0, **kwargs):
+    def __init__(self, message, displayer_context, index=0, view=None, text=None, **kwargs):
         super(DetailWidget, self).__init__(**kwargs)
         self.index = index
         self.message = message
         self.displayer_context = displayer_context
 
+        start = instrument.start()
         self.views = self.displayer_context.displayer.get_views()
         self.name, view_callable = self.views[index]
-        self.view = view_callable.__call__(self.message)
+        self.view = view if view is not None else view_callable.__call__(self.message)
 
         self.content_widget = self.view.widget(
-            self.message, **kwargs)
+            self.message, text=text, **kwargs)
+        instrument.stop("detail.build", start)
 
         _verify_keys(self.view.actions)
         self.search_widget = SearchWidget(self._search, self._clear_search)
@@ -64,10 +72,29 @@ class DetailWidget(BasicWidget):
         widget = urwid.Frame(self.content_widget, header=header)
         self.display(widget)
 
+    @classmethod
+    def cached(cls, message, displayer_context, index=0, **kwargs):
+        """ Get the DetailWidget from the detail cache of displayer context,
+        or build and cache it from the prefetched view if there is
+
+        Returns:
+            DetailWidget instance
+        """
+        widget = displayer_context.cached_detail(message, index)
+        if widget is None:
+            view, text = displayer_context.prefetched_view(message, index) or (None, None)
+            widget = cls(message, displayer_context, index=index, view=view, text=text, **kwargs)
+            displayer_context.cache_detail(message, index, widget)
+        return widget
+
+    def loaded(self):
+        """ Number of content lines had been built """
+        return self.content_widget.walker.loaded()
+
     def _open(self, index):
         self._clear_search()
         try:
-            self.controller.open_view(DetailWidget(
+            self.controller.open_view(DetailWidget.cached(
                 self.message, self.displayer_context, index=index,
                 controller=self.controller, context=self.context),
                 push_prev=False)
@@ -100,6 +127,7 @@ class DetailWidget(BasicWidget):
         self.controller._focus_body()
         self.content_widget.search_next(keyword)
         self.controller.close_edit()
+        self.update_info()
 
     def _clear_search(self):
         self.controller.close_edit()
@@ -107,10 +135,13 @@ class DetailWidget(BasicWidget):
     def _export(self):  # pragma: no cover
         file_name = "export-%13d" % (time.time() * 1000)
         with open(file_name, "w") as f:
-            f.write(str(self.view))
+            f.write(stringfy(self.content_widget.text()))
         self.controller.notify("Export to file {0}".format(file_name))
 
     def update_info(self):
+        search_info = self.content_widget.search_info()
+        if search_info:
+            return self.controller._update_info(self, u"{0} {1}".format(self.name, search_info))
         return self.controller._update_info(self, self.name)
 
     def keypress(self, size, key):
@@ -132,12 +163,14 @@ class DetailWidget(BasicWidget):
                 self.content_widget.search_next(
                     self.search_widget.get_keyword()
                 )
+                self.update_info()
             return None
         if key == "N":
             if self.search_widget.get_keyword():
                 self.content_widget.search_prev(
                     self.search_widget.get_keyword()
                 )
+                self.update_info()
             return None
         if key == "e":  # pragma: no cover
             self._export()
@@ -145,6 +178,9 @@ class DetailWidget(BasicWidget):
         if key == "?":  # pragma: no cover
             self.controller.open_view(self.help_widget)
             return None
+        if key in self.view.actions:
+            # NOTE: action may mutate the message, rebuild the views next time they are opened
+            self.displayer_context.invalidate_detail(self.message)
 
         return super(DetailWidget, self).keypress(size, key)  # pragma: no cover
 
@@ -1,4 +1,5 @@
 import urwid
+from bisect import bisect_left, bisect_right
 from urwid.util import decompose_tagmarkup
 
 from gviewer.action import Actions
@@ -8,6 +9,11 @@ from gviewer.util import stringfy, unicode_it
 
 class Base(object):  # pragma: no cover
     """Abstract class for view displayer eleemnt"""
+    __slots__ = ()
+
+    # NOTE: whether the widget of element support search_next and search_prev
+    searchable = True
+
     def widget(self, message, controller=None, context=None):
         raise NotImplementedError
 
@@ -27,11 +33,17 @@ class Text(Base):
     Attributes:
         content: str or unicode
     """
+    __slots__ = ("content",)
+
     def __init__(self, content):
         self.content = content
 
+    def markup(self):
+        """ Text markup of its SearchableText """
+        return self.content
+
     def widget(self, message, controller=None, context=None):
-        return SearchableText(self.content, attr_map="view-item")
+        return SearchableText(self.markup(), attr_map="view-item")
 
     def __unicode__(self):
         text, _ = decompose_tagmarkup(self.content)
@@ -45,14 +57,19 @@ class Prop(Base):
         key: str or unicode represent property key
         value: str or unicode represent property value
     """
+    __slots__ = ("kv", "max_key_length")
+
     def __init__(self, key, value):
         self.kv = (key, value)
         self.max_key_length = 0
 
+    def markup(self):
+        """ Text markup of its SearchableText """
+        return [("view-item key", self.kv[0].ljust(self.max_key_length + 1) + ": "),
+                ("view-item value", self.kv[1])]
+
     def widget(self, message, controller=None, context=None):
-        return SearchableText(
-            [("view-item key", self.kv[0].ljust(self.max_key_length + 1) + ": "),
-             ("view-item value", self.kv[1])])
+        return SearchableText(self.markup())
 
     def __unicode__(self):
         return u"{0}: {1}".format(self.kv[0].ljust(self.max_key_length + 1), self.kv[1])
@@ -61,21 +78,33 @@ class Prop(Base):
 class Group(object):
     """Group of view items
 
+    Items could be a generator, which is only consumed
+    while the content is scrolled or searched to it
+
     Attributes:
         title: the group title
         items: iterable of Prop or Line
     """
+    __slots__ = ("title", "items", "show_title")
+
     def __init__(self, title, items, show_title=True):
         self.title = title
         self.items = items
         self.show_title = show_title
 
-    def widgets(self, message, controller=None, context=None):
-        widgets = []
+    def materialize(self):
+        """ Consume items into list """
+        self.items = list(self.items)
+
+    def elements(self):
+        """ Generate title element and items """
         if self.show_title:
-            widgets.append(TitleWidget(self.title))
-        widgets += [e.widget(message, controller=controller, context=context) for e in self.items]
-        return widgets
+            yield _TitleElement(self.title)
+        for item in self.items:
+            yield item
+
+    def widgets(self, message, controller=None, context=None):
+        return [e.widget(message, controller=controller, context=context) for e in self.elements()]
 
     def __unicode__(self):  # pragma: no cover
         text = u"\n".join([str(e) for e in self.items])
@@ -93,11 +122,16 @@ class Group(object):
 class PropsGroup(Group):
     """Group of Prop
 
+    Items are always consumed at once, since keys are aligned to the longest one
+
     Attributes:
         title: str or unicode
         items: iterable of Prop
     """
+    __slots__ = ()
+
     def __init__(self, title, items, *args, **kwargs):
+        items = list(items)
         if items:
             max_key_length = max(map(lambda p: len(p.kv[0]), items))
         else:
@@ -110,31 +144,259 @@ class PropsGroup(Group):
 class View(Base):
     """View Element
 
+    Groups could be a generator, which is only consumed
+    while the content is scrolled or searched to it
+
     Attributes:
         groups: iterable of Group
         actions: dict defined {key: callback}
     """
+    __slots__ = ("groups", "actions")
+
     def __init__(self, groups, actions=None):
         self.groups = groups
         self.actions = actions or Actions()
 
-    def widget(self, message, controller=None, context=None):
-        widgets = []
+    def materialize(self):
+        """ Consume groups and their items into lists
+
+        Returns:
+            the view itself
+        """
+        self.groups = list(self.groups)
+        for group in self.groups:
+            group.materialize()
+        return self
+
+    def elements(self):
+        """ Generate elements of all groups, each group is followed by an empty line """
+        empty = True
         for group in self.groups:
-            widgets += group.widgets(message, controller=controller, context=context)
-            widgets.append(EmptyLine())
+            for element in group.elements():
+                yield element
+            yield _EmptyElement()
+            empty = False
 
-        if not widgets:
-            widgets.append(EmptyLine())
+        if empty:
+            yield _EmptyElement()
 
+    def widget(self, message, controller=None, context=None, text=None):
         return ContentWidget(
-            widgets, message, self.actions, controller=controller,
-            context=context)
+            self.elements(), message, self.actions, controller=controller,
+            context=context, text=text)
 
     def __unicode__(self):
         return u"\n".join([str(g) + u"\n" for g in self.groups])
 
 
+class _TitleElement(Base):
+    __slots__ = ("content",)
+
+    searchable = False
+
+    def __init__(self, content):
+        self.content = content
+
+    def widget(self, message, controller=None, context=None):
+        return TitleWidget(self.content)
+
+    def __unicode__(self):
+        return unicode_it(self.content)
+
+
+class _EmptyElement(Base):
+    __slots__ = ()
+
+    searchable = False
+
+    def widget(self, message, controller=None, context=None):
+        return EmptyLine()
+
+    def __unicode__(self):
+        return u""
+
+
+class LazyListWalker(urwid.ListWalker):
+    """ List walker that consume elements and build their widgets
+    only when they are walked to
+
+    Attributes:
+        message: message generate by DataStore
+        focus: focus position
+    """
+    def __init__(self, elements, message, controller=None, context=None):
+        self.message = message
+        self.focus = 0
+        self._source = iter(elements)
+        self._elements = []
+        self._widgets = {}
+        self._controller = controller
+        self._context = context
+
+    def load(self, position):
+        """ Consume elements until position, returns False if there are not enough """
+        while len(self._elements) <= position:
+            if self._source is None:
+                return False
+            try:
+                self._elements.append(next(self._source))
+            except StopIteration:
+                self._source = None
+                return False
+        return True
+
+    def __getitem__(self, position):
+        if position < 0 or not self.load(position):
+            raise IndexError(position)
+        widget = self._widgets.get(position)
+        if widget is None:
+            element = self._elements[position]
+            if isinstance(element, Base):
+                widget = element.widget(
+                    self.message, controller=self._controller, context=self._context)
+            else:
+                widget = element
+            self._widgets[position] = widget
+        return widget
+
+    def chunks(self, position):
+        """ Plain text of each chunk in the markup of position, without building its widget
+
+        Returns:
+            list of unicode, or None if the widget of position is not searchable
+        """
+        element = self._elements[position]
+        if isinstance(element, Base):
+            markup = element.markup() if element.searchable else None
+        else:
+            markup = element.text if isinstance(element, SearchableText) else None
+        if markup is None:
+            return None
+        if not isinstance(markup, list):
+            markup = [markup]
+        return [unicode_it(decompose_tagmarkup(m)[0]) for m in markup]
+
+    def get_focus(self):
+        try:
+            return self[self.focus], self.focus
+        except IndexError:  # pragma: no cover
+            return None, None
+
+    def set_focus(self, position):
+        self[position]
+        self.focus = position
+        self._modified()
+
+    def get_next(self, position):
+        try:
+            return self[position + 1], position + 1
+        except IndexError:
+            return None, None
+
+    def get_prev(self, position):
+        try:
+            return self[position - 1], position - 1
+        except IndexError:
+            return None, None
+
+    def next_position(self, position):
+        if not self.load(position + 1):
+            raise IndexError(position + 1)
+        return position + 1
+
+    def prev_position(self, position):
+        if position <= 0:
+            raise IndexError(position - 1)
+        return position - 1
+
+    def loaded(self):
+        """ Number of elements had been consumed """
+        return len(self._elements)
+
+    def positions(self, reverse=False):
+        """ Positions of all elements, all elements are consumed """
+        while self.load(len(self._elements)):
+            pass
+        positions = range(len(self._elements))
+        return reversed(positions) if reverse else positions
+
+    def text(self):
+        """ Plain text of all elements, each one in a line """
+        return u"\n".join(
+            e.__unicode__() if isinstance(e, Base) else u""
+            for e in (self._elements[p] for p in self.positions()))
+
+
+class SearchIndex(object):
+    """ Plain text of content in a flat buffer, so that all matches of keyword are found at once
+
+    Rows are separated by newline, and the offsets of their markup chunks are kept
+    to map a match back to its row and chunk
+
+    Attributes:
+        text: unicode of the plain text buffer
+    """
+    def __init__(self, rows):
+        """
+        Args:
+            rows: iterable of chunks of each row, see LazyListWalker.chunks
+        """
+        texts = []
+        self._row_starts = []
+        self._chunk_starts = []
+        self._chunk_ends = []
+        self._chunk_positions = []
+        offset = 0
+        for row, chunks in enumerate(rows):
+            self._row_starts.append(offset)
+            for index, chunk in enumerate(chunks or ()):
+                texts.append(chunk)
+                self._chunk_starts.append(offset)
+                offset += len(chunk)
+                self._chunk_ends.append(offset)
+                self._chunk_positions.append((row, index))
+            texts.append(u"\n")
+            offset += 1
+        self._row_starts.append(offset)
+        self.text = u"".join(texts)
+        self._keyword = None
+        self._matches = []
+
+    def row_start(self, row):
+        """ Offset of row, or the end of the buffer if row is after the last row """
+        return self._row_starts[min(row, len(self._row_starts) - 1)]
+
+    def matches(self, keyword):
+        """ Sorted offsets of keyword that lie in a chunk, cached for the last keyword """
+        if isinstance(keyword, bytes):
+            keyword = keyword.decode("utf8")  # pragma: no cover, py3 would not cover here
+        if keyword != self._keyword:
+            self._keyword = keyword
+            self._matches = self._find(keyword)
+        return self._matches
+
+    def locate(self, offset):
+        """ Returns tuple of (row, chunk index, start in chunk) of offset """
+        chunk = bisect_right(self._chunk_starts, offset) - 1
+        row, index = self._chunk_positions[chunk]
+        return row, index, offset - self._chunk_starts[chunk]
+
+    def _find(self, keyword):
+        matches = []
+        if not keyword:
+            return matches
+        start = self.text.find(keyword)
+        while start != -1:
+            chunk = bisect_right(self._chunk_starts, start) - 1
+            # NOTE: match across chunks could not be highlighted
+            if chunk >= 0 and start + len(keyword) <= self._chunk_ends[chunk]:
+                matches.append(start)
+                start = self.text.find(keyword, start + len(keyword))
+            else:
+                start = self.text.find(keyword, start + 1)
+        return matches
+
+
 class TitleWidget(BasicWidget):
     """Widget for title"""
     def __init__(self, content):
@@ -145,10 +407,21 @@ class TitleWidget(BasicWidget):
 
 
 class ContentWidget(BasicWidget):
-    """Widget for view items"""
-    def __init__(self, widgets, message, actions=None, controller=None, context=None):
-        walker = urwid.SimpleFocusListWalker(widgets)
-        widget = urwid.ListBox(walker)
+    """Widget for view items
+
+    Attributes:
+        walker: LazyListWalker of elements or widgets
+        message: message generate by DataStore
+        actions: Actions instance
+        text: plain text of the whole content if it is known in advance
+    """
+    def __init__(self, widgets, message, actions=None, controller=None, context=None, text=None):
+        self.walker = LazyListWalker(widgets, message, controller=controller, context=context)
+        self._text = text
+        self._search_index = None
+        self._keyword = None
+        self._match = None
+        widget = urwid.ListBox(self.walker)
         super(ContentWidget, self).__init__(
             controller=controller, context=context,
             widget=widget)
@@ -163,41 +436,81 @@ class ContentWidget(BasicWidget):
         if self.prev_match != curr_index:
             self.clear_prev_search()
 
-        match_index = len(self._w.body) - 1
-        for index in range(curr_index, len(self._w.body)):
-            try:
-                if self._w.body[index].search_next(keyword):
-                    match_index = index
-                    break
-            except AttributeError:  # pragma: no cover
-                pass
+        matches = self._matches(keyword)
+        if self._match is not None:
+            target = self._match + 1
+        else:
+            target = bisect_left(matches, self._search_index.row_start(curr_index))
 
-        self.prev_match = match_index
-        self._w.set_focus(match_index)
+        if target < len(matches):
+            self._highlight(keyword, target)
+        else:
+            self._no_match(self.walker.loaded() - 1)
 
     def search_prev(self, keyword):
         curr_index = self._w.get_focus()[1]
         if self.prev_match != curr_index:
             self.clear_prev_search()
 
-        match_index = 0
-        for index in reversed(range(0, curr_index + 1)):
-            try:
-                if self._w.body[index].search_prev(keyword):
-                    match_index = index
-                    break
-            except AttributeError:  # pragma: no cover
-                pass
+        matches = self._matches(keyword)
+        if self._match is not None:
+            target = self._match - 1
+        else:
+            target = bisect_left(matches, self._search_index.row_start(curr_index + 1)) - 1
 
-        self.prev_match = match_index
-        self._w.set_focus(match_index)
+        if target >= 0:
+            self._highlight(keyword, target)
+        else:
+            self._no_match(0)
+
+    def _matches(self, keyword):
+        # NOTE: the whole content is indexed at the first search
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.walker.chunks(p) for p in self.walker.positions())
+        if keyword != self._keyword:
+            self._keyword = keyword
+            self._match = None
+        return self._search_index.matches(keyword)
+
+    def _highlight(self, keyword, match):
+        row, chunk, start = self._search_index.locate(self._search_index.matches(keyword)[match])
+        if row != self.prev_match:
+            self.clear_prev_search()
+        self.walker[row].highlight(keyword, chunk, start)
+        self.prev_match = row
+        self._match = match
+        self._w.set_focus(row)
+
+    def _no_match(self, row):
+        self.clear_prev_search()
+        self.prev_match = row
+        self._w.set_focus(row)
 
     def clear_prev_search(self):
+        self._match = None
         try:
-            self._w.body[self.prev_match].clear()
+            self.walker[self.prev_match].clear()
         except AttributeError:  # pragma: no cover
             pass
 
+    def search_info(self):
+        """ Position of the highlighted match of the last searched keyword
+
+        Returns:
+            "match i of N", or None if nothing is searched
+        """
+        if not self._keyword:
+            return None
+        return "match {0} of {1}".format(
+            0 if self._match is None else self._match + 1,
+            len(self._search_index.matches(self._keyword)))
+
+    def text(self):
+        """ Plain text of the whole content """
+        if self._text is None:
+            self._text = self.walker.text()
+        return self._text
+
     def keypress(self, size, key):
         if key in self.actions:
             try:
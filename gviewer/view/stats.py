@@ -0,0 +1,136 @@
+import os
+import time
+import urwid
+
+from gviewer.basic_widget import BasicWidget
+from gviewer.view.helper import TitleWidget, MappingWidget
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, windows has no resource
+    resource = None
+
+
+def rss():
+    """ Resident set size of the process in bytes
+
+    Returns:
+        current RSS on linux, peak RSS on other unix, or None if unknown
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError, IndexError):  # pragma: no cover
+        pass
+    if resource is None:  # pragma: no cover
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # pragma: no cover
+
+
+class StatsWidget(BasicWidget):
+    """ Live performance stats of all summary lists
+
+    Refreshed every interval seconds by main loop alarm only while it is displayed,
+    so that nothing is measured in the hot path when it is closed
+
+    Attributes:
+        summaries: list of SummaryListWidget
+        interval: seconds between refreshes
+    """
+    def __init__(self, summaries, interval=1.0, clock=time.time, **kwargs):
+        super(StatsWidget, self).__init__(**kwargs)
+        self.summaries = summaries
+        self.interval = interval
+        self._clock = clock
+        self._alarm = None
+        self._rendered = False
+        self._last = None
+        self.refresh()
+
+    def update_info(self):
+        """ Refresh and start the refresh alarm when it is displayed """
+        self.refresh()
+        self.controller._update_info(self, "Stats")
+        self._schedule()
+
+    def render(self, size, focus=False):
+        self._rendered = True
+        return super(StatsWidget, self).render(size, focus)
+
+    def refresh(self):
+        """ Measure the stats and rebuild the content """
+        now = self._clock()
+        scheduler = self.context.scheduler
+        received = [s.displayer_context.store.received for s in self.summaries]
+        elapsed = now - self._last[0] if self._last else 0
+
+        widgets = []
+        for i, summary in enumerate(self.summaries):
+            rate = (received[i] - self._last[1][i]) / elapsed if elapsed else None
+            widgets.extend(self._section(summary.name, self._summary_stats(summary, rate)))
+
+        frames = scheduler.frames
+        redraws = (frames - self._last[2]) / elapsed if elapsed else None
+        widgets.extend(self._section("Process", [
+            ("redraws", _format(redraws, "{0:.1f}/s")),
+            ("last render", _format(scheduler.last_render, "{0:.1f}ms", 1000)),
+            ("rss", _format(rss(), "{0:.1f}MB", 1.0 / 1024 / 1024)),
+        ]))
+
+        self._last = (now, received, frames)
+        self.display(urwid.ListBox(urwid.SimpleFocusListWalker(widgets)))
+
+    def _summary_stats(self, summary, rate):
+        store = summary.displayer_context.store
+        stats = [
+            ("ingest rate", _format(rate, "{0:.1f}/s")),
+            ("queue depth", str(store.pending())),
+            ("walker length", str(len(summary.base_walker))),
+            ("evicted", str(summary.base_walker.evicted)),
+        ]
+        if summary.current_walker is not summary.base_walker:
+            stats.insert(3, ("filtered length", "{0} {1}".format(
+                len(summary.current_walker),
+                " > ".join("/" + k for k in summary.current_walker.keywords))))
+        return stats
+
+    def _section(self, title, stats):
+        padding = max(len(k) for k, _ in stats) + 3
+        widgets = [TitleWidget(title), urwid.Text("")]
+        widgets.extend(MappingWidget(k, v, padding) for k, v in stats)
+        widgets.append(urwid.Text(""))
+        return widgets
+
+    def _schedule(self):
+        loop = self.context.scheduler.loop
+        if loop is None or self._alarm is not None:
+            return
+        self._rendered = False
+        self._alarm = loop.set_alarm_in(self.interval, self._on_alarm)
+
+    def _on_alarm(self, loop, user_data):
+        self._alarm = None
+        # NOTE: not rendered since last refresh, it is not displayed anymore
+        if not self._rendered:
+            return
+        self.refresh()
+        self._schedule()
+
+    def close(self):
+        """ Stop refreshing """
+        if self._alarm is not None:
+            self.context.scheduler.loop.remove_alarm(self._alarm)
+            self._alarm = None
+
+    def keypress(self, size, key):
+        if key == "q":
+            self.close()
+            self.controller.back()
+            return None
+        return super(StatsWidget, self).keypress(size, key)  # pragma: no cover
+
+
+def _format(value, fmt, scale=1):
+    if value is None:
+        return "-"
+    return fmt.format(value * scale)
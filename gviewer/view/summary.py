@@ -1,7 +1,11 @@
 import urwid
+from bisect import bisect_left
 from collections import OrderedDict
+from urwid.util import decompose_tagmarkup
 
 from gviewer.basic_widget import BasicWidget, FocusableText, SearchWidget
+from gviewer.buffer import RingBuffer, SpillBuffer
+from gviewer.instrument import instrument
 from gviewer.view.helper import (
     HelpWidget, HelpContent, HelpCategory,
     make_category_with_actions)
@@ -14,10 +18,16 @@ _ADVANCED_KEYS = OrderedDict([
     ("G", "bottom"),
     ("x", "clear current item"),
     ("X", "clear all items"),
+    ("esc", "stop scanning search"),
+    ("S", "performance stats"),
     ("q", "quit")
 ])
 
 
+# NOTE: spilled messages are loaded from walker by item_id, so that widgets would not keep them in memory
+_UNLOADED = object()
+
+
 def _verify_keys(actions):
     for key, _, _ in actions:
         if key in _ADVANCED_KEYS:
@@ -33,17 +43,42 @@ class SummaryItemWidget(BasicWidget):
         message: Original message genrate by BaseDataStore
         summary: Format message by displayer
         displayer_context: DisplayerContext instance
+        walker: summary walker that built this widget, or None
+        item_id: stable id assigned by SummaryListWalker, or key assigned by VirtualSummaryListWalker
+        deleted: tombstone that mark the widget is deleted but not compacted yet
     """
-    def __init__(self, message, title, displayer_context, **kwargs):
+    def __init__(self, message, title, displayer_context, walker=None, plain_text=None, **kwargs):
         super(SummaryItemWidget, self).__init__(
-            widget=self._widget(title),
+            widget=self._widget(title, plain_text),
             **kwargs)
 
         self.displayer_context = displayer_context
-        self.message = message
+        self._message = message
+        self.walker = walker
+        self.item_id = None
+        self.deleted = False
+
+    @property
+    def message(self):
+        if self._message is _UNLOADED:
+            return self.walker._message_by_key(self.item_id)
+        return self._message
+
+    @message.setter
+    def message(self, message):
+        self._message = message
 
-    def _widget(self, title):
-        return FocusableText(title, attr_map="summary", focus_map="summary focus")
+    def rebind(self, message, title, plain_text=None):
+        """ Reuse the widget for another message
+
+        Used by VirtualSummaryListWalker to recycle materialized widgets
+        """
+        self._message = message
+        self._w.set_text(title, plain_text)
+
+    def _widget(self, title, plain_text=None):
+        return FocusableText(
+            title, plain_text=plain_text, attr_map="summary", focus_map="summary focus")
 
     def get_title_as_plain_text(self):
         """ Get title in plain text
@@ -54,18 +89,23 @@ class SummaryItemWidget(BasicWidget):
         return self._w.get_plain_text()
 
     def set_title(self, title):
-        self.display(self._widget(title))
+        self._w.set_text(title)
+        self.displayer_context.invalidate_summary(self.message)
+        if self.walker is not None:
+            self.walker.update_title(self, title)
 
     def keypress(self, size, key):
         if key == "enter":
             try:
-                self.controller.open_view(DetailWidget(
+                self.controller.open_view(DetailWidget.cached(
                     self.message, self.displayer_context, controller=self.controller,
                     context=self.context))
             except:  # pragma: no cover
                 self.controller.open_error()
             return None
         if key in self.displayer_context.actions:
+            # NOTE: action may mutate the message, rebuild its detail next time it is opened
+            self.displayer_context.invalidate_detail(self.message)
             try:
                 self.displayer_context.actions[key].__call__(
                     self.controller, self.message, self)
@@ -80,12 +120,21 @@ class SummaryListWalker(urwid.SimpleFocusListWalker):
     """ Summary item widgets wrapper
 
     Contains the SummaryItemWidget,
-    and used to receive message from data store
+    and used to receive message from data store,
+    filters are fed by the widgets it received so that they share the same widgets.
+
+    Each widget is assigned a stable item id in arrival order,
+    widgets deleted through a filter are marked as tombstones
+    and compacted at once when they are more than half of the content,
+    or before the walker is displayed
 
     Attributes:
         content: list of SummaryItemWidget
         displayer_context: DisplayerContext instance
+        summary_index: TrigramIndex by item id for filtering, None if disabled
     """
+    evicted = 0
+
     def __init__(self, content=None, displayer_context=None,
                  base_walker=None, controller=None, context=None,
                  on_receive=None):
@@ -95,6 +144,18 @@ class SummaryListWalker(urwid.SimpleFocusListWalker):
         self.displayer_context = displayer_context or base_walker.displayer_context
         self.on_receive = on_receive or base_walker.on_receive
         self.base_walker = base_walker
+        self.summary_index = None
+        self._children = []
+        if base_walker is None:
+            self.summary_index = self.displayer_context.create_summary_index()
+            self._next_id = 0
+            self._positions = None
+            self._tombstones = 0
+            self._dead = 0
+            self._track(self)
+        self._register()
+
+    def _register(self):
         self.displayer_context.store.register(self)
 
     def recv(self, message):
@@ -104,64 +165,834 @@ class SummaryListWalker(urwid.SimpleFocusListWalker):
         and generate a SummaryItemWidget into its content
         """
         try:
-            self.append(self._create_widget(message))
+            widget = self._create_widget(message)
+            self.append(widget)
         except:
             self.controller.open_error()
         else:
-            self.on_receive()
+            self._track([widget])
+            self.on_receive(1, self)
+            self._on_accepted([widget])
+
+    def recv_batch(self, messages):
+        """ Action when received a batch of messages from data store
+
+        Extend its content once so that only one modified signal and
+        one info update would be fired for the whole batch,
+        messages that failed to transform would be skipped
+        and only the first error would be opened
+        """
+        widgets = []
+        failed = False
+        for message in messages:
+            try:
+                widgets.append(self._create_widget(message))
+            except:
+                if not failed:
+                    self.controller.open_error()
+                failed = True
+        self._extend(widgets)
+        self._track(widgets)
+        self.on_receive(len(widgets), self)
+        self._on_accepted(widgets)
+
+    def _extend(self, widgets):
+        was_empty = not len(self)
+        self.extend(widgets)
+        if was_empty and widgets:
+            # NOTE: keep focus on the first item as append does
+            self.set_focus(0)
+
+    def __delitem__(self, index):
+        widgets = self[index] if isinstance(index, slice) else [self[index]]
+        super(SummaryListWalker, self).__delitem__(index)
+        self._on_removed(widgets)
+
+    def _on_removed(self, widgets):
+        self._tombstones -= sum(1 for w in widgets if w.deleted)
+        self._forget(len(widgets))
+
+    def _on_accepted(self, widgets):
+        for child in self._children:
+            child._on_parent_receive(widgets)
+
+    def _track(self, widgets):
+        """ Assign item ids to the appended widgets and index their summaries """
+        start = len(self) - len(widgets)
+        for position, widget in enumerate(widgets, start):
+            widget.item_id = self._next_id
+            self._next_id += 1
+            if self._positions is not None:
+                self._positions[widget.item_id] = position
+            if self.summary_index is not None:
+                self.summary_index.add(widget.item_id, widget.get_title_as_plain_text())
+
+    def _forget(self, count):
+        """ Positions are shifted after removing count widgets """
+        self._positions = None
+        self._dead += count
+        if self.summary_index is not None and self._dead * 2 > len(self):
+            # NOTE: too many postings of removed widgets, rebuild the index on next filter
+            self.summary_index.stale = True
+
+    def discard(self, widgets):
+        """ Mark the widgets as deleted in O(1) each
+
+        They are removed by compact, once tombstones are more than half of the content
+        """
+        for widget in widgets:
+            if widget.item_id is not None and not widget.deleted:
+                widget.deleted = True
+                self._tombstones += 1
+        if self._tombstones * 2 > len(self):
+            self.compact()
+
+    def compact(self):
+        """ Remove the widgets marked as deleted in one pass """
+        if not self._tombstones:
+            return
+        count = self._tombstones
+        self[:] = [w for w in self if not w.deleted]
+        self._tombstones = 0
+        self._forget(count)
+
+    def position(self, widget):
+        """ Position of widget in O(1) by its item id
+
+        Returns:
+            position, or None if the widget is not in this walker
+        """
+        position = self._position_map().get(widget.item_id)
+        if position is None or self[position] is not widget:
+            return None
+        return position
+
+    def _position_map(self):
+        """ Map of item id to position, rebuilt after positions are shifted """
+        if self._positions is None:
+            self._positions = dict((w.item_id, p) for p, w in enumerate(self))
+        return self._positions
+
+    def candidates(self, keyword):
+        """ Positions of widgets that might match keyword
+
+        Returns:
+            sorted list of positions, or None if summary index could not narrow it
+        """
+        if self.summary_index is None:
+            return None
+        if self.summary_index.stale:
+            self._dead = 0
+            self.summary_index.rebuild(
+                (w.item_id, w.get_title_as_plain_text()) for w in self if not w.deleted)
+        item_ids = self.summary_index.candidates(keyword)
+        if item_ids is None:
+            return None
+        # NOTE: item ids are assigned in arrival order, so positions are sorted too
+        position_map = self._position_map()
+        positions = (position_map.get(i) for i in item_ids)
+        return [p for p in positions if p is not None and not self[p].deleted]
+
+    def update_title(self, widget, title):
+        """ Index the title set by SummaryItemWidget.set_title """
+        if self.summary_index is not None and not self.summary_index.stale:
+            self.summary_index.add(widget.item_id, _plain_text(title))
 
     def _create_widget(self, message):
-            summary = self.displayer_context.displayer.summary(message)
+            summary, plain_text = self.displayer_context.summary(message)
             return SummaryItemWidget(
-                message, summary, self.displayer_context, controller=self.controller, context=self.context)
+                message, summary, self.displayer_context, walker=self, plain_text=plain_text,
+                controller=self.controller, context=self.context)
 
 
 class FilterSummaryListWalker(SummaryListWalker):
     """ Summary item widgets wrapper that filter by keyword
 
-    Optional display SummaryItemWidget depend on summary is match by keyword or not
+    Optional display SummaryItemWidget depend on summary is match by keyword or not.
+    With progressive, widgets of base walker are matched by scan in chunks,
+    matches are inserted before the messages received during scanning.
+
+    Filters are not registered with data store, the base walker forward the widgets
+    it received to the filters on it, and filters could be stacked by parent
+    that forward the widgets it accepted to the filters stacked on it,
+    so that every filter in the stack keep up to date and share the widgets of base walker
 
     Attributes:
         base_walker: Original SummaryListWalker
         keyword: Filter keyword
+        parent: FilterSummaryListWalker this filter is stacked on, or None
+        keywords: keywords of the whole stack, from the bottom
+        scanned: number of widgets of base walker had been matched
     """
-    def __init__(self, base_walker, keyword):
-        content = [m for m in base_walker if base_walker.displayer_context.displayer.match(keyword, m.message, m.get_title_as_plain_text())]
+    def __init__(self, base_walker, keyword, progressive=False, source=None, parent=None):
+        """
+        Args:
+            source: FilterSummaryListWalker whose result is a superset of keyword,
+                    only its widgets are scanned instead of base walker,
+                    default to parent
+        """
+        self.parent = parent
         super(FilterSummaryListWalker, self).__init__(
-            content=content, base_walker=base_walker)
+            content=[], base_walker=base_walker)
         self.keyword = keyword
+        self.keywords = (parent.keywords if parent else []) + [keyword]
+        self.scanned = 0
+
+        source = source if source is not None else parent
+        candidates = None if source is not None else base_walker.candidates(keyword)
+        if source is not None:
+            self._pending = list(source)
+        elif candidates is not None:
+            self._pending = [base_walker[i] for i in candidates]
+        else:
+            self._pending = list(base_walker)
+        self._inserted = 0
+        if not progressive:
+            self.scan()
+
+    def _register(self):
+        self._upstream()._children.append(self)
+
+    def _upstream(self):
+        return self.parent if self.parent is not None else self.base_walker
+
+    def scan(self, count=None):
+        """ Match the widgets of base walker that are not scanned yet
+
+        Args:
+            count: max number of widgets to match, None for all
+
+        Returns:
+            True if there are still widgets to scan
+        """
+        start = self.scanned
+        stop = len(self._pending) if count is None else min(len(self._pending), start + count)
+        match = instrument.timed("displayer.match", self.displayer_context.displayer.match)
+        widgets = [w for w in self._pending[start:stop]
+                   if not w.deleted and match(self.keyword, w.message, w.get_title_as_plain_text())]
+        self.scanned = stop
+        if widgets:
+            self[self._inserted:self._inserted] = widgets
+            self._inserted += len(widgets)
+        return self.scanning()
+
+    def scanning(self):
+        return self.scanned < len(self._pending)
+
+    def scan_progress(self):
+        """ Returns tuple of (scanned, total) """
+        return self.scanned, len(self._pending)
+
+    def cancel_scan(self):
+        """ Stop scanning, matches found so far are kept """
+        del self._pending[self.scanned:]
+
+    def _on_parent_receive(self, widgets):
+        """ Match the widgets received by the walker this filter is on """
+        match = instrument.timed("displayer.match", self.displayer_context.displayer.match)
+        try:
+            accepted = [w for w in widgets
+                        if match(self.keyword, w.message, w.get_title_as_plain_text())]
+        except:
+            self.controller.open_error()
+            return
+        self._extend(accepted)
+        self.on_receive(len(accepted), self)
+        self._on_accepted(accepted)
+
+    def close(self):
+        """ Stop receiving messages if quit search mode, filters stacked on it are closed too """
+        for child in list(self._children):
+            child.close()
+        upstream = self._upstream()
+        upstream._children = [c for c in upstream._children if c is not self]
+
+    def __delitem__(self, index):
+        """ Delete the widgets from every filter and tombstone them in base walker
+
+        Takes linear time of the filters for bulk deletion,
+        instead of looking up each widget in base walker
+        """
+        widgets = self[index] if isinstance(index, slice) else [self[index]]
+        self._forget_inserted(set(w.item_id for w in widgets))
+        super(FilterSummaryListWalker, self).__delitem__(index)
+        for walker in self.base_walker._children:
+            walker._discard(widgets, exclude=self)
+        self.base_walker.discard(widgets)
+
+    def _on_removed(self, widgets):
+        pass
+
+    def _discard(self, widgets, exclude):
+        """ Drop the deleted widgets from this filter and the filters stacked on it """
+        if self is not exclude:
+            ids = set(w.item_id for w in widgets)
+            if any(w.item_id in ids for w in self):
+                self._forget_inserted(ids)
+                self[:] = [w for w in self if w.item_id not in ids]
+        for child in self._children:
+            child._discard(widgets, exclude)
+
+    def _forget_inserted(self, ids):
+        """ Scanned widgets are inserted before the received ones, shift the insert position for deletion """
+        self._inserted -= len([w for w in self[:self._inserted] if w.item_id in ids])
+
+
+class VirtualSummaryListWalker(urwid.ListWalker):
+    """ Summary list walker that materialize SummaryItemWidget on demand
+
+    Only keep the messages (and optionally the summaries),
+    SummaryItemWidget is built only for the rows that ListBox ask for,
+    and recycled with a small pool.
+    Oldest messages would be evicted if the data store defined
+    max_items or max_bytes, and spilled to disk if it defined memory_budget.
+
+    Each message is identified by a key, the absolute index since the first
+    message received, that would not be shifted by eviction
+
+    Attributes:
+        messages: RingBuffer or SpillBuffer of message
+        summaries: RingBuffer of (summary, plain text) if cache_summary is enabled, else None
+        displayer_context: DisplayerContext instance
+        pool_size: max number of materialized SummaryItemWidget
+        evicted: number of messages had been evicted
+        summary_index: TrigramIndex by key for filtering, None if disabled
+    """
+    def __init__(self, displayer_context=None, controller=None, context=None,
+                 on_receive=None, cache_summary=False, pool_size=256, base_walker=None):
+        self.controller = controller or base_walker.controller
+        self.context = context or base_walker.context
+        self.displayer_context = displayer_context or base_walker.displayer_context
+        self.on_receive = on_receive or base_walker.on_receive
+        self.base_walker = base_walker
+        self.pool_size = pool_size
+        self.focus = 0
+        self.evicted = 0
+        self.summary_index = None
+
+        self._pool = OrderedDict()
+        self._recycled = []
+
+        if base_walker is None:
+            self._setup_storage(cache_summary)
+
+    def _setup_storage(self, cache_summary):
+        store = self.displayer_context.store
+        self.max_items = store.max_items
+        self.max_bytes = store.max_bytes
+
+        if store.memory_budget is not None:
+            self.messages = SpillBuffer(
+                store.memory_budget, sizeof=store.sizeof, directory=store.spill_dir)
+        else:
+            self.messages = RingBuffer()
+        self.summaries = RingBuffer() if cache_summary else None
+        self.sizes = RingBuffer() if self.max_bytes is not None else None
+
+        self._bytes = 0
+        self._titles = {}
+        self._derived = []
+        self.summary_index = self.displayer_context.create_summary_index()
+        store.register(self)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if position < 0 or position >= len(self):
+            raise IndexError(position)
+        return self._materialize(position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self._materialize(position)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(*index.indices(len(self)))
+        else:
+            positions = [index + len(self) if index < 0 else index]
+        self._delete(sorted(positions))
 
     def recv(self, message):
         """ Action when received message from data store
 
-        Will transform message into summary,
-        and check message or summary is match by keyword or not,
-        generate a SummaryItemWidget and display it if match
+        Only the message (and the summary if cache_summary is enabled)
+        is kept, the widget will be built when it is displayed
         """
         try:
-            widget = self._create_widget(message)
-            if self.displayer_context.displayer.match(self.keyword, message, widget.get_title_as_plain_text()):
-                self.append(widget)
+            entry = self._push(message)
         except:
             self.controller.open_error()
         else:
-            self.on_receive()
+            self._receive([entry])
+
+    def recv_batch(self, messages):
+        """ Action when received a batch of messages from data store
+
+        Fire only one modified signal and one info update for the whole batch
+        """
+        entries = []
+        failed = False
+        for message in messages:
+            try:
+                entries.append(self._push(message))
+            except:
+                if not failed:
+                    self.controller.open_error()
+                failed = True
+        self._receive(entries)
+
+    def _push(self, message):
+        summary = None
+        if self.summaries is not None or self.summary_index is not None:
+            summary = self._summary(message)
+        size = None
+        if self.sizes is not None:
+            size = self.displayer_context.store.sizeof(message)
+        count = len(self.messages)
+        try:
+            self.messages.append(message)
+        finally:
+            # NOTE: SpillBuffer keep the message even if an older message could not be spilled
+            if len(self.messages) > count:
+                self._on_pushed(summary, size)
+        return self._key(count), message, summary
+
+    def _on_pushed(self, summary, size):
+        """ Keep summaries, sizes and index aligned with the message just appended """
+        if self.summaries is not None:
+            self.summaries.append(summary)
+        if self.sizes is not None:
+            self.sizes.append(size)
+            self._bytes += size
+        if self.summary_index is not None:
+            self.summary_index.add(self._key(len(self.messages) - 1), summary[1])
+
+    def _receive(self, entries):
+        self._evict()
+        for walker in self._derived:
+            walker._on_base_receive(entries)
+        if entries:
+            self._modified()
+        self.on_receive(len(entries), self)
+
+    def _evict(self):
+        """ Evict the oldest messages that exceed max_items or max_bytes
+
+        Focus is kept on the same message if it is not evicted
+        """
+        total = len(self.messages)
+        count = 0
+        if self.max_items is not None:
+            count = max(0, total - self.max_items)
+
+        freed = 0
+        if self.sizes is not None:
+            freed = sum(self.sizes[:count])
+            while count < total - 1 and self._bytes - freed > self.max_bytes:
+                freed += self.sizes[count]
+                count += 1
+
+        if not count:
+            return
+
+        self.messages.popleft(count)
+        if self.summaries is not None:
+            self.summaries.popleft(count)
+        if self.sizes is not None:
+            self.sizes.popleft(count)
+            self._bytes -= freed
+        if self._titles:
+            self._titles = dict(
+                (k, t) for k, t in self._titles.items() if k >= self.messages.offset)
+        self.evicted += count
+        self.focus = max(0, self.focus - count)
+        if self.summary_index is not None:
+            self.summary_index.discard_before(self.messages.offset, count)
+
+        for walker in self._derived:
+            walker._on_base_evict(self.messages.offset)
+
+    def _delete(self, positions):
+        """ Delete messages at sorted positions """
+        if not positions:
+            return
+        keys = [self._key(p) for p in positions]
+
+        for start, stop in reversed(_runs(positions)):
+            if self.sizes is not None:
+                self._bytes -= sum(self.sizes[start:stop])
+                del self.sizes[start:stop]
+            if self.summaries is not None:
+                del self.summaries[start:stop]
+            del self.messages[start:stop]
+
+        if self._titles:
+            deleted = set(keys)
+            self._titles = dict(
+                (k - bisect_left(keys, k), t) for k, t in self._titles.items() if k not in deleted)
+        if self.summary_index is not None:
+            # NOTE: keys are shifted, rebuild the index on next filter
+            self.summary_index.stale = True
+        for walker in self._derived:
+            walker._on_base_delete(keys)
+        self._reset()
+
+    def compact(self):
+        """ Deletions are applied immediately, nothing to compact """
+
+    def _reset(self):
+        self._clear_pool()
+        self.focus = max(0, min(self.focus, len(self) - 1))
+        self._modified()
+
+    def items(self):
+        """ Iterate (message, title) without materialize any widget """
+        for position in range(len(self)):
+            yield self._message(position), self._title(position)[0]
+
+    def plain_items(self):
+        """ Iterate (message, title in plain text) without materialize any widget """
+        for position in range(len(self)):
+            yield self._message(position), self._title(position)[1]
+
+    def candidates(self, keyword):
+        """ Keys of messages that might match keyword
+
+        Returns:
+            sorted list of keys, or None if summary index could not narrow it
+        """
+        if self.summary_index is None:
+            return None
+        if self.summary_index.stale:
+            self.summary_index.rebuild(
+                (self._key(position), self._title(position)[1]) for position in range(len(self)))
+        return self.summary_index.candidates(keyword)
+
+    def index(self, widget):
+        """ Position of the materialized widget """
+        for key, w in self._pool.items():
+            if w is widget:
+                return self._position(key)
+        raise ValueError("widget is not materialized")
+
+    def update_title(self, widget, title):
+        """ Keep the title set by SummaryItemWidget.set_title """
+        for key, w in self._pool.items():
+            if w is widget:
+                self._set_title(key, title)
+                return
+
+    def _set_title(self, key, title):
+        self._titles[key] = title
+        if self.summary_index is not None and not self.summary_index.stale:
+            self.summary_index.add(key, _plain_text(title))
+        self._refresh_title(key, title)
+
+    def _refresh_title(self, key, title):
+        widget = self._pool.get(key)
+        if widget is not None and widget.walker is self:
+            widget._w.set_text(title)
+
+    def get_focus(self):
+        if not len(self):
+            return None, None
+        return self._materialize(self.focus), self.focus
+
+    def set_focus(self, position):
+        if position < 0 or position >= len(self):
+            raise IndexError(position)
+        self.focus = position
+        self._modified()
+
+    def get_next(self, position):
+        if position + 1 >= len(self):
+            return None, None
+        return self._materialize(position + 1), position + 1
+
+    def get_prev(self, position):
+        if position <= 0 or position > len(self):
+            return None, None
+        return self._materialize(position - 1), position - 1
+
+    def next_position(self, position):
+        if position + 1 >= len(self):
+            raise IndexError(position)
+        return position + 1
+
+    def prev_position(self, position):
+        if position <= 0:
+            raise IndexError(position)
+        return position - 1
+
+    def positions(self, reverse=False):
+        if reverse:
+            return range(len(self) - 1, -1, -1)
+        return range(len(self))
+
+    def _key(self, position):
+        return self.messages.offset + position
+
+    def _position(self, key):
+        return key - self.messages.offset
+
+    def _message(self, position):
+        return self.messages[position]
+
+    def _message_by_key(self, key):
+        base = self._base()
+        position = base._position(key)
+        if position < 0 or position >= len(base):
+            raise IndexError(key)
+        return base._message(position)
+
+    def _base(self):
+        return self.base_walker if self.base_walker is not None else self
+
+    def _spilled(self):
+        return isinstance(self._base().messages, SpillBuffer)
+
+    def _summary(self, message):
+        # NOTE: summary cache would keep the spilled messages in memory
+        return self.displayer_context.summary(message, cache=not self._spilled())
+
+    def _title(self, position):
+        """ Title of message at position
+
+        Returns:
+            tuple of (text markup, plain text)
+        """
+        title = self._titles.get(self._key(position))
+        if title is not None:
+            return title, _plain_text(title)
+        if self.summaries is not None:
+            return self.summaries[position]
+        return self._summary(self.messages[position])
+
+    def _materialize(self, position):
+        key = self._key(position)
+        widget = self._pool.get(key)
+        if widget is not None:
+            self._pool[key] = self._pool.pop(key)
+            return widget
+
+        message = _UNLOADED if self._spilled() else self._message(position)
+        try:
+            title, plain_text = self._title(position)
+        except:
+            self.controller.open_error()
+            title, plain_text = "", ""
+
+        if self._recycled:
+            widget = self._recycled.pop()
+            widget.rebind(message, title, plain_text)
+        else:
+            widget = SummaryItemWidget(
+                message, title, self.displayer_context, walker=self, plain_text=plain_text,
+                controller=self.controller, context=self.context)
+        widget.item_id = key
+
+        self._pool[key] = widget
+        if len(self._pool) > self.pool_size:
+            _, evicted = self._pool.popitem(last=False)
+            self._recycled.append(evicted)
+        return widget
+
+    def _clear_pool(self):
+        self._recycled.extend(self._pool.values())
+        self._pool.clear()
+
+
+class VirtualFilterSummaryListWalker(VirtualSummaryListWalker):
+    """ VirtualSummaryListWalker that filter by keyword
+
+    Only keep the keys of matched messages in base walker,
+    and receive new messages from base walker instead of data store.
+    With progressive, messages of base walker are matched by scan in chunks,
+    matches are inserted before the messages received during scanning.
+
+    Filters could be stacked by parent, a stacked filter receive only the messages
+    its parent accepted, instead of the whole base walker
+
+    Attributes:
+        base_walker: Original VirtualSummaryListWalker
+        keyword: Filter keyword
+        parent: VirtualFilterSummaryListWalker this filter is stacked on, or None
+        keywords: keywords of the whole stack, from the bottom
+        refs: RingBuffer of the keys of matched messages in base walker
+        scanned: number of messages of base walker had been matched
+    """
+    def __init__(self, base_walker, keyword, progressive=False, source=None, parent=None):
+        """
+        Args:
+            source: VirtualFilterSummaryListWalker whose result is a superset of keyword,
+                    only its messages are scanned instead of base walker,
+                    default to parent
+        """
+        super(VirtualFilterSummaryListWalker, self).__init__(
+            base_walker=base_walker, pool_size=base_walker.pool_size)
+        self.keyword = keyword
+        self.parent = parent
+        self.keywords = (parent.keywords if parent else []) + [keyword]
+        self.refs = RingBuffer()
+        self.scanned = 0
+        self._derived = []
+
+        source = source if source is not None else parent
+        if source is not None:
+            candidates = list(source.refs)
+        else:
+            candidates = base_walker.candidates(keyword)
+        if candidates is None:
+            start = base_walker.messages.offset
+            candidates = range(start, start + len(base_walker))
+        self._pending = candidates
+        self._cursor = 0
+        self._inserted = 0
+        self._upstream()._derived.append(self)
+        if not progressive:
+            self.scan()
+
+    def scan(self, count=None):
+        """ Match the messages of base walker that are not scanned yet
+
+        Args:
+            count: max number of messages to match, None for all
+
+        Returns:
+            True if there are still messages to scan
+        """
+        start = self._cursor
+        stop = len(self._pending) if count is None else min(len(self._pending), start + count)
+        match = instrument.timed("displayer.match", self.displayer_context.displayer.match)
+        base_walker = self.base_walker
+        keys = []
+        for key in self._pending[start:stop]:
+            position = base_walker._position(key)
+            if position < 0:
+                continue
+            if match(self.keyword, base_walker._message(position), base_walker._title(position)[1]):
+                keys.append(key)
+        self._cursor = stop
+        self.scanned += stop - start
+
+        if keys:
+            if len(self.refs) and self.focus >= self._inserted:
+                self.focus += len(keys)
+            self.refs[self._inserted:self._inserted] = keys
+            self._inserted += len(keys)
+            self._clear_pool()
+            self._modified()
+        return self.scanning()
+
+    def scanning(self):
+        return self._cursor < len(self._pending)
+
+    def scan_progress(self):
+        """ Returns tuple of (scanned, total) """
+        return self.scanned, self.scanned + len(self._pending) - self._cursor
+
+    def cancel_scan(self):
+        """ Stop scanning, matches found so far are kept """
+        self._pending = []
+        self._cursor = 0
+
+    def __len__(self):
+        return len(self.refs)
 
     def close(self):
-        """ Unregister listener if quit search mode """
-        self.displayer_context.store.unregister(self)
+        """ Stop receiving messages if quit search mode, filters stacked on it are closed too """
+        for walker in list(self._derived):
+            walker.close()
+        upstream = self._upstream()
+        upstream._derived = [w for w in upstream._derived if w is not self]
 
-    def __delitem__(self, index):
-        if isinstance(index, slice):
-            start_index = index.start or 0
-            end_index = min(index.stop or len(self), len(self))
-            for i in range(start_index, end_index):
-                base_walker_index = self.base_walker.index(self[i])
-                del self.base_walker[base_walker_index]
+    def _upstream(self):
+        return self.parent if self.parent is not None else self.base_walker
+
+    def _on_base_receive(self, entries):
+        accepted = []
+        failed = False
+        match = instrument.timed("displayer.match", self.displayer_context.displayer.match)
+        for key, message, summary in entries:
+            try:
+                if summary is None:
+                    summary = self._summary(message)
+                if match(self.keyword, message, summary[1]):
+                    self.refs.append(key)
+                    accepted.append((key, message, summary))
+            except:
+                if not failed:
+                    self.controller.open_error()
+                failed = True
+        self._on_base_evict(self.base_walker.messages.offset)
+        for walker in self._derived:
+            walker._on_base_receive(accepted)
+        if accepted:
+            self._modified()
+        self.on_receive(len(accepted), self)
+
+    def _on_base_evict(self, offset):
+        count = bisect_left(self.refs, offset)
+        if count:
+            self.refs.popleft(count)
+            self.evicted += count
+            self.focus = max(0, self.focus - count)
+            self._inserted = max(0, self._inserted - count)
+        for walker in self._derived:
+            walker._on_base_evict(offset)
+
+    def _on_base_delete(self, keys):
+        deleted = set(keys)
+        self._inserted -= len([ref for ref in self.refs[:self._inserted] if ref in deleted])
+        self.refs = RingBuffer(
+            [ref - bisect_left(keys, ref) for ref in self.refs if ref not in deleted])
+        if self.scanning():
+            self._pending = [key - bisect_left(keys, key)
+                             for key in self._pending[self._cursor:] if key not in deleted]
+            self._cursor = 0
+        for walker in self._derived:
+            walker._on_base_delete(keys)
+        self._reset()
+
+    def _delete(self, positions):
+        self.base_walker._delete(
+            [self.base_walker._position(self.refs[p]) for p in positions])
+
+    def _set_title(self, key, title):
+        self.base_walker._set_title(key, title)
+        self._refresh_title(key, title)
+
+    def _key(self, position):
+        return self.refs[position]
+
+    def _position(self, key):
+        return bisect_left(self.refs, key)
+
+    def _message(self, position):
+        return self.base_walker._message(self.base_walker._position(self.refs[position]))
+
+    def _title(self, position):
+        return self.base_walker._title(self.base_walker._position(self.refs[position]))
+
+
+def _runs(positions):
+    """ Group sorted positions into continuous (start, stop) ranges """
+    runs = []
+    for position in positions:
+        if runs and runs[-1][1] == position:
+            runs[-1][1] = position + 1
         else:
-            base_walker_index = self.base_walker.index(self[index])
-            del self.base_walker[base_walker_index]
-        super(FilterSummaryListWalker, self).__delitem__(index)
+            runs.append([position, position + 1])
+    return runs
+
+
+def _plain_text(title):
+    text, _ = decompose_tagmarkup(title)
+    return text
 
 
 class SummaryListWidget(BasicWidget):
@@ -170,17 +1001,36 @@ class SummaryListWidget(BasicWidget):
     Attributes:
         displayer_context: DisplayerContext
     """
+    _search_cache_size = 8
+
     def __init__(self, displayer_context, **kwargs):
         super(SummaryListWidget, self).__init__(**kwargs)
         _verify_keys(displayer_context.actions)
 
+        self.displayer_context = displayer_context
         self.name = displayer_context.displayer.get_name()
-        self.base_walker = SummaryListWalker(
+        store = displayer_context.store
+        bounded = store.max_items is not None or store.max_bytes is not None
+        # NOTE: bounded or spilled store required the storage of virtual walker
+        if self.context.config.virtual_list or bounded or store.memory_budget is not None:
+            self.walker_class = VirtualSummaryListWalker
+            self.filter_walker_class = VirtualFilterSummaryListWalker
+        else:
+            self.walker_class = SummaryListWalker
+            self.filter_walker_class = FilterSummaryListWalker
+        self.base_walker = self.walker_class(
             displayer_context=displayer_context,
             on_receive=self._on_receive, **kwargs)
         self.current_walker = self.base_walker
+        self._scan_alarm = None
+        self._search_alarm = None
+        self._search_cache = OrderedDict()
+        self._searching = False
+        self._search_parent = None
+        self._follow = None
 
-        self.search_widget = SearchWidget(self._filter, self._clear_search)
+        self.search_widget = SearchWidget(
+            self._filter, self._clear_search, change_func=self._on_search_change)
         self.help_widget = HelpWidget(
             HelpContent(
                 [HelpCategory("Basic", self.context.config.keys),
@@ -192,24 +1042,153 @@ class SummaryListWidget(BasicWidget):
         self.display(urwid.ListBox(self.base_walker))
 
     def _filter(self, keyword):
+        self._cancel_search_alarm()
+        walker = self._search(keyword)
+        self._clear_search_cache(keep=walker)
+        self._searching = False
+        self.controller._focus_body()
+
+    def _begin_search(self):
+        """ Start a search session that stack filter on the current filter """
+        if self._searching:
+            return
+        self._searching = True
+        if self.current_walker is self.base_walker:
+            self._search_parent = None
+            return
+        self._search_parent = self.current_walker
+        progress = self.current_walker.scan_progress()
+        if self._cancel_scan():
+            self.controller.notify("scanning stopped at {0}/{1}".format(*progress))
+
+    def _on_search_change(self, keyword):
+        """ Search after typing paused for search_debounce seconds """
+        loop = self.displayer_context.store.loop
+        debounce = self.context.config.search_debounce
+        if loop is None or debounce is None:
+            return
+        self._cancel_search_alarm()
+        self._search_alarm = loop.set_alarm_in(debounce, self._live_search, keyword)
+
+    def _live_search(self, loop, keyword):
+        self._search_alarm = None
+        try:
+            self._search(keyword)
+        except:
+            self.controller.open_error()
+
+    def _cancel_search_alarm(self):
+        if self._search_alarm is not None:
+            self.displayer_context.store.loop.remove_alarm(self._search_alarm)
+            self._search_alarm = None
+
+    def _search(self, keyword):
+        """ Display the result of keyword
+
+        Results of the current search session are cached by keyword,
+        a longer keyword refine the cached result of the keyword it contain,
+        and a shorter keyword reuse its cached result
+
+        Returns:
+            the displayed walker
+        """
+        self._begin_search()
+        self._pause_scan()
+        loop = self.displayer_context.store.loop
         if keyword:
-            new_walker = FilterSummaryListWalker(self.base_walker, keyword)
+            new_walker = self._search_cache.pop(keyword, None)
+            if new_walker is None:
+                new_walker = self.filter_walker_class(
+                    self.base_walker, keyword, progressive=loop is not None,
+                    source=self._refinable(keyword), parent=self._search_parent)
+            self._search_cache[keyword] = new_walker
+            self._trim_search_cache()
         else:
-            new_walker = self.base_walker
+            new_walker = self._search_parent or self.base_walker
         if new_walker is not self.current_walker:
             self._update_content(new_walker)
-        self.controller._focus_body()
+        if new_walker is not self.base_walker and new_walker.scanning():
+            self._scan_alarm = loop.set_alarm_in(0, self._scan)
+        return new_walker
 
-    def _update_content(self, walker):
-        if self.current_walker is not self.base_walker:
-            self.current_walker.close()
+    def _refinable(self, keyword):
+        """ The cached walker whose result contain the result of keyword """
+        if not self.displayer_context.uses_default_match():
+            return None
+        for cached_keyword, walker in reversed(self._search_cache.items()):
+            if cached_keyword in keyword and not walker.scanning():
+                return walker
+        return None
+
+    def _trim_search_cache(self):
+        while len(self._search_cache) > self._search_cache_size:
+            _, walker = self._search_cache.popitem(last=False)
+            if walker is not self.current_walker:
+                walker.close()
+
+    def _clear_search_cache(self, keep=None):
+        for walker in self._search_cache.values():
+            if walker is not keep:
+                walker.close()
+        self._search_cache.clear()
+
+    def _scan(self, loop, user_data):
+        """ Scan a chunk of the filter walker in each event loop tick,
+        so that input could be handled between chunks
+        """
+        self._scan_alarm = None
+        try:
+            scanning = self.current_walker.scan(self.context.config.filter_chunk_size)
+        except:
+            self.current_walker.cancel_scan()
+            self.controller.open_error()
+            return
+        if scanning:
+            self._scan_alarm = loop.set_alarm_in(0, self._scan)
+        self.update_info()
+
+    def _pause_scan(self):
+        """ Stop scheduling the scanning of current filter walker
+
+        Returns:
+            True if there was a scanning scheduled
+        """
+        if self._scan_alarm is None:
+            return False
+        self.displayer_context.store.loop.remove_alarm(self._scan_alarm)
+        self._scan_alarm = None
+        return True
+
+    def _cancel_scan(self):
+        """ Cancel the scanning of current filter walker
+
+        Returns:
+            True if there was a scanning to cancel
+        """
+        if not self._pause_scan():
+            return False
+        self.current_walker.cancel_scan()
+        return True
 
+    def _update_content(self, walker):
+        if walker is self.base_walker:
+            walker.compact()
         self.current_walker = walker
         self.display(urwid.ListBox(walker))
         self.update_info()
 
+    def _pop_filter(self):
+        """ Close the top filter and restore its parent, which is kept up to date """
+        self._pause_scan()
+        walker = self.current_walker
+        walker.close()
+        self._update_content(walker.parent or self.base_walker)
+        if self.current_walker is not self.base_walker and self.current_walker.scanning():
+            self._scan_alarm = self.displayer_context.store.loop.set_alarm_in(0, self._scan)
+
     def _open_search(self):
         self.search_widget.clear()
+        self._begin_search()
         self.controller.open_edit(self.search_widget)
 
     def _clear_search(self):
@@ -220,25 +1199,58 @@ class SummaryListWidget(BasicWidget):
         if len(self.current_walker):
             curr_index = self._w.focus_position + 1
             total_index = len(self.current_walker)
-            self.controller._update_info(
-                self, "{0}[{1}/{2}]".format(self.name, curr_index, total_index))
+            info = "{0}[{1}/{2}]".format(self.name, curr_index, total_index)
         else:
-            self.controller._update_info(self, "{0}[0/0]".format(self.name))
+            info = "{0}[0/0]".format(self.name)
+        if self.current_walker.evicted:
+            info += " evicted:{0}".format(self.current_walker.evicted)
+        if self.current_walker is not self.base_walker:
+            info += " " + " > ".join("/" + k for k in self.current_walker.keywords)
+        if self._scan_alarm is not None:
+            info += " scanning {0}/{1}".format(*self.current_walker.scan_progress())
+        self.controller._update_info(self, info)
+        if self.displayer_context.prefetch_executor is not None:
+            self.context.scheduler.request(self._prefetch)
 
-    def _on_receive(self):
-        if self.context.config.auto_scroll:
-            curr_index = self._w.focus_position + 1
-            total_index = len(self.current_walker)
-            if curr_index == total_index - 1:
-                self._w.set_focus(curr_index)
+    def _prefetch(self):
+        """ Prefetch views of the focused item and its neighbors, nearest first """
+        total = len(self.current_walker)
+        if not total:
+            return
+        focus = self._w.focus_position
+        radius = self.displayer_context.prefetch_radius
+        positions = sorted(range(max(0, focus - radius), min(total, focus + radius + 1)),
+                           key=lambda p: abs(p - focus))
+        self.displayer_context.prefetch([self.current_walker[p].message for p in positions])
+
+    def _on_receive(self, count=1, walker=None):
+        """ Called by walkers after they received count messages
+
+        Only the current walker decide whether to follow the new messages,
+        as the base walker and filters notify in turn for the same messages
+        """
+        current = walker is None or walker is self.current_walker
+        if self.context.config.auto_scroll and count and self._follow is None and current:
+            prev_total_index = len(self.current_walker) - count
+            self._follow = not prev_total_index or self._w.focus_position == prev_total_index - 1
+        self.context.scheduler.request(self._update_on_receive)
+
+    def _update_on_receive(self):
+        """ Auto scroll and update info once per frame for the messages received """
+        if self._follow and len(self.current_walker):
+            self._w.set_focus(len(self.current_walker) - 1)
+        self._follow = None
         self.update_info()
 
     def keypress(self, size, key):
         if key == "/":
             self._open_search()
             return None
-        if key == "q" and isinstance(self.current_walker, FilterSummaryListWalker):
-            self._clear_search()
+        if key == "esc" and self._cancel_scan():
+            self.update_info()
+            return None
+        if key == "q" and self.current_walker is not self.base_walker:
+            self._pop_filter()
             return None
         if key == "q":
             self.controller.back()
@@ -262,6 +1274,9 @@ class SummaryListWidget(BasicWidget):
         if key == "?":
             self.controller.open_view(self.help_widget)
             return None
+        if key == "S":
+            self.controller.open_stats()
+            return None
 
         keypress_result = super(SummaryListWidget, self).keypress(size, key)  # pragma: no cover
         self.update_info()
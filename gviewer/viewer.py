@@ -3,6 +3,7 @@ import urwid
 from gviewer.parent import ParentFrame
 from gviewer.config import Config
 from gviewer.context import Context
+from gviewer.scheduler import MainLoop
 
 
 class GViewer(object):  # pragma: no cover
@@ -21,14 +22,18 @@ class GViewer(object):  # pragma: no cover
 
         self._default_urwid_options(kwargs)
 
-        self.loop = urwid.MainLoop(
-            self.view, **kwargs)
+        self.loop = MainLoop(
+            self.view, self.context.scheduler, **kwargs)
+
+        for displayer_context in self._displayer_contexts():
+            displayer_context.store.attach(self.loop, self.view.controller)
 
     def _default_urwid_options(self, kwargs):
         """ generate default urwid options
 
         handle_mouse with False
         unhandled_input with "q", "Q" to exit tui
+        event_loop required by data store, or asyncio if inside a running asyncio loop
         palette with predefined template in gviewer
 
         """
@@ -38,21 +43,55 @@ class GViewer(object):  # pragma: no cover
         if "unhandled_input" not in kwargs:
             kwargs["unhandled_input"] = self._default_unhandled_input
 
+        if "event_loop" not in kwargs:
+            event_loop = self._default_event_loop()
+            if event_loop:
+                kwargs["event_loop"] = event_loop
+
         if "palette" in kwargs:
             kwargs["palette"] = self.context.config.template + kwargs["palette"]
         else:
             kwargs["palette"] = self.context.config.template
 
+    def _default_event_loop(self):
+        for displayer_context in self._displayer_contexts():
+            event_loop = displayer_context.store.create_event_loop()
+            if event_loop:
+                return event_loop
+
+        try:
+            import asyncio
+            return urwid.AsyncioEventLoop(loop=asyncio.get_running_loop())
+        except (ImportError, AttributeError, RuntimeError):
+            return None
+
+    def _displayer_contexts(self):
+        return [self.context.main_context] + self.context.other_contexts
+
     def _default_unhandled_input(self, key):
         if key == "q":
             self.view.back()
 
-    def start(self):
-        """ Start the gviewer tui
+    def setup_stores(self):
+        """ Setup all data stores so that they start to deliver messages
         """
         for displayer_context in self.context.other_contexts:
             displayer_context.store.setup()
         # NOTE: main context should setup latest so that the info of curr/max number on the footer would be correct
         self.context.main_context.store.setup()
 
+    def start(self):
+        """ Start the gviewer tui
+        """
+        self.setup_stores()
         self.loop.run()
+
+    def start_async(self):
+        """ Start the gviewer tui inside the running asyncio event loop
+
+        Returns:
+            coroutine that finish when user quit gviewer
+        """
+        # NOTE: import here since asyncio syntax is not available in py27
+        from gviewer.aio import start
+        return start(self)
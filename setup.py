@@ -41,7 +41,8 @@ setup(
     extras_require={
         "dev": [
             "Pygments==2.1.3",
-            "mock==2.0.0"
+            "mock==2.0.0",
+            "futures==3.0.5; python_version < '3'"
         ]
     }
 )